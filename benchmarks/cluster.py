@@ -0,0 +1,714 @@
+# benchmarks/cluster.py
+#
+# Synthetic Kubernetes cluster + stand-ins for the SDK API classes returned
+# by eks_agent.tools.k8s_client.get_clients().
+#
+# Objects are generated in wire format (camelCase JSON) and served as JSON
+# bytes, then deserialized with the real SDK ApiClient, so the benchmarked
+# read path pays the same decode cost it would against a live API server.
+
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from kubernetes.client import ApiClient
+from kubernetes.client.exceptions import ApiException
+
+# Lines in each container's log as served by the fake API (before tail_lines).
+LOG_LINES = 20000
+
+NAMESPACE_NAMES = ["payments", "checkout", "search", "catalog", "identity"]
+
+_NOW = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+_WARNING_REASONS = ["BackOff", "Unhealthy", "FailedScheduling", "Failed", "FailedMount"]
+_NORMAL_REASONS = ["Scheduled", "Pulling", "Pulled", "Created", "Started", "Killing"]
+
+
+def _ts(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def namespace_name(i: int) -> str:
+    if i < len(NAMESPACE_NAMES):
+        return NAMESPACE_NAMES[i]
+    return f"ns-{i}"
+
+
+class SyntheticCluster:
+    """
+    Deterministic cluster of `namespaces` x (`pods` pods, `events` events).
+
+    Every namespace gets one Deployment (+ ReplicaSet, Service, HPA) per
+    five pods; pods carry ownerReferences and a realistic spread of
+    Running / CrashLoopBackOff / OOMKilled / ImagePullBackOff states.
+    """
+
+    def __init__(
+        self,
+        namespaces: int = 3,
+        pods: int = 50,
+        events: int = 200,
+        nodes: int = 5,
+        seed: int = 0,
+        now: datetime = _NOW,
+    ):
+        self.now = now
+        self._rng = random.Random(seed)
+        self._rv = 1000
+        self.objects: dict[tuple[str, str | None], list[dict]] = {}
+
+        self.objects[("nodes", None)] = [self._node(i) for i in range(nodes)]
+        for i in range(namespaces):
+            self._populate(namespace_name(i), pods, events)
+
+    # --------------------------------------------------
+    # Generation
+    # --------------------------------------------------
+    def _next_rv(self) -> str:
+        self._rv += 1
+        return str(self._rv)
+
+    def _meta(self, name: str, namespace: str | None, labels: dict, owner: dict | None = None) -> dict:
+        meta = {
+            "name": name,
+            "namespace": namespace,
+            "uid": f"uid-{namespace}-{name}",
+            "resourceVersion": self._next_rv(),
+            "creationTimestamp": _ts(self.now - timedelta(days=3)),
+            "labels": labels,
+            "annotations": {"deployment.kubernetes.io/revision": "3"},
+        }
+        if owner:
+            meta["ownerReferences"] = [owner]
+        return meta
+
+    def _owner(self, kind: str, name: str, namespace: str) -> dict:
+        return {
+            "apiVersion": "apps/v1",
+            "kind": kind,
+            "name": name,
+            "uid": f"uid-{namespace}-{name}",
+            "controller": True,
+        }
+
+    def _container_spec(self, app: str) -> dict:
+        return {
+            "name": "app",
+            "image": f"123456789012.dkr.ecr.us-east-1.amazonaws.com/{app}:1.4.2",
+            "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+            "env": [{"name": f"VAR_{i}", "value": f"value-{i}"} for i in range(8)],
+            "resources": {
+                "limits": {"cpu": "500m", "memory": "512Mi"},
+                "requests": {"cpu": "250m", "memory": "256Mi"},
+            },
+        }
+
+    def _pod_status(self, app: str) -> dict:
+        roll = self._rng.random()
+        started = _ts(self.now - timedelta(minutes=self._rng.randint(5, 600)))
+        cs = {
+            "name": "app",
+            "image": f"{app}:1.4.2",
+            "imageID": f"docker-pullable://{app}@sha256:{self._rng.getrandbits(64):016x}",
+            "containerID": f"containerd://{self._rng.getrandbits(64):016x}",
+            "ready": True,
+            "started": True,
+            "restartCount": 0,
+            "state": {"running": {"startedAt": started}},
+        }
+        phase = "Running"
+
+        if roll < 0.08:
+            cs.update(
+                ready=False,
+                started=False,
+                restartCount=self._rng.randint(3, 40),
+                state={"waiting": {"reason": "CrashLoopBackOff", "message": "back-off 5m0s restarting failed container"}},
+                lastState={"terminated": {"reason": "Error", "exitCode": 1, "startedAt": started, "finishedAt": started}},
+            )
+        elif roll < 0.12:
+            cs.update(
+                ready=False,
+                restartCount=self._rng.randint(1, 10),
+                state={"waiting": {"reason": "CrashLoopBackOff"}},
+                lastState={"terminated": {"reason": "OOMKilled", "exitCode": 137, "startedAt": started, "finishedAt": started}},
+            )
+        elif roll < 0.15:
+            cs.update(
+                ready=False,
+                started=False,
+                state={"waiting": {"reason": "ImagePullBackOff", "message": f"Back-off pulling image \"{app}:1.4.3\""}},
+            )
+            phase = "Pending"
+
+        return {
+            "phase": phase,
+            "hostIP": f"10.0.{self._rng.randint(0, 255)}.{self._rng.randint(0, 255)}",
+            "podIP": f"10.1.{self._rng.randint(0, 255)}.{self._rng.randint(0, 255)}",
+            "startTime": started,
+            "qosClass": "Burstable",
+            "conditions": [
+                {"type": t, "status": "True" if cs["ready"] or t == "PodScheduled" else "False",
+                 "lastTransitionTime": started}
+                for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [cs],
+        }
+
+    def _populate(self, ns: str, pods: int, events: int):
+        deployments, replicasets, services, hpas, pod_objs = [], [], [], [], []
+        n_deploy = max(1, pods // 5)
+
+        for d in range(n_deploy):
+            app = f"{ns}-app-{d}"
+            labels = {"app": app}
+            rs_name = f"{app}-{self._rng.getrandbits(32):08x}"
+            replicas = 0
+
+            for p in range(pods // n_deploy + (1 if d < pods % n_deploy else 0)):
+                pod_name = f"{rs_name}-{self._rng.getrandbits(20):05x}"
+                status = self._pod_status(app)
+                pod_objs.append({
+                    "apiVersion": "v1",
+                    "kind": "Pod",
+                    "metadata": self._meta(pod_name, ns, dict(labels, **{"pod-template-hash": rs_name[-8:]}),
+                                           self._owner("ReplicaSet", rs_name, ns)),
+                    "spec": {
+                        "nodeName": f"ip-10-0-{p % 8}-1.ec2.internal",
+                        "serviceAccountName": "default",
+                        "containers": [self._container_spec(app)],
+                    },
+                    "status": status,
+                })
+                replicas += 1
+
+            ready = sum(
+                1 for o in pod_objs[-replicas:]
+                if o["status"]["containerStatuses"][0]["ready"]
+            ) if replicas else 0
+            wl_status = {
+                "observedGeneration": 3,
+                "replicas": replicas,
+                "readyReplicas": ready,
+                "availableReplicas": ready,
+                "updatedReplicas": replicas,
+            }
+            if ready < replicas:
+                wl_status["unavailableReplicas"] = replicas - ready
+            template = {"metadata": {"labels": labels}, "spec": {"containers": [self._container_spec(app)]}}
+
+            deployments.append({
+                "apiVersion": "apps/v1",
+                "kind": "Deployment",
+                "metadata": self._meta(app, ns, labels),
+                "spec": {"replicas": replicas, "selector": {"matchLabels": labels}, "template": template},
+                "status": dict(wl_status, conditions=[
+                    {"type": "Available", "status": "True" if ready == replicas else "False",
+                     "reason": "MinimumReplicasAvailable"},
+                ]),
+            })
+            replicasets.append({
+                "apiVersion": "apps/v1",
+                "kind": "ReplicaSet",
+                "metadata": self._meta(rs_name, ns, labels, self._owner("Deployment", app, ns)),
+                "spec": {"replicas": replicas, "selector": {"matchLabels": labels}, "template": template},
+                "status": {k: v for k, v in wl_status.items() if k != "updatedReplicas"},
+            })
+            services.append({
+                "apiVersion": "v1",
+                "kind": "Service",
+                "metadata": self._meta(app, ns, labels),
+                "spec": {"selector": labels, "ports": [{"port": 80, "targetPort": 8080}]},
+                "status": {"loadBalancer": {}},
+            })
+            if d % 2 == 0:
+                hpas.append({
+                    "apiVersion": "autoscaling/v1",
+                    "kind": "HorizontalPodAutoscaler",
+                    "metadata": self._meta(app, ns, labels),
+                    "spec": {
+                        "scaleTargetRef": {"apiVersion": "apps/v1", "kind": "Deployment", "name": app},
+                        "minReplicas": 1,
+                        "maxReplicas": 10,
+                        "targetCPUUtilizationPercentage": 70,
+                    },
+                    "status": {
+                        "currentReplicas": replicas,
+                        "desiredReplicas": replicas,
+                        "currentCPUUtilizationPercentage": self._rng.randint(5, 120),
+                    },
+                })
+
+        self.objects[("pods", ns)] = pod_objs
+        self.objects[("deployments", ns)] = deployments
+        self.objects[("replicasets", ns)] = replicasets
+        self.objects[("services", ns)] = services
+        self.objects[("horizontalpodautoscalers", ns)] = hpas
+        self.objects[("statefulsets", ns)] = []
+        self.objects[("daemonsets", ns)] = []
+        self.objects[("events", ns)] = [self._event(ns, pod_objs, i) for i in range(events)]
+        self.objects[("rollouts.argoproj.io", ns)] = [
+            {
+                "apiVersion": "argoproj.io/v1alpha1",
+                "kind": "Rollout",
+                "metadata": self._meta(f"{ns}-canary", ns, {"app": f"{ns}-canary"}),
+                "spec": {"replicas": 3, "strategy": {"canary": {"steps": [{"setWeight": 20}]}}},
+                "status": {"phase": "Degraded", "message": "ProgressDeadlineExceeded", "replicas": 3, "availableReplicas": 1},
+            }
+        ]
+
+    def _event(self, ns: str, pods: list[dict], i: int) -> dict:
+        pod = pods[self._rng.randrange(len(pods))] if pods else None
+        waiting = (
+            pod["status"]["containerStatuses"][0]["state"].get("waiting") if pod else None
+        )
+        warning = waiting is not None and self._rng.random() < 0.7
+        reason = (
+            self._rng.choice(_WARNING_REASONS) if warning
+            else self._rng.choice(_NORMAL_REASONS)
+        )
+        first = self.now - timedelta(minutes=self._rng.randint(0, 24 * 60))
+        last = min(self.now, first + timedelta(minutes=self._rng.randint(0, 120)))
+        involved = pod["metadata"]["name"] if pod else f"{ns}-unknown"
+        return {
+            "apiVersion": "v1",
+            "kind": "Event",
+            "metadata": {
+                "name": f"{involved}.{i:x}",
+                "namespace": ns,
+                "resourceVersion": self._next_rv(),
+                "creationTimestamp": _ts(first),
+            },
+            "involvedObject": {
+                "apiVersion": "v1",
+                "kind": "Pod",
+                "name": involved,
+                "namespace": ns,
+                "uid": f"uid-{ns}-{involved}",
+            },
+            "reason": reason,
+            "message": f"{reason} for container app in pod {involved}",
+            "type": "Warning" if warning else "Normal",
+            "count": self._rng.randint(1, 50),
+            "firstTimestamp": _ts(first),
+            "lastTimestamp": _ts(last),
+            "source": {"component": "kubelet", "host": "ip-10-0-0-1.ec2.internal"},
+            "reportingComponent": "kubelet",
+        }
+
+    def _node(self, i: int) -> dict:
+        name = f"ip-10-0-{i}-1.ec2.internal"
+        return {
+            "apiVersion": "v1",
+            "kind": "Node",
+            "metadata": self._meta(name, None, {"kubernetes.io/hostname": name}),
+            "spec": {"providerID": f"aws:///us-east-1a/i-{i:017x}"},
+            "status": {
+                "conditions": [
+                    {"type": "Ready", "status": "True", "reason": "KubeletReady"},
+                    {"type": "MemoryPressure", "status": "False"},
+                ],
+                "allocatable": {"cpu": "3920m", "memory": "15Gi", "pods": "58"},
+                "nodeInfo": {
+                    "architecture": "amd64",
+                    "bootID": f"boot-{i}",
+                    "containerRuntimeVersion": "containerd://1.7.11",
+                    "kernelVersion": "5.10.214-202.855.amzn2.x86_64",
+                    "kubeProxyVersion": "v1.29.3-eks",
+                    "kubeletVersion": "v1.29.3-eks",
+                    "machineID": f"machine-{i}",
+                    "operatingSystem": "linux",
+                    "osImage": "Amazon Linux 2",
+                    "systemUUID": f"ec2-{i}",
+                },
+            },
+        }
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+    def list(self, plural: str, namespace: str | None) -> list[dict]:
+        return self.objects.get((plural, namespace), [])
+
+    def get(self, plural: str, namespace: str | None, name: str) -> dict:
+        for o in self.list(plural, namespace):
+            if o["metadata"]["name"] == name:
+                return o
+        raise ApiException(status=404, reason="Not Found")
+
+
+# =========================================================
+# SDK stand-ins
+# =========================================================
+
+class FakeHTTPResponse:
+    """
+    The subset of urllib3.HTTPResponse the SDK and our readers touch.
+    """
+
+    def __init__(self, data: bytes, status: int = 200, headers: dict | None = None):
+        self.data = data
+        self.status = status
+        self.reason = "OK" if status == 200 else "Error"
+        self.headers = headers or {"Content-Type": "application/json"}
+        self._pos = 0
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def read(self, amt: int | None = None) -> bytes:
+        if amt is None:
+            chunk = self.data[self._pos:]
+        else:
+            chunk = self.data[self._pos:self._pos + amt]
+        self._pos += len(chunk)
+        return chunk
+
+    def stream(self, amt: int = 2 ** 16, decode_content: bool = True):
+        while True:
+            chunk = self.read(amt)
+            if not chunk:
+                break
+            yield chunk
+
+    def release_conn(self):
+        pass
+
+
+def synthetic_log(pod: str, previous: bool = False, lines: int | None = LOG_LINES) -> Iterator[bytes]:
+    """
+    Chatty container log of `lines` lines (None = endless), generated lazily.
+
+    Mostly repetitive request/health-check noise with periodic errors; the
+    previous instance ends in an out-of-memory crash.
+    """
+    rng = random.Random(f"{pod}:{previous}")
+    t = _NOW - timedelta(hours=1)
+    i = 0
+    while lines is None or i < lines:
+        t += timedelta(milliseconds=rng.randint(1, 500))
+        stamp = t.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        roll = rng.random()
+        if roll < 0.6:
+            msg = f"INFO GET /healthz 200 {rng.randint(1, 9)}ms"
+        elif roll < 0.9:
+            msg = f"INFO handled request id={rng.getrandbits(64):016x} in {rng.randint(5, 900)}ms"
+        elif roll < 0.98:
+            msg = f"WARN slow upstream payments-db latency={rng.randint(1000, 5000)}ms"
+        else:
+            msg = f"ERROR connection refused to payments-db:5432 attempt={rng.randint(1, 5)}"
+        yield f"{stamp} {msg}\n".encode()
+        i += 1
+    if previous:
+        yield f"{t.strftime('%Y-%m-%dT%H:%M:%S.%fZ')} FATAL java.lang.OutOfMemoryError: Java heap space\n".encode()
+
+
+class FakeLogResponse:
+    """
+    Streaming log body: tail_lines/limit_bytes applied lazily, like the API
+    server, so nothing is materialized beyond the requested tail.
+    """
+
+    def __init__(self, lines: Iterator[bytes], tail_lines: int | None = None, limit_bytes: int | None = None):
+        self.status = 200
+        self._lines = deque(lines, maxlen=tail_lines) if tail_lines else lines
+        self._limit = limit_bytes
+        self.released = False
+
+    def stream(self, amt: int = 2 ** 16, decode_content: bool = True):
+        sent = 0
+        buf = b""
+        for line in self._lines:
+            if self._limit is not None and sent + len(buf) + len(line) > self._limit:
+                buf += line[: self._limit - sent - len(buf)]
+                break
+            buf += line
+            if len(buf) >= amt:
+                yield buf
+                sent += len(buf)
+                buf = b""
+        if buf:
+            yield buf
+
+    def release_conn(self):
+        self.released = True
+
+
+class ServerThrottle:
+    """
+    API-server priority & fairness stand-in: rejects the next `reject`
+    requests with 429 and a Retry-After header, then lets everything through.
+    """
+
+    def __init__(self, reject: int = 0, retry_after: str = "1"):
+        self.remaining = reject
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def check(self):
+        with self._lock:
+            if self.remaining <= 0:
+                return
+            self.remaining -= 1
+            self.rejected += 1
+        raise ApiException(http_resp=FakeHTTPResponse(
+            b'{"kind":"Status","code":429,"reason":"TooManyRequests"}',
+            status=429,
+            headers={"Content-Type": "application/json", "Retry-After": self.retry_after},
+        ))
+
+
+class _FakeApi:
+    def __init__(
+        self,
+        cluster: SyntheticCluster,
+        latency_s: float = 0.0,
+        calls: Counter | None = None,
+        throttle: ServerThrottle | None = None,
+    ):
+        self.cluster = cluster
+        self.latency_s = latency_s
+        self.calls = calls if calls is not None else Counter()
+        self.throttle = throttle
+        self._api_client = ApiClient()
+        self._encoded: dict = {}
+        self._lock = threading.Lock()
+
+    def _encode(self, key, obj) -> bytes:
+        with self._lock:
+            data = self._encoded.get(key)
+            if data is None:
+                data = json.dumps(obj).encode()
+                self._encoded[key] = data
+        return data
+
+    def _serve(self, method: str, key, obj, response_type: str, kwargs: dict):
+        if self.throttle:
+            self.throttle.check()
+        self.calls[method] += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        resp = FakeHTTPResponse(self._encode(key, obj))
+        if kwargs.get("_preload_content", True) is False:
+            return resp
+        return self._api_client.deserialize(resp, response_type)
+
+    def _list(self, method, plural, namespace, list_type, kwargs):
+        items = self.cluster.list(plural, namespace)
+        body = {"apiVersion": "v1", "kind": list_type, "metadata": {"resourceVersion": "1"}, "items": items}
+        return self._serve(method, (plural, namespace), body, list_type, kwargs)
+
+    def _read(self, method, plural, namespace, name, obj_type, kwargs):
+        obj = self.cluster.get(plural, namespace, name)
+        return self._serve(method, (plural, namespace, name), obj, obj_type, kwargs)
+
+
+def _list_method(plural: str, list_type: str):
+    def method(self, namespace, **kwargs):
+        return self._list(f"list:{plural}", plural, namespace, list_type, kwargs)
+    return method
+
+
+def _read_method(plural: str, obj_type: str):
+    def method(self, name, namespace, **kwargs):
+        return self._read(f"read:{plural}", plural, namespace, name, obj_type, kwargs)
+    return method
+
+
+class FakeCoreV1Api(_FakeApi):
+    read_namespaced_pod = _read_method("pods", "V1Pod")
+    list_namespaced_pod = _list_method("pods", "V1PodList")
+    read_namespaced_service = _read_method("services", "V1Service")
+    list_namespaced_service = _list_method("services", "V1ServiceList")
+    list_namespaced_event = _list_method("events", "CoreV1EventList")
+
+    def read_namespaced_pod_log(self, name, namespace, **kwargs):
+        self.cluster.get("pods", namespace, name)
+        if self.throttle:
+            self.throttle.check()
+        self.calls["read:pods/log"] += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return FakeLogResponse(
+            synthetic_log(name, previous=bool(kwargs.get("previous"))),
+            tail_lines=kwargs.get("tail_lines"),
+            limit_bytes=kwargs.get("limit_bytes"),
+        )
+
+    def read_node(self, name, **kwargs):
+        return self._read("read:nodes", "nodes", None, name, "V1Node", kwargs)
+
+    def list_node(self, **kwargs):
+        return self._list("list:nodes", "nodes", None, "V1NodeList", kwargs)
+
+
+class FakeAppsV1Api(_FakeApi):
+    read_namespaced_deployment = _read_method("deployments", "V1Deployment")
+    list_namespaced_deployment = _list_method("deployments", "V1DeploymentList")
+    read_namespaced_replica_set = _read_method("replicasets", "V1ReplicaSet")
+    list_namespaced_replica_set = _list_method("replicasets", "V1ReplicaSetList")
+    read_namespaced_stateful_set = _read_method("statefulsets", "V1StatefulSet")
+    list_namespaced_stateful_set = _list_method("statefulsets", "V1StatefulSetList")
+    read_namespaced_daemon_set = _read_method("daemonsets", "V1DaemonSet")
+    list_namespaced_daemon_set = _list_method("daemonsets", "V1DaemonSetList")
+
+
+class FakeAutoscalingV1Api(_FakeApi):
+    read_namespaced_horizontal_pod_autoscaler = _read_method(
+        "horizontalpodautoscalers", "V1HorizontalPodAutoscaler"
+    )
+    list_namespaced_horizontal_pod_autoscaler = _list_method(
+        "horizontalpodautoscalers", "V1HorizontalPodAutoscalerList"
+    )
+
+
+# (group, version, [(plural, kind, namespaced, short names)])
+# Storage keys in SyntheticCluster.objects are the bare plural for built-in
+# groups and "<plural>.<group>" for everything else.
+DISCOVERY = [
+    ("", "v1", [
+        ("pods", "Pod", True, ["po"]),
+        ("pods/log", "Pod", True, []),
+        ("services", "Service", True, ["svc"]),
+        ("events", "Event", True, ["ev"]),
+        ("nodes", "Node", False, ["no"]),
+        ("namespaces", "Namespace", False, ["ns"]),
+        ("configmaps", "ConfigMap", True, ["cm"]),
+        ("secrets", "Secret", True, []),
+        ("serviceaccounts", "ServiceAccount", True, ["sa"]),
+    ]),
+    ("apps", "v1", [
+        ("deployments", "Deployment", True, ["deploy"]),
+        ("deployments/scale", "Scale", True, []),
+        ("replicasets", "ReplicaSet", True, ["rs"]),
+        ("statefulsets", "StatefulSet", True, ["sts"]),
+        ("daemonsets", "DaemonSet", True, ["ds"]),
+    ]),
+    ("autoscaling", "v1", [
+        ("horizontalpodautoscalers", "HorizontalPodAutoscaler", True, ["hpa"]),
+    ]),
+    ("events.k8s.io", "v1", [
+        ("events", "Event", True, ["ev"]),
+    ]),
+    ("argoproj.io", "v1alpha1", [
+        ("rollouts", "Rollout", True, ["ro"]),
+    ]),
+]
+
+_BUILTIN_GROUPS = {"", "apps", "autoscaling", "events.k8s.io"}
+
+
+class FakeApiClient(_FakeApi):
+    """
+    Stand-in for kubernetes.client.ApiClient.call_api: serves discovery
+    documents and generic GET paths for any resource in DISCOVERY.
+    A request for a version the cluster doesn't serve returns 404.
+    """
+
+    def _discovery(self, path: str):
+        if path == "/api/v1":
+            group, version, resources = DISCOVERY[0]
+        elif path == "/apis":
+            return {
+                "kind": "APIGroupList",
+                "groups": [
+                    {
+                        "name": g,
+                        "versions": [{"groupVersion": f"{g}/{v}", "version": v}],
+                        "preferredVersion": {"groupVersion": f"{g}/{v}", "version": v},
+                    }
+                    for g, v, _ in DISCOVERY[1:]
+                ],
+            }
+        else:
+            match = [d for d in DISCOVERY[1:] if path == f"/apis/{d[0]}/{d[1]}"]
+            if not match:
+                return None
+            group, version, resources = match[0]
+
+        return {
+            "kind": "APIResourceList",
+            "groupVersion": f"{group}/{version}" if group else version,
+            "resources": [
+                {
+                    "name": plural,
+                    "singularName": "" if "/" in plural else kind.lower(),
+                    "namespaced": namespaced,
+                    "kind": kind,
+                    "verbs": ["get", "list", "watch"],
+                    "shortNames": short,
+                }
+                for plural, kind, namespaced, short in resources
+            ],
+        }
+
+    def _resource(self, path: str):
+        parts = path.strip("/").split("/")
+        if parts[0] == "api":
+            group, version, rest = "", parts[1], parts[2:]
+        else:
+            group, version, rest = parts[1], parts[2], parts[3:]
+
+        served = {g: v for g, v, _ in DISCOVERY}
+        if served.get(group) != version:
+            raise ApiException(status=404, reason="Not Found")
+
+        namespace = None
+        if rest and rest[0] == "namespaces" and len(rest) >= 3:
+            namespace, rest = rest[1], rest[2:]
+        plural, name = rest[0], (rest[1] if len(rest) > 1 else None)
+
+        key = plural if group in _BUILTIN_GROUPS else f"{plural}.{group}"
+        if name:
+            return f"read:{key}", (key, namespace, name), self.cluster.get(key, namespace, name)
+
+        items = self.cluster.list(key, namespace)
+        kind = next(
+            (k for g, _, res in DISCOVERY if g == group for p, k, _, _ in res if p == plural),
+            "",
+        )
+        return f"list:{key}", (key, namespace), {"kind": f"{kind}List", "items": items}
+
+    def call_api(self, resource_path, method, *args, _preload_content=True, **kwargs):
+        if method != "GET":
+            raise ApiException(status=405, reason="Method Not Allowed")
+
+        doc = self._discovery(resource_path)
+        if doc is not None:
+            self.calls["discovery"] += 1
+            return FakeHTTPResponse(json.dumps(doc).encode())
+
+        label, key, body = self._resource(resource_path)
+        if self.throttle:
+            self.throttle.check()
+        self.calls[label] += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return FakeHTTPResponse(self._encode(key, body))
+
+
+def fake_clients(
+    cluster: SyntheticCluster,
+    latency_s: float = 0.0,
+    calls: Counter | None = None,
+    throttle: ServerThrottle | None = None,
+) -> dict:
+    """
+    Same shape as eks_agent.tools.k8s_client.get_clients().
+    """
+    calls = calls if calls is not None else Counter()
+    return {
+        "core": FakeCoreV1Api(cluster, latency_s, calls, throttle),
+        "apps": FakeAppsV1Api(cluster, latency_s, calls, throttle),
+        "autoscaling": FakeAutoscalingV1Api(cluster, latency_s, calls, throttle),
+        "api": FakeApiClient(cluster, latency_s, calls, throttle),
+    }
@@ -0,0 +1,129 @@
+# benchmarks/harness.py
+#
+# Timing, memory and reporting helpers shared by the benchmark stages.
+
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q in [0, 100].
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(q / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """
+    Peak Python heap allocated while running `fn` once, in bytes.
+
+    Run separately from the timed loop: tracemalloc slows allocation-heavy
+    code by several times.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    iterations: int = 20,
+    warmup: int = 1,
+    ops_per_call: int = 1,
+    extra: dict | None = None,
+) -> dict:
+    """
+    Run `fn` repeatedly and summarize latency, throughput and peak memory.
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    t_start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - t_start
+
+    row = {
+        "stage": name,
+        "iterations": iterations,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "mean_ms": sum(timings) / len(timings) * 1000 if timings else 0.0,
+        "ops_per_s": (iterations * ops_per_call) / elapsed if elapsed else 0.0,
+        "peak_mem_kib": peak_memory(fn) / 1024,
+    }
+    if extra:
+        row.update(extra)
+    return row
+
+
+def import_profile(code: str, cwd: str | None = None) -> dict:
+    """
+    Run `code` in a fresh interpreter under `-X importtime`.
+
+    Returns {module: (self_us, cumulative_us, depth)} for every module
+    imported, interpreter start-up included.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cum_us), depth)
+    return modules
+
+
+def format_report(rows: list[dict]) -> str:
+    headers = ["stage", "iterations", "p50_ms", "p95_ms", "mean_ms", "ops_per_s", "peak_mem_kib"]
+    extra_keys = sorted({k for r in rows for k in r} - set(headers))
+
+    def cell(v) -> str:
+        if isinstance(v, float):
+            return f"{v:.3f}" if abs(v) < 1000 else f"{v:.0f}"
+        return str(v)
+
+    table = [headers] + [[cell(r.get(h, "")) for h in headers] for r in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(headers))]
+
+    lines = []
+    for i, row in enumerate(table):
+        lines.append("  ".join(c.rjust(w) if j else c.ljust(w) for j, (c, w) in enumerate(zip(row, widths))))
+        if i == 0:
+            lines.append("  ".join("-" * w for w in widths))
+
+    if extra_keys:
+        lines.append("")
+        for r in rows:
+            details = {k: r[k] for k in extra_keys if k in r}
+            if details:
+                lines.append(f"{r['stage']}: {json.dumps(details, default=str)}")
+
+    return "\n".join(lines)
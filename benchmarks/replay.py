@@ -0,0 +1,219 @@
+# benchmarks/replay.py
+#
+# Record/replay stand-ins for Bedrock.
+#
+# Model responses are keyed by pipeline stage rather than by exact prompt,
+# so a recorded session replays against any synthetic cluster size:
+#   draft     - no tools declared (failure-class draft)
+#   answer    - tools declared, no tool evidence in the final user turn
+#   evidence  - tools declared, final user turn carries <tool_evidence>
+
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+STAGES = ("draft", "answer", "evidence")
+
+
+def stage_of(body: dict) -> str:
+    if not body.get("tools"):
+        return "draft"
+    last = (body.get("messages") or [{}])[-1]
+    for block in last.get("content", []):
+        if block.get("type") == "text" and block.get("text", "").startswith("<tool_evidence>"):
+            return "evidence"
+    return "answer"
+
+
+def load_fixture(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_fixture(path: str, fixture: dict):
+    with open(path, "w") as f:
+        json.dump(fixture, f, indent=2)
+        f.write("\n")
+
+
+class ReplayBedrockClient:
+    """
+    Drop-in for boto3's bedrock-runtime client (invoke_model only).
+
+    Each stage cycles through its recorded responses independently, so
+    concurrent sessions replay deterministically per stage.
+    """
+
+    def __init__(self, fixture: dict, latency_s: float = 0.0):
+        missing = [s for s in STAGES if not fixture.get(s)]
+        if missing:
+            raise ValueError(f"Fixture has no responses for stages: {', '.join(missing)}")
+        self.fixture = fixture
+        self.latency_s = latency_s
+        self.requests: list[dict] = []
+        self._cursor = {s: 0 for s in STAGES}
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> dict:
+        req = json.loads(body)
+        stage = stage_of(req)
+        with self._lock:
+            responses = self.fixture[stage]
+            decoded = responses[self._cursor[stage] % len(responses)]
+            self._cursor[stage] += 1
+            self.requests.append({"stage": stage, "model_id": modelId, "bytes": len(body)})
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return {"body": io.BytesIO(json.dumps(decoded).encode())}
+
+
+class FlakyBedrockClient:
+    """
+    Wraps a replay client with a Bedrock-like quota and a slow tail: calls
+    beyond `capacity` in flight fail with ThrottlingException, and a
+    `slow_fraction` of calls take an extra `slow_s`.
+    """
+
+    def __init__(self, client, capacity: int = 4, slow_fraction: float = 0.0, slow_s: float = 0.0, seed: int = 0):
+        self.client = client
+        self.capacity = capacity
+        self.slow_fraction = slow_fraction
+        self.slow_s = slow_s
+        self.throttled = 0
+        self.calls = 0
+        self._inflight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> dict:
+        from botocore.exceptions import ClientError
+
+        with self._lock:
+            self.calls += 1
+            if self._inflight >= self.capacity:
+                self.throttled += 1
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+                    "InvokeModel",
+                )
+            self._inflight += 1
+            slow = self._rng.random() < self.slow_fraction
+        try:
+            if slow:
+                time.sleep(self.slow_s)
+            return self.client.invoke_model(modelId=modelId, body=body, **kwargs)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+
+class RecordingBedrockClient:
+    """
+    Wraps a live bedrock-runtime client and records decoded responses by stage.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.fixture: dict = {s: [] for s in STAGES}
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> dict:
+        resp = self.client.invoke_model(modelId=modelId, body=body, **kwargs)
+        raw = resp["body"].read()
+        with self._lock:
+            self.fixture[stage_of(json.loads(body))].append(json.loads(raw))
+        return dict(resp, body=io.BytesIO(raw))
+
+
+class ReplayEmbeddingProvider:
+    """
+    Offline stand-in for BedrockEmbeddingProvider.
+
+    Recorded vectors are looked up by text hash; anything unrecorded gets a
+    deterministic pseudo-random unit vector so searches stay reproducible.
+    """
+
+    def __init__(self, dim: int = 1536, recorded: Optional[dict] = None, latency_s: float = 0.0):
+        self.dim = dim
+        self.recorded = recorded or {}
+        self.latency_s = latency_s
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def embed_text(self, text: str) -> List[float]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        key = self.key(text)
+        if key in self.recorded:
+            return self.recorded[key]
+        rng = random.Random(key)
+        vec = [rng.gauss(0.0, 1.0) for _ in range(self.dim)]
+        norm = sum(x * x for x in vec) ** 0.5 or 1.0
+        return [x / norm for x in vec]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(t) for t in texts]
+
+
+class RecordingEmbeddingProvider:
+    def __init__(self, provider):
+        self.provider = provider
+        self.recorded: dict = {}
+
+    def embed_text(self, text: str) -> List[float]:
+        vec = self.provider.embed_text(text)
+        self.recorded[ReplayEmbeddingProvider.key(text)] = vec
+        return vec
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(t) for t in texts]
+
+
+@contextmanager
+def offline(
+    clients: dict,
+    bedrock_client,
+    clusters: Optional[dict] = None,
+    rate_limits: bool = False,
+) -> Iterator[None]:
+    """
+    Route eks_agent's Kubernetes and Bedrock access to the given stand-ins.
+
+    `clients` serves the default cluster; `clusters` optionally maps
+    kubeconfig context names to their own client sets. Client-side rate
+    limits are off unless `rate_limits` is set, so stages measure the read
+    path rather than the budget.
+    """
+    from eks_agent import bedrock
+    from eks_agent.tools import k8s_reader, ratelimit
+
+    clusters = clusters or {}
+
+    def get_clients(cluster: Optional[str] = None) -> dict:
+        if cluster is None:
+            return clients
+        if cluster not in clusters:
+            raise ValueError(f"Unknown cluster context '{cluster}'")
+        return clusters[cluster]
+
+    saved = (k8s_reader.get_clients, bedrock.get_bedrock_client)
+    saved_limits = (ratelimit.GET_QPS, ratelimit.LIST_QPS, dict(ratelimit._BUCKETS))
+    k8s_reader.get_clients = get_clients
+    bedrock.get_bedrock_client = lambda: bedrock_client
+    if not rate_limits:
+        ratelimit.GET_QPS = ratelimit.LIST_QPS = 0
+        ratelimit._BUCKETS.clear()
+    try:
+        yield
+    finally:
+        k8s_reader.get_clients, bedrock.get_bedrock_client = saved
+        ratelimit.GET_QPS, ratelimit.LIST_QPS = saved_limits[:2]
+        ratelimit._BUCKETS.clear()
+        ratelimit._BUCKETS.update(saved_limits[2])
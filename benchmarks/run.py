@@ -0,0 +1,1176 @@
+# benchmarks/run.py
+#
+# Offline benchmark harness.
+#
+#   python -m benchmarks.run --namespaces 3 --pods 500 --events 2000
+#   python -m benchmarks.run --stages render_tool_evidence,vector_search --json out.json
+#
+# Everything runs against synthetic clusters and recorded Bedrock responses;
+# no AWS credentials or kubeconfig are needed. Pass --record to refresh the
+# Bedrock fixture from a live account instead.
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from benchmarks.cluster import ServerThrottle, SyntheticCluster, fake_clients, namespace_name
+from benchmarks.harness import format_report, import_profile, measure, percentile
+from benchmarks.replay import (
+    FlakyBedrockClient,
+    RecordingBedrockClient,
+    RecordingEmbeddingProvider,
+    ReplayBedrockClient,
+    ReplayEmbeddingProvider,
+    load_fixture,
+    offline,
+    save_fixture,
+)
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "bedrock_session.json")
+
+_WORDS = (
+    "pod container restart crash oom memory limit image pull registry backoff "
+    "probe liveness readiness node schedule taint toleration volume mount dns "
+    "timeout deployment rollout replica service endpoint ingress certificate"
+).split()
+
+STAGES: dict[str, Callable] = {}
+
+# Cold-start budgets checked by the import_time stage: import time in ms
+# (best of --import-runs fresh interpreters) and SDKs that must stay lazy.
+IMPORT_BUDGETS = {
+    "server": (
+        "import eks_agent.server",
+        700,
+        ("kubernetes", "boto3", "botocore", "yaml", "requests"),
+    ),
+    "cli": (
+        "import importlib.util as u; s = u.spec_from_file_location('eks_agent_cli', 'cli/eks_agent.py'); "
+        "s.loader.exec_module(u.module_from_spec(s))",
+        60,
+        ("requests", "kubernetes", "boto3", "eks_agent"),
+    ),
+}
+
+
+def stage(name: str):
+    def register(fn):
+        STAGES[name] = fn
+        return fn
+    return register
+
+
+# =========================================================
+# Stages
+# =========================================================
+
+@stage("read_object")
+def bench_read_object(args, ctx) -> list[dict]:
+    from eks_agent.tools.k8s_reader import read_object
+
+    ns = namespace_name(0)
+    rows = []
+    for kind in ("Pod", "Event", "Deployment"):
+        n = len(read_object(kind, ns))
+        rows.append(measure(
+            f"read_object[{kind} list]",
+            lambda kind=kind: read_object(kind, ns),
+            iterations=args.iterations,
+            extra={"items": n},
+        ))
+    return rows
+
+
+@stage("large_pod_list")
+def bench_large_pod_list(args, ctx) -> list[dict]:
+    """
+    SDK model deserialization vs the raw-JSON read path on one big namespace.
+    """
+    from eks_agent.tools import k8s_reader
+
+    cluster = SyntheticCluster(namespaces=1, pods=args.large_pods, events=0, seed=args.seed)
+    clients = fake_clients(cluster)
+    ns = namespace_name(0)
+    core = clients["core"]
+
+    def sdk_path():
+        objs = core.list_namespaced_pod(ns)
+        return [
+            {
+                "kind": o.kind,
+                "metadata": {
+                    "name": o.metadata.name,
+                    "namespace": o.metadata.namespace,
+                    "labels": o.metadata.labels,
+                },
+                "status": o.status.to_dict() if o.status else None,
+            }
+            for o in objs.items
+        ]
+
+    def raw_path():
+        return k8s_reader._list(core.list_namespaced_pod, ns, kind="Pod")
+
+    iterations = max(1, args.iterations // 4)
+    extra = {"items": args.large_pods}
+    return [
+        measure("pod list [sdk models]", sdk_path, iterations=iterations, extra=extra),
+        measure("pod list [raw json]", raw_path, iterations=iterations, extra=extra),
+    ]
+
+
+@stage("fanout")
+def bench_fanout(args, ctx) -> list[dict]:
+    """
+    Same read against N fake clusters with staggered latency; the last
+    cluster is slower than the fan-out deadline and must come back as a
+    timeout without holding up the others.
+    """
+    from eks_agent.tools.k8s_reader import read_across_clusters
+    from eks_agent.tools import k8s_reader
+
+    names = [f"cluster-{i}" for i in range(args.clusters)]
+    latency = [0.01 * (i + 1) for i in range(args.clusters)]
+    latency[-1] = args.fanout_timeout * 2
+    registry = {
+        n: fake_clients(SyntheticCluster(namespaces=1, pods=args.pods, events=0, seed=i), latency_s=lat)
+        for i, (n, lat) in enumerate(zip(names, latency))
+    }
+
+    saved = k8s_reader.get_clients
+    k8s_reader.get_clients = lambda cluster=None: registry[cluster]
+    try:
+        ns = namespace_name(0)
+        probe = read_across_clusters("Pod", names, ns, timeout=args.fanout_timeout)
+        timed_out = [r["cluster"] for r in probe if "error" in r]
+        return [measure(
+            f"read_across_clusters[{args.clusters}]",
+            lambda: read_across_clusters("Pod", names, ns, timeout=args.fanout_timeout),
+            iterations=max(1, args.iterations // 4),
+            extra={"timed_out": timed_out, "sequential_ms": round(sum(latency[:-1]) * 1000 + args.fanout_timeout * 1000, 1)},
+        )]
+    finally:
+        k8s_reader.get_clients = saved
+
+
+@stage("namespace_digest")
+def bench_namespace_digest(args, ctx) -> list[dict]:
+    """
+    One NamespaceDigest read vs rendering its source lists individually.
+    """
+    from eks_agent.tools.digest import DIGEST_SOURCES
+    from eks_agent.tools.k8s_reader import read_object
+    from eks_agent.tools.render import render_tool_evidence
+
+    ns = namespace_name(0)
+    digest = [{"kind": "NamespaceDigest", "namespace": ns, "output": read_object("NamespaceDigest", ns)}]
+    separate = [
+        {"kind": kind, "namespace": ns, "output": read_object(kind, ns)}
+        for kind in DIGEST_SOURCES
+    ]
+    return [measure(
+        "read_object[NamespaceDigest]",
+        lambda: render_tool_evidence([
+            {"kind": "NamespaceDigest", "namespace": ns, "output": read_object("NamespaceDigest", ns)}
+        ]),
+        iterations=args.iterations,
+        extra={
+            "chars": len(render_tool_evidence(digest)),
+            "separate_chars": len(render_tool_evidence(separate)),
+        },
+    )]
+
+
+@stage("event_correlation")
+def bench_event_correlation(args, ctx) -> list[dict]:
+    """
+    Raw event evidence vs correlated groups on one very noisy namespace.
+    """
+    from eks_agent.tools import k8s_reader
+    from eks_agent.tools.events import correlate_evidence
+    from eks_agent.tools.render import render_tool_evidence
+
+    cluster = SyntheticCluster(namespaces=1, pods=args.pods, events=args.large_events, seed=args.seed)
+    clients = fake_clients(cluster)
+    ns = namespace_name(0)
+    events = k8s_reader._list(clients["core"].list_namespaced_event, ns, kind="Event")
+    results = [{"kind": "Event", "namespace": ns, "name": None, "output": events}]
+
+    correlated = correlate_evidence(results)
+    summary = correlated[0]["output"]
+    iterations = max(1, args.iterations // 4)
+    return [
+        measure(
+            "render_tool_evidence[raw events]",
+            lambda: render_tool_evidence(results),
+            iterations=iterations,
+            extra={
+                "items": len(events),
+                "warnings_shown": sum(1 for e in events[:20] if e["status"]["type"] == "Warning"),
+                "chars": len(render_tool_evidence(results)),
+            },
+        ),
+        measure(
+            "correlate_evidence+render",
+            lambda: render_tool_evidence(correlate_evidence(results)),
+            iterations=iterations,
+            extra={
+                "items": len(events),
+                "groups": len(summary["groups"]) + summary["groups_omitted"],
+                "stale_dropped": summary["stale_events_dropped"],
+                "warnings_shown": sum(1 for g in summary["groups"] if g["type"] == "Warning"),
+                "chars": len(render_tool_evidence(correlated)),
+            },
+        ),
+    ]
+
+
+@stage("tabular_render")
+def bench_tabular_render(args, ctx) -> list[dict]:
+    """
+    1k-item Pod and Event lists as indented JSON vs table, uncapped, and
+    how many items each format fits in one evidence entry.
+    """
+    from eks_agent.tools import k8s_reader
+    from eks_agent.tools.render import _render_table, _safe_json, render_tool_evidence
+
+    n = 1000
+    cluster = SyntheticCluster(namespaces=1, pods=n, events=n, seed=args.seed)
+    clients = fake_clients(cluster)
+    ns = namespace_name(0)
+    lists = {
+        "Pod": k8s_reader._list(clients["core"].list_namespaced_pod, ns, kind="Pod")[:n],
+        "Event": k8s_reader._list(clients["core"].list_namespaced_event, ns, kind="Event")[:n],
+    }
+
+    def shown(text: str, total: int) -> int:
+        # Items that made it into the entry: table rows, or JSON objects
+        # whose "metadata" key survived truncation.
+        if "output_type: table" in text:
+            omitted = text.rsplit("(", 1)[-1].split(" ")[0] if "more items omitted" in text else "0"
+            return total - int(omitted)
+        return text.count('"metadata":')
+
+    rows = []
+    for kind, items in lists.items():
+        table = "\n".join(_render_table(items, limit=10 ** 9, max_rows=n))
+        plain = _safe_json(items)
+        entry = [{"kind": kind, "namespace": ns, "name": None, "output": items}]
+        for label, fn, text, tabular in (
+            ("json", lambda: _safe_json(items), plain, frozenset()),
+            ("table", lambda: _render_table(items, limit=10 ** 9, max_rows=n), table, frozenset({"*"})),
+        ):
+            rows.append(measure(
+                f"render[{kind} x{len(items)} {label}]",
+                fn,
+                iterations=max(1, args.iterations // 4),
+                extra={
+                    "chars": len(text),
+                    "approx_tokens": len(text) // 4,
+                    "items_in_evidence": shown(render_tool_evidence(entry, tabular_kinds=tabular), len(items)),
+                },
+            ))
+    return rows
+
+
+@stage("paste")
+def bench_paste(args, ctx) -> list[dict]:
+    """
+    Manual-mode paste of `kubectl get pods -o json|yaml` for 1k pods (with a
+    spec, as kubectl prints them): parse time and prompt chars before/after.
+    """
+    import yaml
+
+    from eks_agent.tools import k8s_reader
+    from eks_agent.tools.paste import parse_pasted
+    from eks_agent.tools.render import render_tool_evidence
+
+    cluster = SyntheticCluster(namespaces=1, pods=1000, events=0, seed=args.seed)
+    ns = namespace_name(0)
+    raw = k8s_reader._fetch_raw(fake_clients(cluster)["core"].list_namespaced_pod, ns, verb="list")
+    raw = dict(raw, apiVersion="v1", kind="List")
+    for item in raw["items"]:
+        item["spec"] = {
+            "containers": [{
+                "name": "app",
+                "image": f"{item['metadata']['name']}:1.4.3",
+                "env": [{"name": f"VAR_{i}", "value": "x" * 20} for i in range(10)],
+                "resources": {"limits": {"memory": "256Mi"}, "requests": {"cpu": "100m"}},
+            }],
+        }
+
+    rows = []
+    for label, text in (
+        ("json", json.dumps(raw, indent=4)),
+        ("yaml", yaml.safe_dump(raw)),
+    ):
+        paste = f"$ kubectl get pods -n {ns} -o {label}\n{text}"
+        entries, _, _ = parse_pasted(paste)
+        rendered = render_tool_evidence(entries, tabular_kinds=frozenset({"*"}))
+        rows.append(measure(
+            f"parse_pasted[{label} x{len(raw['items'])} pods]",
+            lambda: parse_pasted(paste),
+            iterations=max(1, args.iterations // 10),
+            extra={
+                "paste_chars": len(paste),
+                "prompt_chars": len(rendered),
+                "spec_in_prompt": '"spec"' in rendered or "spec." in rendered,
+            },
+        ))
+    return rows
+
+
+@stage("rules")
+def bench_rules(args, ctx) -> list[dict]:
+    """
+    Deterministic pre-analysis over a --large-pods pod list plus its events,
+    and the short-circuit answer for a single OOMKilled pod.
+    """
+    from eks_agent.tools import k8s_reader, rules
+    from eks_agent.tools.events import correlate_evidence
+
+    cluster = SyntheticCluster(namespaces=1, pods=args.large_pods, events=args.events, seed=args.seed)
+    clients = fake_clients(cluster)
+    ns = namespace_name(0)
+    pods = k8s_reader._list(clients["core"].list_namespaced_pod, ns, kind="Pod")
+    events = k8s_reader._list(clients["core"].list_namespaced_event, ns, kind="Event")
+    results = correlate_evidence([
+        {"kind": "Pod", "namespace": ns, "name": None, "output": pods},
+        {"kind": "Event", "namespace": ns, "name": None, "output": events},
+    ])
+    analysis = rules.evaluate(results)
+
+    oom = next(
+        p for p in pods
+        if any(((cs.get("lastState") or {}).get("terminated") or {}).get("reason") == "OOMKilled"
+               for cs in p["status"].get("containerStatuses") or [])
+    )
+    single = [{"kind": "Pod", "namespace": ns, "name": oom["metadata"]["name"], "output": oom}]
+
+    return [
+        measure(
+            f"rules.evaluate[{len(pods)} pods]",
+            lambda: rules.evaluate(results),
+            iterations=args.iterations,
+            extra={
+                "failure_class": analysis["failure_class"],
+                "classes": len(analysis["findings"]),
+                "chars": len(rules.render_pre_analysis(analysis)),
+            },
+        ),
+        measure(
+            "rules.direct_answer[1 OOMKilled pod]",
+            lambda: rules.direct_answer(rules.evaluate(single), enabled=True),
+            iterations=args.iterations,
+            extra={"short_circuited": rules.direct_answer(rules.evaluate(single), enabled=True) is not None},
+        ),
+    ]
+
+
+@stage("pod_log")
+def bench_pod_log(args, ctx) -> list[dict]:
+    """
+    Bounded PodLog read through the fake API, plus the reducer alone on a
+    long synthetic stream to show its memory does not grow with volume.
+    """
+    from benchmarks.cluster import synthetic_log
+    from eks_agent.tools.k8s_reader import read_object
+    from eks_agent.tools.logs import reduce_log_stream
+
+    ns = namespace_name(0)
+    pod = ctx["cluster"].list("pods", ns)[0]["metadata"]["name"]
+    probe = read_object("PodLog", ns, pod, options={"previous": True})
+    return [
+        measure(
+            "read_object[PodLog previous]",
+            lambda: read_object("PodLog", ns, pod, options={"previous": True}),
+            iterations=args.iterations,
+            extra={"lines": probe["lines"], "errors": len(probe["error_lines"])},
+        ),
+        measure(
+            f"reduce_log_stream[{args.log_lines} lines]",
+            lambda: reduce_log_stream(synthetic_log(pod, lines=args.log_lines)),
+            iterations=max(1, args.iterations // 10),
+            extra={"lines": args.log_lines},
+        ),
+    ]
+
+
+@stage("evidence_delta")
+def bench_evidence_delta(args, ctx) -> list[dict]:
+    """
+    Second round of the same Pod list after a tenth of the pods restarted:
+    full re-render vs the delta against the previous snapshot.
+    """
+    import copy
+
+    from eks_agent.tools import k8s_reader, snapshots
+    from eks_agent.tools.render import render_tool_evidence
+
+    cluster = SyntheticCluster(namespaces=1, pods=args.pods, events=0, seed=args.seed)
+    ns = namespace_name(0)
+    first = [{"kind": "Pod", "namespace": ns, "name": None,
+              "output": k8s_reader._list(fake_clients(cluster)["core"].list_namespaced_pod, ns, kind="Pod")}]
+
+    after = copy.deepcopy(cluster)
+    for i, pod in enumerate(after.objects[("pods", ns)]):
+        if i % 10 == 0:
+            pod["status"]["containerStatuses"][0]["restartCount"] += 1
+            pod["metadata"]["resourceVersion"] = str(10 ** 6 + i)
+    second = [{"kind": "Pod", "namespace": ns, "name": None,
+               "output": k8s_reader._list(fake_clients(after)["core"].list_namespaced_pod, ns, kind="Pod")}]
+
+    sig, session = "Pod:bench", f"bench-{uuid.uuid4()}"
+
+    def delta_round():
+        snapshots.record(session, sig, first)
+        return render_tool_evidence(snapshots.apply_deltas(session, sig, second))
+
+    return [
+        measure(
+            "render_tool_evidence[full round 2]",
+            lambda: render_tool_evidence(second),
+            iterations=args.iterations,
+            extra={"chars": len(render_tool_evidence(second))},
+        ),
+        measure(
+            "apply_deltas+render[round 2]",
+            delta_round,
+            iterations=args.iterations,
+            extra={"chars": len(delta_round()), "changed_pods": (args.pods + 9) // 10},
+        ),
+    ]
+
+
+@stage("rate_limit")
+def bench_rate_limit(args, ctx) -> list[dict]:
+    """
+    Client-side budget and 429 handling against a local fake:
+      - a burst of LISTs from --concurrency threads drains at --list-qps
+      - interactive reads overtake queued background (prefetch) reads
+      - reads rejected with 429 + Retry-After succeed after backing off
+    """
+    import threading
+
+    from eks_agent.tools import k8s_reader, ratelimit
+
+    ns = namespace_name(0)
+    cluster = SyntheticCluster(namespaces=1, pods=20, events=0, seed=args.seed)
+    calls: Counter = Counter()
+    clients = fake_clients(cluster, calls=calls)
+    throttle = ServerThrottle()
+    throttled_clients = fake_clients(cluster, calls=calls, throttle=throttle)
+    burst = max(4, args.concurrency * 4)
+
+    def drain(fn, n, workers):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda _: fn(), range(n)))
+
+    rows = []
+    with offline(clients, None, clusters={"throttled": throttled_clients}, rate_limits=True):
+        ratelimit._BUCKETS[(None, "list")] = ratelimit.TokenBucket(args.list_qps, 1)
+        t0 = time.perf_counter()
+        drain(lambda: k8s_reader.read_object("Pod", ns), burst, max(2, args.concurrency))
+        elapsed = time.perf_counter() - t0
+        rows.append({
+            "stage": f"LIST burst[{burst} @ {args.list_qps} qps]",
+            "iterations": burst,
+            "p50_ms": 0.0, "p95_ms": 0.0,
+            "mean_ms": elapsed / burst * 1000,
+            "ops_per_s": burst / elapsed,
+            "peak_mem_kib": 0.0,
+            "expected_s": round((burst - 1) / args.list_qps, 2),
+            "elapsed_s": round(elapsed, 2),
+        })
+
+        # Priority: background reads queue first, interactive ones arrive later.
+        ratelimit._BUCKETS[(None, "list")] = ratelimit.TokenBucket(args.list_qps, 1)
+        finished: list[str] = []
+        lock = threading.Lock()
+
+        def read(priority):
+            if priority == ratelimit.BACKGROUND:
+                with ratelimit.background():
+                    k8s_reader.read_object("Pod", ns)
+            else:
+                k8s_reader.read_object("Pod", ns)
+            with lock:
+                finished.append(priority)
+
+        k8s_reader.read_object("Pod", ns)  # drain the single burst token
+        threads = [threading.Thread(target=read, args=(ratelimit.BACKGROUND,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.02)
+        later = [threading.Thread(target=read, args=(ratelimit.INTERACTIVE,)) for _ in range(4)]
+        for t in later:
+            t.start()
+        for t in threads + later:
+            t.join()
+        rows.append({
+            "stage": "priority[4 background, then 4 interactive]",
+            "iterations": 8,
+            "p50_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0, "ops_per_s": 0.0, "peak_mem_kib": 0.0,
+            "completion_order": "".join("I" if p == ratelimit.INTERACTIVE else "b" for p in finished),
+        })
+
+        # Server-side 429s with Retry-After.
+        throttle.remaining, throttle.retry_after = 2, "0.1"
+        t0 = time.perf_counter()
+        out = k8s_reader.read_object("Pod", ns, cluster="throttled")
+        rows.append({
+            "stage": "429 Retry-After[2 rejections, 0.1s]",
+            "iterations": 1,
+            "p50_ms": 0.0, "p95_ms": 0.0,
+            "mean_ms": (time.perf_counter() - t0) * 1000,
+            "ops_per_s": 0.0, "peak_mem_kib": 0.0,
+            "rejected": throttle.rejected,
+            "items": len(out),
+        })
+    return rows
+
+
+@stage("render_tool_evidence")
+def bench_render(args, ctx) -> list[dict]:
+    from eks_agent.tools.k8s_reader import read_object
+    from eks_agent.tools.render import render_tool_evidence
+
+    ns = namespace_name(0)
+    results = [
+        {"kind": kind, "namespace": ns, "name": None, "output": read_object(kind, ns)}
+        for kind in ("Pod", "Event")
+    ]
+    chars = len(render_tool_evidence(results))
+    return [measure(
+        "render_tool_evidence",
+        lambda: render_tool_evidence(results),
+        iterations=args.iterations,
+        extra={"items": sum(len(r["output"]) for r in results), "chars": chars},
+    )]
+
+
+def _synthetic_docs(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "doc_id": f"doc-{i}",
+            "source": f"synthetic_{i}.md",
+            "title": f"Synthetic runbook {i}",
+            "text": "\n".join(
+                "- " + " ".join(rng.choice(_WORDS) for _ in range(12))
+                for _ in range(8)
+            ),
+        }
+        for i in range(n)
+    ]
+
+
+@stage("retrieve_top_k")
+def bench_retrieve_top_k(args, ctx) -> list[dict]:
+    from eks_agent.rag.retrieve import build_index, retrieve_top_k
+    from eks_agent.rag.store import load_internal_docs
+
+    docs = load_internal_docs("internal_docs") + _synthetic_docs(args.docs, args.seed)
+    index = build_index(docs)
+    return [measure(
+        "retrieve_top_k",
+        lambda: retrieve_top_k(index, "CrashLoopBackOff container restart oom", k=3, min_score=0.5),
+        iterations=args.iterations,
+        extra={"docs": len(docs)},
+    )]
+
+
+@stage("vector_search")
+def bench_vector_search(args, ctx) -> list[dict]:
+    from eks_agent.rag.retrieve_semantic import retrieve_semantic
+    from eks_agent.rag.vector_store import VectorStore
+
+    embedder = ctx["embedder"]
+    docs = _synthetic_docs(args.docs, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(os.path.join(tmp, "bench.sqlite"))
+        for d in docs:
+            store.upsert(d["doc_id"], d["title"], d["text"], embedder.embed_text(d["text"]), {})
+
+        query = embedder.embed_text("pod keeps restarting with exit code 137")
+        extra = {"docs": len(docs), "dim": len(query)}
+        return [
+            measure(
+                "VectorStore.search",
+                lambda: store.search(query, top_k=5),
+                iterations=args.iterations,
+                extra=extra,
+            ),
+            measure(
+                "retrieve_semantic",
+                lambda: retrieve_semantic("pod keeps restarting", store, embedder, top_k=5),
+                iterations=args.iterations,
+                extra=extra,
+            ),
+        ] + _bench_local_embeddings(args, docs, tmp)
+
+
+def _bench_local_embeddings(args, docs: list[dict], tmp: str) -> list[dict]:
+    """
+    Local TF-IDF + SVD backend: fit on the corpus, then per-query embedding
+    and end-to-end semantic retrieval with no Bedrock round trip.
+    """
+    from eks_agent.rag.embeddings import embedder_for, save_embedder
+    from eks_agent.rag.local_embeddings import LocalEmbeddingProvider
+    from eks_agent.rag.retrieve_semantic import retrieve_semantic
+    from eks_agent.rag.store import load_internal_docs
+    from eks_agent.rag.vector_store import VectorStore
+
+    docs = [
+        dict(d, doc_id=d["source"], title=d["source"])
+        for d in load_internal_docs("internal_docs")
+    ] + docs
+    texts = [d["text"] for d in docs]
+
+    t0 = time.perf_counter()
+    local = LocalEmbeddingProvider.fit(texts)
+    fit_s = time.perf_counter() - t0
+
+    store = VectorStore(os.path.join(tmp, "local.sqlite"))
+    save_embedder(store, local)
+    for d in docs:
+        store.upsert(d["doc_id"], d["title"], d["text"], local.embed_text(d["text"]), {})
+    embedder = embedder_for(store)  # as a query process would load it
+
+    top = retrieve_semantic("container OOMKilled exit code 137", store, embedder, top_k=1)
+    extra = {
+        "docs": len(docs),
+        "dim": embedder.dim,
+        "fit_s": round(fit_s, 2),
+        "model_kib": round(len(store.get_meta("embedder")) / 1024),
+        "top_hit": top[0]["title"] if top else None,
+    }
+    return [
+        measure(
+            "LocalEmbeddingProvider.embed_text",
+            lambda: embedder.embed_text("pod keeps restarting with exit code 137"),
+            iterations=args.iterations * 50,
+            extra=extra,
+        ),
+        measure(
+            "retrieve_semantic[local]",
+            lambda: retrieve_semantic("pod keeps restarting", store, embedder, top_k=5),
+            iterations=args.iterations,
+            extra=extra,
+        ),
+    ]
+
+
+@stage("quantization")
+def bench_quantization(args, ctx) -> list[dict]:
+    """
+    VectorStore codecs on clustered synthetic vectors: search latency,
+    recall@k against exact search (with and without re-ranking) and
+    resident memory per million vectors.
+    """
+    import sqlite3
+    import tracemalloc
+
+    from eks_agent.rag.vector_store import VectorStore
+
+    rng = random.Random(args.seed)
+    dim, n, k = args.quant_dim, args.quant_vectors, 10
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(max(1, n // 40))]
+    vectors = [[c + 0.5 * rng.gauss(0, 1) for c in rng.choice(centers)] for _ in range(n)]
+    queries = [[x + 0.3 * rng.gauss(0, 1) for x in rng.choice(vectors)] for _ in range(args.iterations)]
+
+    def resident_per_million(fn) -> float:
+        tracemalloc.start()
+        try:
+            kept = fn()  # noqa: F841 (keep the result alive while measuring)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size / n * 1e6 / 2**20
+
+    def load_vectors() -> list:
+        conn = sqlite3.connect(store.db_path)
+        try:
+            return [json.loads(v) for (v,) in conn.execute("SELECT vector FROM vectors")]
+        finally:
+            conn.close()
+
+    def recall(results: list[list[str]]) -> float:
+        hits = sum(len(set(a) & set(b)) for a, b in zip(exact, results))
+        return round(hits / (k * len(queries)), 3)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(os.path.join(tmp, "quant.sqlite"))
+        for i, v in enumerate(vectors):
+            store.upsert(f"doc-{i}", f"doc {i}", "", v, {})
+
+        exact = [[d["doc_id"] for d, _ in store.search(q, k, exact=True)] for q in queries]
+        it = iter(queries * 2)
+        rows.append(measure(
+            f"VectorStore.search[exact x{n}]",
+            lambda: store.search(next(it), k, exact=True),
+            iterations=len(queries) - 2,
+            extra={
+                "dim": dim,
+                "recall_at_10": 1.0,
+                # what an exact search decodes per query (JSON -> lists)
+                "mib_per_million": round(resident_per_million(load_vectors)),
+                "float32_mib_per_million": round(4 * dim * 1e6 / 2**20),
+            },
+        ))
+
+        for codec, options in (("int8", {}), ("pq", {})):
+            t0 = time.perf_counter()
+            store.quantize(codec, **options)
+            train_s = time.perf_counter() - t0
+            store._codes = None
+            mib = resident_per_million(store._load_codes)
+
+            reranked = [[d["doc_id"] for d, _ in store.search(q, k)] for q in queries]
+            codes_only = [[d["doc_id"] for d, _ in store.search(q, k, rerank=k)] for q in queries]
+            params = store._codec().params()
+            code_bytes = len(store._codec().encode(vectors[0]))
+            it = iter(queries * 2)
+            rows.append(measure(
+                f"VectorStore.search[{codec} x{n}]",
+                lambda: store.search(next(it), k),
+                iterations=len(queries) - 2,
+                extra={
+                    "dim": dim,
+                    "codec": {key: v for key, v in params.items() if key != "codebooks"},
+                    "train_s": round(train_s, 2),
+                    "recall_at_10": recall(reranked),
+                    "recall_at_10_codes_only": recall(codes_only),
+                    "code_bytes": code_bytes,
+                    "mib_per_million": round(mib),
+                },
+            ))
+    return rows
+
+
+@stage("coalescing")
+def bench_coalescing(args, ctx) -> list[dict]:
+    """
+    --concurrency callers issue the same read and the same prompt at once
+    against slow stand-ins; each should reach the backend once per wave.
+    """
+    import threading
+
+    from eks_agent import bedrock, metrics
+    from eks_agent.server import execute_call
+    from eks_agent.tools.model import ToolCall
+
+    callers = max(2, args.concurrency)
+    cluster = SyntheticCluster(namespaces=1, pods=args.pods, events=0, seed=args.seed)
+    calls: Counter = Counter()
+    clients = fake_clients(cluster, latency_s=0.05, calls=calls)
+    replay = ReplayBedrockClient(load_fixture(args.bedrock_fixture), latency_s=0.05)
+    call = ToolCall(kind="Pod", namespace=namespace_name(0))
+
+    def wave(fn):
+        barrier = threading.Barrier(callers)
+
+        def one(_):
+            barrier.wait()
+            return fn()
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            return list(pool.map(one, range(callers)))
+
+    # measure() runs fn once more to sample peak memory.
+    iterations = max(1, args.iterations // 4)
+    waves = iterations + 1
+
+    before = dict(metrics.COALESCED._values)
+    with offline(clients, replay):
+        rows = [
+            measure(
+                f"execute_call[x{callers} identical]",
+                lambda: wave(lambda: execute_call(call)),
+                iterations=iterations,
+                warmup=0,
+            ),
+            measure(
+                f"invoke_claude[x{callers} identical]",
+                lambda: wave(lambda: bedrock.invoke_claude("system", "same question")),
+                iterations=iterations,
+                warmup=0,
+            ),
+        ]
+    after = metrics.COALESCED._values
+
+    rows[0].update(callers=callers * waves, backend_calls=sum(calls.values()))
+    rows[1].update(callers=callers * waves, backend_calls=len(replay.requests))
+    for row, group in zip(rows, ("read", "model")):
+        row["coalesced"] = after.get((group,), 0) - before.get((group,), 0)
+    return rows
+
+
+@stage("bedrock_scheduler")
+def bench_bedrock_scheduler(args, ctx) -> list[dict]:
+    """
+    --model-calls distinct prompts from 16 threads against a stand-in with a
+    concurrency quota of 4 (excess calls throttled), then against one with
+    a slow tail (10% of calls +500ms), with and without hedging.
+    """
+    from eks_agent import bedrock, scheduler
+
+    fixture = load_fixture(args.bedrock_fixture)
+    callers = 16
+    scenarios = [
+        ("no retries", dict(capacity=4), dict(max_retries=0, initial_concurrency=callers, max_concurrency=callers)),
+        ("adaptive", dict(capacity=4), dict()),
+        ("slow tail", dict(capacity=callers, slow_fraction=0.1, slow_s=0.5), dict(initial_concurrency=callers)),
+        ("slow tail, hedged", dict(capacity=callers * 2, slow_fraction=0.1, slow_s=0.5),
+         dict(initial_concurrency=callers * 2, max_concurrency=callers * 2, hedge_after=0.1)),
+    ]
+
+    rows = []
+    saved = dict(scheduler._SCHEDULERS)
+    try:
+        for label, client_opts, sched_opts in scenarios:
+            flaky = FlakyBedrockClient(ReplayBedrockClient(fixture, latency_s=0.02), seed=args.seed, **client_opts)
+            model_id = bedrock.ROUTES["final"].model_id
+            sched = scheduler.CallScheduler(model_id, **sched_opts)
+            scheduler._SCHEDULERS[model_id] = sched
+            timings, errors = [], 0
+
+            def one(i):
+                nonlocal errors
+                t0 = time.perf_counter()
+                try:
+                    bedrock.invoke_claude("system", f"question {label} {i}")
+                except Exception:
+                    errors += 1
+                timings.append(time.perf_counter() - t0)
+
+            t_start = time.perf_counter()
+            with offline(ctx["clients"], flaky):
+                with ThreadPoolExecutor(max_workers=callers) as pool:
+                    list(pool.map(one, range(args.model_calls)))
+            elapsed = time.perf_counter() - t_start
+
+            rows.append({
+                "stage": f"bedrock_scheduler[{label}]",
+                "iterations": args.model_calls,
+                "p50_ms": percentile(timings, 50) * 1000,
+                "p95_ms": percentile(timings, 95) * 1000,
+                "mean_ms": sum(timings) / len(timings) * 1000,
+                "ops_per_s": args.model_calls / elapsed,
+                "peak_mem_kib": 0.0,
+                "errors": errors,
+                "attempts": flaky.calls,
+                "throttled": flaky.throttled,
+                "final_limit": round(sched.limit.limit, 2),
+            })
+    finally:
+        scheduler._SCHEDULERS.clear()
+        scheduler._SCHEDULERS.update(saved)
+    return rows
+
+
+@stage("model_routing")
+def bench_model_routing(args, ctx) -> list[dict]:
+    """
+    --sessions scripted sessions with every stage on the strong model, then
+    with the default per-stage routes; reports model calls and estimated
+    cost per session by route (token counts come from the fixture).
+    """
+    from eks_agent import bedrock, metrics, server
+
+    question = f"my pod keeps crashing in namespace {namespace_name(0)}"
+    strong = {name: r._replace(model_id=bedrock.MODEL_ID) for name, r in bedrock.ROUTES.items()}
+    configs = [("single model", strong), ("routed", dict(bedrock.ROUTES))]
+
+    rows = []
+    saved = dict(bedrock.ROUTES)
+    try:
+        for label, routes in configs:
+            bedrock.ROUTES.clear()
+            bedrock.ROUTES.update(routes)
+            replay = ReplayBedrockClient(load_fixture(args.bedrock_fixture), latency_s=args.model_latency_ms / 1000)
+            before = dict(metrics.MODEL_COST._values)
+            with offline(ctx["clients"], replay):
+                row = measure(
+                    f"model_routing[{label}]",
+                    lambda: run_session(server.ask, question),
+                    iterations=args.sessions,
+                )
+            sessions = args.sessions + 2  # measure() adds a warm-up and a memory pass
+            spent = {
+                route: value - before.get((route, model), 0)
+                for (route, model), value in metrics.MODEL_COST._values.items()
+            }
+            row["usd_per_session"] = round(sum(spent.values()) / sessions, 5)
+            for route, r in routes.items():
+                row[f"{route}_model"] = r.model_id.split(".", 1)[-1]
+            row["calls_by_model"] = dict(Counter(req["model_id"].split(".", 1)[-1] for req in replay.requests))
+            rows.append(row)
+    finally:
+        bedrock.ROUTES.clear()
+        bedrock.ROUTES.update(saved)
+    return rows
+
+
+def run_session(ask: Callable[[dict], dict], question: str) -> dict:
+    """
+    One scripted session: ask, approve every permission round, return the
+    final response. Raises if the replayed responses don't drive the
+    expected question -> permission -> answer flow.
+    """
+    session_id = str(uuid.uuid4())
+    res = ask({"session_id": session_id, "question": question})
+    rounds = 0
+    while res.get("mode") == "permission":
+        rounds += 1
+        res = ask({"session_id": session_id, "tool_choice": "self"})
+    if res.get("mode") != "answer" or rounds == 0:
+        raise RuntimeError(f"Unexpected scripted session outcome after {rounds} rounds: {res}")
+    return res
+
+
+@stage("import_time")
+def bench_import_time(args, ctx) -> list[dict]:
+    """
+    Cold-start import cost of the server and the CLI, each in fresh
+    interpreters. Rows over budget (or importing a lazy SDK) make the run
+    exit non-zero.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    baseline = set(import_profile("pass", cwd=root))
+
+    rows = []
+    for name, (code, budget_ms, lazy) in IMPORT_BUDGETS.items():
+        runs = []
+        for _ in range(args.import_runs):
+            modules = import_profile(code, cwd=root)
+            total = sum(cum for m, (_, cum, depth) in modules.items() if depth == 0 and m not in baseline)
+            runs.append((total / 1000, modules))
+        best_ms, modules = min(runs, key=lambda r: r[0])
+
+        heaviest = sorted(
+            ((cum, m) for m, (_, cum, depth) in modules.items() if m not in baseline and depth <= 1),
+            reverse=True,
+        )
+        eager = sorted({m.split(".")[0] for m in modules} & set(lazy))
+        rows.append({
+            "stage": f"import_time[{name}]",
+            "iterations": args.import_runs,
+            "p50_ms": sorted(r[0] for r in runs)[len(runs) // 2],
+            "mean_ms": sum(r[0] for r in runs) / len(runs),
+            "best_ms": best_ms,
+            "budget_ms": budget_ms,
+            "modules": len(set(modules) - baseline),
+            "heaviest": [f"{m} {cum / 1000:.0f}ms" for cum, m in heaviest[:5]],
+            "eager_sdks": eager,
+            "over_budget": best_ms > budget_ms or bool(eager),
+        })
+    return rows
+
+
+@stage("server.ask")
+def bench_server_ask(args, ctx) -> list[dict]:
+    from eks_agent import server
+
+    question = f"my pod keeps crashing in namespace {namespace_name(0)}"
+    one = lambda: run_session(server.ask, question)
+
+    if args.concurrency <= 1:
+        return [measure("server.ask[session]", one, iterations=args.sessions)]
+
+    one()  # warm-up
+    timings = []
+
+    def timed():
+        t0 = time.perf_counter()
+        one()
+        timings.append(time.perf_counter() - t0)
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda _: timed(), range(args.sessions)))
+    elapsed = time.perf_counter() - t_start
+
+    return [{
+        "stage": f"server.ask[session x{args.concurrency}]",
+        "iterations": args.sessions,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "ops_per_s": args.sessions / elapsed,
+        "peak_mem_kib": 0.0,
+    }]
+
+
+@stage("triage")
+def bench_triage(args, ctx) -> list[dict]:
+    """
+    An Alertmanager storm of --alerts firing alerts: mostly repeats of a few
+    (namespace, alertname) pairs, then one distinct alert per pod to push
+    the queue past its bound.
+    """
+    from eks_agent import server
+    from eks_agent.triage import TriageQueue
+
+    alertnames = ("KubePodCrashLooping", "KubePodNotReady", "KubeDeploymentReplicasMismatch")
+
+    def alert(ns: str, name: str, pod: str) -> dict:
+        return {
+            "status": "firing",
+            "fingerprint": f"{ns}/{name}/{pod}",
+            "labels": {"alertname": name, "namespace": ns, "pod": pod, "severity": "warning"},
+            "annotations": {"summary": f"{name} for {pod}"},
+        }
+
+    storms = {
+        "repeats": [
+            alert(namespace_name(i % args.namespaces), alertnames[i % len(alertnames)], f"api-{i}")
+            for i in range(args.alerts)
+        ],
+        "distinct": [
+            alert(namespace_name(0), f"Synthetic{i}", f"api-{i}")
+            for i in range(args.alerts)
+        ],
+    }
+
+    rows = []
+    for label, storm in storms.items():
+        triage = TriageQueue(
+            server.ask,
+            release=server.end_session,
+            workers=args.triage_workers,
+            queue_size=args.triage_queue,
+        )
+        t0 = time.perf_counter()
+        outcomes = [triage.submit(a) for a in storm]
+        accept_s = time.perf_counter() - t0
+        triage.join()
+        elapsed = time.perf_counter() - t0
+
+        jobs = {o["job_id"] for o in outcomes if o}
+        statuses = Counter(triage.get(j)["status"] for j in jobs)
+        rows.append({
+            "stage": f"triage[{label} x{len(storm)}]",
+            "iterations": len(storm),
+            "p50_ms": accept_s / len(storm) * 1000,
+            "p95_ms": 0.0,
+            "mean_ms": elapsed * 1000,
+            "ops_per_s": len(storm) / elapsed,
+            "peak_mem_kib": 0.0,
+            "jobs": len(jobs),
+            "deduplicated": sum(1 for o in outcomes if o and o["duplicate"]),
+            "rejected": outcomes.count(None),
+            "done": statuses.get("done", 0),
+            "failed": statuses.get("failed", 0),
+            "sessions_held": sum(1 for j in jobs if triage.get(j)["session_id"] in server._TOOL_HISTORY),
+        })
+    return rows
+
+
+# =========================================================
+# Main
+# =========================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline eks-agent benchmarks")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of: " + ", ".join(STAGES))
+    parser.add_argument("--namespaces", type=int, default=3)
+    parser.add_argument("--pods", type=int, default=200, help="pods per namespace")
+    parser.add_argument("--events", type=int, default=1000, help="events per namespace")
+    parser.add_argument("--large-pods", type=int, default=5000, help="pods in the large_pod_list stage")
+    parser.add_argument("--list-qps", type=float, default=20.0, help="LIST budget in the rate_limit stage")
+    parser.add_argument("--log-lines", type=int, default=200000, help="lines streamed through the log reducer")
+    parser.add_argument("--large-events", type=int, default=50000, help="events in the event_correlation stage")
+    parser.add_argument("--model-calls", type=int, default=200, help="calls in the bedrock_scheduler stage")
+    parser.add_argument("--alerts", type=int, default=500, help="alerts per storm in the triage stage")
+    parser.add_argument("--triage-workers", type=int, default=4)
+    parser.add_argument("--triage-queue", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=4, help="fake clusters in the fanout stage")
+    parser.add_argument("--fanout-timeout", type=float, default=0.25, help="per-cluster deadline in the fanout stage (s)")
+    parser.add_argument("--docs", type=int, default=200, help="synthetic RAG documents")
+    parser.add_argument("--dim", type=int, default=1536, help="embedding dimension for replayed vectors")
+    parser.add_argument("--quant-vectors", type=int, default=2000, help="vectors in the quantization stage")
+    parser.add_argument("--quant-dim", type=int, default=256, help="vector dimension in the quantization stage")
+    parser.add_argument("--import-runs", type=int, default=5, help="fresh interpreters per import_time row")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--kube-latency-ms", type=float, default=0.0)
+    parser.add_argument("--model-latency-ms", type=float, default=0.0)
+    parser.add_argument("--bedrock-fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--embedding-fixture", default=None)
+    parser.add_argument("--record", action="store_true", help="call live Bedrock and overwrite the fixtures")
+    parser.add_argument("--embedding-model-id", default="amazon.titan-embed-text-v1")
+    parser.add_argument("--json", dest="json_out", default=None, help="also write rows as JSON")
+    args = parser.parse_args(argv)
+
+    selected = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in selected if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    cluster = SyntheticCluster(
+        namespaces=args.namespaces,
+        pods=args.pods,
+        events=args.events,
+        seed=args.seed,
+    )
+    calls: Counter = Counter()
+    clients = fake_clients(cluster, latency_s=args.kube_latency_ms / 1000, calls=calls)
+
+    if args.record:
+        from eks_agent.bedrock import get_bedrock_client
+        from eks_agent.rag.embeddings import BedrockEmbeddingProvider
+
+        bedrock_client = RecordingBedrockClient(get_bedrock_client())
+        embedder = RecordingEmbeddingProvider(BedrockEmbeddingProvider(args.embedding_model_id))
+    else:
+        bedrock_client = ReplayBedrockClient(
+            load_fixture(args.bedrock_fixture),
+            latency_s=args.model_latency_ms / 1000,
+        )
+        recorded = load_fixture(args.embedding_fixture) if args.embedding_fixture else None
+        embedder = ReplayEmbeddingProvider(dim=args.dim, recorded=recorded)
+
+    ctx = {"cluster": cluster, "clients": clients, "calls": calls, "embedder": embedder}
+
+    rows: list[dict] = []
+    with offline(clients, bedrock_client):
+        for name in selected:
+            rows.extend(STAGES[name](args, ctx))
+
+    if args.record:
+        save_fixture(args.bedrock_fixture, bedrock_client.fixture)
+        if args.embedding_fixture:
+            save_fixture(args.embedding_fixture, embedder.recorded)
+
+    print(
+        f"cluster: {args.namespaces} namespaces x {args.pods} pods x {args.events} events; "
+        f"kube calls: {sum(calls.values())}"
+    )
+    print(format_report(rows))
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    over = [r["stage"] for r in rows if r.get("over_budget")]
+    if over:
+        print(f"\nover budget: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,18 @@
 # cli/eks_agent.py
+import json
+import re
 import sys
+import time
 import uuid
-import requests
+import urllib.error
+import urllib.request
+from typing import Iterator
 
 SESSION_FILE = ".eks_agent_session"
 SERVER_URL = "http://127.0.0.1:8080/ask"
 
+PERMISSION_POLICIES = ("auto", "manual", "deny")
+
 
 def load_or_create_session() -> str:
     try:
@@ -22,11 +29,25 @@ def load_or_create_session() -> str:
     return sid
 
 
-def post(payload: dict) -> dict:
-    r = requests.post(SERVER_URL, json=payload)
-    if not r.ok:
-        raise RuntimeError(f"Server error: {r.status_code}\n{r.text}")
-    return r.json()
+def post(payload: dict, http=None, url: str = SERVER_URL) -> dict:
+    if http is not None:
+        r = http.post(url, json=payload)
+        if not r.ok:
+            raise RuntimeError(f"Server error: {r.status_code}\n{r.text}")
+        return r.json()
+
+    # urllib instead of requests: a one-shot `ask` should not pay ~100ms
+    # of imports before it sends anything.
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req) as r:
+            return json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"Server error: {e.code}\n{e.read().decode(errors='replace')}") from None
 
 
 def print_debug(res: dict):
@@ -92,7 +113,174 @@ def run_one_turn(session_id: str, question: str, debug: bool) -> None:
         print("\nagent> (no response)\n")
 
 
+# =========================================================
+# Batch mode
+# =========================================================
+
+_RESULT_RE = re.compile(r"^(Failure class|Evidence status):\s*(.+?)\s*$", re.M)
+
+
+def open_http_session(pool_size: int):
+    """
+    One keep-alive connection pool shared by every batch worker.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    http.mount("http://", adapter)
+    http.mount("https://", adapter)
+    return http
+
+
+def read_batch(lines) -> Iterator[dict]:
+    """
+    JSONL items ({"question": ..., "id"?, "session_id"?, "permission"?});
+    a line that is not JSON is taken as the question itself. A malformed
+    JSON line becomes an item carrying its line number and parse error.
+    """
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            item = json.loads(line) if line.startswith("{") else {"question": line}
+        except json.JSONDecodeError as e:
+            item = {"line": n, "error": f"invalid JSON on line {n}: {e}"}
+        item.setdefault("id", str(n))
+        yield item
+
+
+def run_item(item: dict, http, url: str, policy: str, max_rounds: int, debug: bool) -> dict:
+    """
+    One question in its own session, permission rounds answered by `policy`.
+    """
+    session_id = item.get("session_id") or f"batch-{uuid.uuid4()}"
+    policy = item.get("permission") or policy
+    out = {"id": item["id"], "session_id": session_id, "question": item.get("question")}
+    if "line" in item:
+        out["line"] = item["line"]
+    commands: list[str] = []
+    requests_ms: list[float] = []
+    rounds = 0
+    t0 = time.perf_counter()
+
+    def send(payload: dict) -> dict:
+        t = time.perf_counter()
+        try:
+            return post(dict(payload, session_id=session_id, debug=debug), http=http, url=url)
+        finally:
+            requests_ms.append(round((time.perf_counter() - t) * 1000, 1))
+
+    try:
+        if item.get("error"):
+            raise ValueError(item["error"])
+        if policy not in PERMISSION_POLICIES:
+            raise ValueError(f"unknown permission policy '{policy}'")
+        if not item.get("question"):
+            raise ValueError("missing question")
+
+        res = send({"question": item["question"]})
+        while res.get("mode") == "permission":
+            commands.extend(res.get("kubectl_commands", []))
+            if policy == "deny" or rounds >= max_rounds:
+                break
+            rounds += 1
+            res = send({"tool_choice": "self" if policy == "auto" else "manual"})
+
+        if res.get("mode") == "permission":
+            status = "denied" if policy == "deny" else "max_rounds"
+        elif res.get("mode") == "error":
+            status = "error"
+        else:
+            status = "answered"
+        text = (res.get("text") or "").strip()
+        out.update(
+            status=status,
+            mode=res.get("mode"),
+            text=text,
+            **{k.lower().replace(" ", "_"): v for k, v in _RESULT_RE.findall(text)},
+        )
+        if debug and res.get("debug"):
+            out["debug"] = res["debug"]
+    except Exception as e:
+        out.update(status="error", error=str(e))
+
+    out.update(
+        permission_rounds=rounds,
+        kubectl_commands=commands,
+        timings={"total_ms": round((time.perf_counter() - t0) * 1000, 1), "requests_ms": requests_ms},
+    )
+    return out
+
+
+def run_batch(argv: list[str]) -> int:
+    import argparse
+    from collections import Counter
+    from concurrent.futures import ThreadPoolExecutor
+
+    parser = argparse.ArgumentParser(
+        prog="eks_agent.py batch",
+        description="Run many questions, each in its own session; JSONL in, JSONL out.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of questions (default: stdin)")
+    parser.add_argument("--out", default="-", help="JSONL results file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--permission",
+        choices=PERMISSION_POLICIES,
+        default="deny",
+        help="answer to permission rounds: auto (collect via SDK), manual, or deny (stop and record the commands)",
+    )
+    parser.add_argument("--max-rounds", type=int, default=5, help="permission rounds per question")
+    parser.add_argument("--url", default=SERVER_URL)
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input)
+    dst = sys.stdout if args.out == "-" else open(args.out, "w")
+    http = open_http_session(args.concurrency)
+    statuses: Counter = Counter()
+    totals: list[float] = []
+    t0 = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            # map() keeps input order, so results diff cleanly between runs.
+            results = pool.map(
+                lambda item: run_item(item, http, args.url, args.permission, args.max_rounds, args.debug),
+                read_batch(src),
+            )
+            for r in results:
+                dst.write(json.dumps(r) + "\n")
+                dst.flush()
+                statuses[r["status"]] += 1
+                totals.append(r["timings"]["total_ms"])
+    finally:
+        http.close()
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    totals.sort()
+    p50 = totals[len(totals) // 2] if totals else 0.0
+    p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))] if totals else 0.0
+    print(
+        f"batch: {len(totals)} questions in {time.perf_counter() - t0:.1f}s "
+        f"({', '.join(f'{k} {v}' for k, v in sorted(statuses.items())) or 'none'}); "
+        f"p50 {p50:.0f}ms, p95 {p95:.0f}ms",
+        file=sys.stderr,
+    )
+    return 1 if statuses["error"] else 0
+
+
 def main():
+    # Batch mode
+    if len(sys.argv) >= 2 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+
     debug = "--debug" in sys.argv
     args = [a for a in sys.argv if a != "--debug"]
 
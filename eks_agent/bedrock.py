@@ -1,40 +1,159 @@
+import hashlib
 import json
-import boto3
+import os
+import threading
+import time
+from typing import NamedTuple, Optional, Union
+
+from eks_agent import metrics, scheduler
+from eks_agent.singleflight import SingleFlight
+
+MODEL_ID = os.environ.get("EKS_AGENT_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
+FAST_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+
+# USD per 1k tokens (input, output); unknown models are recorded at 0.
+PRICES_PER_1K = {
+    "anthropic.claude-3-haiku-20240307-v1:0": (0.00025, 0.00125),
+    "anthropic.claude-3-sonnet-20240229-v1:0": (0.003, 0.015),
+    "anthropic.claude-3-5-sonnet-20240620-v1:0": (0.003, 0.015),
+    "anthropic.claude-3-opus-20240229-v1:0": (0.015, 0.075),
+}
+
+
+class Route(NamedTuple):
+    model_id: str
+    max_tokens: int
+    stop_sequences: tuple = ()
+
+
+def _route(stage: str, model_id: str, max_tokens: int, stop_sequences: tuple = ()) -> Route:
+    prefix = f"EKS_AGENT_{stage.upper()}"
+    return Route(
+        model_id=os.environ.get(f"{prefix}_MODEL", model_id),
+        max_tokens=int(os.environ.get(f"{prefix}_MAX_TOKENS", str(max_tokens))),
+        stop_sequences=stop_sequences,
+    )
+
+
+# Pipeline stage -> model. The draft only has to name a failure class, so
+# it runs on the fast model and stops once that line is written. That line
+# is item 5 of the draft structure, so its budget stays at 500 tokens: a
+# truncated draft parses as Unknown and skips the class-filtered RAG lookup.
+ROUTES: dict[str, Route] = {
+    "draft": _route("draft", FAST_MODEL_ID, 500, ("\nEvidence status:",)),
+    "tools": _route("tools", MODEL_ID, 500),
+    "final": _route("final", MODEL_ID, 1000),
+}
+
+# Identical concurrent prompts (temperature 0) share one Bedrock call.
+_INFLIGHT = SingleFlight("model")
+
+Messages = list[dict]
+
+
+# boto3 is imported, and the client built, on first use (or by the
+# server's pre-warm); clients are thread-safe, so one is shared.
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
 
 def get_bedrock_client():
-    return boto3.client("bedrock-runtime")
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            import boto3
 
-def ask_claude(system_prompt: str, user_prompt: str) -> str:
-    client = get_bedrock_client()
+            _CLIENT = boto3.client("bedrock-runtime", config=scheduler.client_config())
+        return _CLIENT
 
-    body = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": 500,
-        "temperature": 0,
-        "system": system_prompt,
-        "messages": [
+def to_messages(prompt: Union[str, Messages]) -> Messages:
+    """
+    Normalize a prompt into Messages API turns.
+
+    A plain string becomes a single user turn; a list is assumed to already
+    be alternating user/assistant turns and is passed through untouched.
+    """
+    if isinstance(prompt, str):
+        return [
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": user_prompt}
+                    {"type": "text", "text": prompt}
                 ]
             }
-        ],
+        ]
+    return prompt
+
+def invoke_claude(
+    system_prompt: str,
+    messages: Union[str, Messages],
+    tools: Optional[list[dict]] = None,
+    route: str = "final",
+) -> dict:
+    """
+    Call the model and return the decoded Messages API response.
+
+    When `tools` is given the model may answer with structured `tool_use`
+    content blocks alongside (or instead of) text. `route` picks the model,
+    max_tokens and stop sequences from ROUTES.
+    """
+    client = get_bedrock_client()
+    r = ROUTES[route]
+
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": r.max_tokens,
+        "temperature": 0,
+        "system": system_prompt,
+        "messages": to_messages(messages),
     }
+    if r.stop_sequences:
+        body["stop_sequences"] = list(r.stop_sequences)
+    if tools:
+        body["tools"] = tools
+        body["tool_choice"] = {"type": "auto"}
+
+    request_body = json.dumps(body)
+    key = hashlib.sha256((r.model_id + request_body).encode()).hexdigest()
+    sched = scheduler.for_model(r.model_id)
+    return _INFLIGHT.do(key, lambda: sched.call(lambda: _invoke(client, route, r.model_id, request_body)))
 
+def _invoke(client, route: str, model_id: str, request_body: str) -> dict:
+    t0 = time.perf_counter()
     response = client.invoke_model(
-        modelId="anthropic.claude-3-sonnet-20240229-v1:0",
-        body=json.dumps(body),
+        modelId=model_id,
+        body=request_body,
         contentType="application/json",
         accept="application/json",
     )
 
     raw_body = response["body"].read()
     decoded = json.loads(raw_body)
+    metrics.MODEL_SECONDS.observe(time.perf_counter() - t0, route=route, model=model_id)
 
-    return extract_text(decoded)
+    usage = decoded.get("usage") or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    metrics.record_model_usage(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        request_bytes=len(request_body),
+        response_bytes=len(raw_body),
+    )
+    price_in, price_out = PRICES_PER_1K.get(model_id, (0.0, 0.0))
+    cost = (input_tokens * price_in + output_tokens * price_out) / 1000
+    metrics.MODEL_COST.inc(cost, route=route, model=model_id)
+    metrics.annotate(route=route, model=model_id, cost_usd=round(cost, 6))
 
-def extract_text(decoded_response: dict) -> str:
+    if decoded.get("type") != "message":
+        raise RuntimeError("Unexpected Bedrock response format")
+
+    return decoded
+
+def ask_claude(system_prompt: str, messages: Union[str, Messages], route: str = "final") -> str:
+    return extract_text(invoke_claude(system_prompt, messages, route=route))
+
+def extract_text(decoded_response: dict, required: bool = True) -> str:
     if decoded_response.get("type") != "message":
         raise RuntimeError("Unexpected Bedrock response format")
 
@@ -45,7 +164,17 @@ def extract_text(decoded_response: dict) -> str:
         if block.get("type") == "text":
             texts.append(block.get("text", ""))
 
-    if not texts:
+    if not texts and required:
         raise RuntimeError(f"No text returned by model: {decoded_response}")
 
-    return "\n".join(texts)
\ No newline at end of file
+    return "\n".join(texts)
+
+def extract_tool_uses(decoded_response: dict, name: str) -> list[dict]:
+    """
+    Return the `input` of every tool_use block calling `name`.
+    """
+    return [
+        block.get("input") or {}
+        for block in decoded_response.get("content", [])
+        if block.get("type") == "tool_use" and block.get("name") == name
+    ]
@@ -1,21 +1,42 @@
 # Simple in-memory store
-# session_id -> list of messages
+# session_id -> list of Messages API turns
+#
+# Turns are kept in the shape Bedrock expects:
+#   {"role": "user" | "assistant", "content": [{"type": "text", "text": ...}]}
+# Consecutive messages from the same role are merged into one turn so the
+# list always alternates and can be sent as-is.
 
 _MEMORY = {}
 
 
+def text_block(text: str) -> dict:
+    # The Messages API rejects empty text blocks; storing one would fail
+    # every later turn of the session.
+    if not text or not text.strip():
+        raise ValueError("text block must not be empty")
+    return {"type": "text", "text": text}
+
+
 def add_message(session_id: str, role: str, text: str):
-    if session_id not in _MEMORY:
-        _MEMORY[session_id] = []
+    turns = _MEMORY.setdefault(session_id, [])
 
-    _MEMORY[session_id].append({
-        "role": role,
-        "text": text,
-    })
+    if turns and turns[-1]["role"] == role:
+        turns[-1]["content"].append(text_block(text))
+    else:
+        turns.append({
+            "role": role,
+            "content": [text_block(text)],
+        })
 
-    # keep only last 6 messages
-    _MEMORY[session_id] = _MEMORY[session_id][-6:]
+    # keep only last 6 turns, and always open with a user turn
+    del turns[:-6]
+    while turns and turns[0]["role"] != "user":
+        turns.pop(0)
 
 
 def get_messages(session_id: str):
-    return _MEMORY.get(session_id, [])
\ No newline at end of file
+    return _MEMORY.get(session_id, [])
+
+
+def forget_session(session_id: str):
+    _MEMORY.pop(session_id, None)
@@ -0,0 +1,298 @@
+# eks_agent/metrics.py
+#
+# Minimal in-process tracing + Prometheus text exposition.
+# No client library, no exporters: /metrics renders straight from here.
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+_LOCK = threading.Lock()
+_REGISTRY: list = []
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        _REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _LOCK:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with _LOCK:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(value)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        _REGISTRY.append(self)
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _LOCK:
+            self._values[key] = value
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with _LOCK:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series: dict[tuple, dict] = {}
+        _REGISTRY.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _LOCK:
+            s = self._series.get(key)
+            if s is None:
+                s = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = s
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    s["counts"][i] += 1
+            s["sum"] += value
+            s["count"] += 1
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _LOCK:
+            items = sorted((k, dict(v, counts=list(v["counts"]))) for k, v in self._series.items())
+        for key, s in items:
+            for bound, count in zip(self.buckets, s["counts"]):
+                le = f'le="{_fmt_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {count}"
+                )
+            labels = _fmt_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt_value(s['sum'])}")
+            lines.append(f"{self.name}_count{labels} {s['count']}")
+        return lines
+
+
+def render() -> str:
+    """
+    Prometheus text exposition (format 0.0.4) of every registered metric.
+    """
+    lines: list[str] = []
+    for metric in list(_REGISTRY):
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# Metrics
+# =========================================================
+
+STAGE_SECONDS = Histogram(
+    "eks_agent_stage_duration_seconds",
+    "Wall time spent per pipeline stage.",
+    ("stage",),
+)
+READ_ITEMS = Histogram(
+    "eks_agent_read_items",
+    "Objects returned per Kubernetes read.",
+    ("kind",),
+    buckets=COUNT_BUCKETS,
+)
+MODEL_TOKENS = Counter(
+    "eks_agent_model_tokens_total",
+    "Model tokens by stage and direction (input/output).",
+    ("stage", "direction"),
+)
+MODEL_BYTES = Counter(
+    "eks_agent_model_bytes_total",
+    "Model request/response body bytes by stage and direction.",
+    ("stage", "direction"),
+)
+MODEL_SECONDS = Histogram(
+    "eks_agent_model_call_seconds",
+    "Bedrock model round-trip time by route and model.",
+    ("route", "model"),
+)
+MODEL_COST = Counter(
+    "eks_agent_model_cost_usd_total",
+    "Estimated model spend in USD by route and model.",
+    ("route", "model"),
+)
+REQUESTS = Counter(
+    "eks_agent_requests_total",
+    "Handled /ask requests by response mode.",
+    ("mode",),
+)
+QUEUE_SECONDS = Histogram(
+    "eks_agent_kube_queue_seconds",
+    "Time Kubernetes reads waited for a client-side rate-limit token.",
+    ("verb", "priority"),
+)
+THROTTLED = Counter(
+    "eks_agent_kube_throttled_total",
+    "Kubernetes reads throttled (queue_timeout, server_429).",
+    ("verb", "reason"),
+)
+COALESCED = Counter(
+    "eks_agent_coalesced_total",
+    "Calls served by joining an identical in-flight call.",
+    ("group",),
+)
+BEDROCK_THROTTLED = Counter(
+    "eks_agent_bedrock_throttled_total",
+    "Bedrock attempts rejected with a throttling error.",
+    ("model",),
+)
+BEDROCK_RETRIES = Counter(
+    "eks_agent_bedrock_retries_total",
+    "Bedrock calls retried, by reason (throttled, transient).",
+    ("model", "reason"),
+)
+BEDROCK_HEDGED = Counter(
+    "eks_agent_bedrock_hedged_total",
+    "Hedged second attempts started for slow Bedrock calls.",
+    ("model",),
+)
+BEDROCK_QUEUE_SECONDS = Histogram(
+    "eks_agent_bedrock_queue_seconds",
+    "Time Bedrock calls waited for a concurrency slot.",
+    ("model",),
+)
+BEDROCK_CONCURRENCY = Gauge(
+    "eks_agent_bedrock_concurrency_limit",
+    "Current adaptive concurrency limit for Bedrock calls.",
+    ("model",),
+)
+TRIAGE_ALERTS = Counter(
+    "eks_agent_triage_alerts_total",
+    "Alertmanager alerts by outcome (enqueued, deduplicated, rejected, resolved).",
+    ("outcome",),
+)
+TRIAGE_JOBS = Counter(
+    "eks_agent_triage_jobs_total",
+    "Finished triage jobs by status (done, failed).",
+    ("status",),
+)
+PREWARM_STEPS = Counter(
+    "eks_agent_prewarm_steps_total",
+    "Background pre-warm steps by outcome (ok, failed).",
+    ("step", "status"),
+)
+
+
+# =========================================================
+# Spans
+# =========================================================
+
+_TRACE: ContextVar[Optional[list]] = ContextVar("eks_agent_trace", default=None)
+_CURRENT: ContextVar[Optional[dict]] = ContextVar("eks_agent_span", default=None)
+
+
+def start_trace() -> list:
+    """
+    Begin collecting finished spans for the current request context.
+    """
+    trace: list = []
+    _TRACE.set(trace)
+    return trace
+
+
+@contextmanager
+def span(stage: str, **attrs) -> Iterator[dict]:
+    """
+    Time a stage. The yielded dict may be updated with extra attributes
+    (item counts, bytes, ...) and ends up in the request trace.
+    """
+    rec = {"stage": stage, **attrs}
+    token = _CURRENT.set(rec)
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec["seconds"] = round(time.perf_counter() - t0, 6)
+        _CURRENT.reset(token)
+        STAGE_SECONDS.observe(rec["seconds"], stage=stage)
+        if "items" in rec and "kind" in rec:
+            READ_ITEMS.observe(rec["items"], kind=str(rec["kind"]).lower())
+        trace = _TRACE.get()
+        if trace is not None:
+            trace.append(rec)
+
+
+def annotate(**attrs):
+    """
+    Attach attributes to the innermost open span, if any.
+    """
+    rec = _CURRENT.get()
+    if rec is not None:
+        rec.update(attrs)
+
+
+def record_model_usage(
+    input_tokens: int,
+    output_tokens: int,
+    request_bytes: int,
+    response_bytes: int,
+):
+    rec = _CURRENT.get()
+    stage = rec["stage"] if rec is not None else "unscoped"
+    annotate(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        request_bytes=request_bytes,
+        response_bytes=response_bytes,
+    )
+    MODEL_TOKENS.inc(input_tokens, stage=stage, direction="input")
+    MODEL_TOKENS.inc(output_tokens, stage=stage, direction="output")
+    MODEL_BYTES.inc(request_bytes, stage=stage, direction="request")
+    MODEL_BYTES.inc(response_bytes, stage=stage, direction="response")
@@ -0,0 +1,87 @@
+# eks_agent/prewarm.py
+#
+# Background pre-warm for cold starts.
+#
+# The kubernetes SDK, boto3 and the RAG index are loaded on first use, so
+# the server imports quickly and can answer health checks right away. When
+# ENABLED, a daemon thread started with the server then does that first
+# use ahead of the first request: SDK imports, the RAG index, the Bedrock
+# and Kubernetes clients, and API discovery.
+#
+# A step that fails (no kubeconfig, no AWS credentials yet) is recorded and
+# skipped; the request that needs it does the same work again, as it would
+# without pre-warm.
+
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from eks_agent import metrics
+
+ENABLED = os.environ.get("EKS_AGENT_PREWARM", "1") != "0"
+
+
+def import_kubernetes():
+    import kubernetes.client  # noqa: F401
+    from kubernetes.client.exceptions import ApiException  # noqa: F401
+
+
+def import_boto3():
+    import boto3  # noqa: F401
+    from botocore.config import Config  # noqa: F401
+
+
+class Prewarm:
+    """
+    Runs (name, fn) steps in order on one background thread.
+    """
+
+    def __init__(self, steps: list[tuple[str, Callable[[], object]]]):
+        self.steps = steps
+        self._status: dict[str, dict] = {name: {"status": "pending"} for name, _ in steps}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """
+        Start the thread once; False if it was already started.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._run, name="eks-agent-prewarm", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        try:
+            for name, fn in self.steps:
+                t0 = time.perf_counter()
+                try:
+                    with metrics.span(f"prewarm_{name}"):
+                        fn()
+                    rec = {"status": "ok"}
+                except Exception as e:
+                    rec = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+                rec["seconds"] = round(time.perf_counter() - t0, 3)
+                metrics.PREWARM_STEPS.inc(step=name, status=rec["status"])
+                with self._lock:
+                    self._status[name] = rec
+        finally:
+            self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every step has run (tests, benchmarks).
+        """
+        return self._done.wait(timeout)
+
+    def status(self) -> dict:
+        with self._lock:
+            if self._thread is None:
+                state = "off"
+            else:
+                state = "done" if self._done.is_set() else "running"
+            return {"state": state, "steps": {k: dict(v) for k, v in self._status.items()}}
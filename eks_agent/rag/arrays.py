@@ -0,0 +1,17 @@
+# eks_agent/rag/arrays.py
+#
+# Typed arrays <-> base64 strings, so fitted model parameters (local
+# embedding components, PQ codebooks) can be stored in JSON specs.
+
+import base64
+from array import array
+
+
+def pack_array(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode()
+
+
+def unpack_array(typecode: str, data: str) -> array:
+    out = array(typecode)
+    out.frombytes(base64.b64decode(data))
+    return out
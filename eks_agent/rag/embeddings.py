@@ -1,21 +1,50 @@
 # eks_agent/rag/embeddings.py
 
-from typing import List
+from typing import List, Optional, Protocol
 import json
-import boto3
+
+from eks_agent import scheduler
+from eks_agent.rag.local_embeddings import LocalEmbeddingProvider
+from eks_agent.rag.vector_store import VectorStore
+
+# Indexes built before providers were recorded used Titan.
+DEFAULT_SPEC = {"provider": "bedrock", "model_id": "amazon.titan-embed-text-v1"}
+
+
+class EmbeddingProvider(Protocol):
+    def embed_text(self, text: str) -> List[float]: ...
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]: ...
+
+    def spec(self) -> dict:
+        """
+        JSON-safe description stored with the index; load_embedder(spec)
+        rebuilds the same provider for queries.
+        """
+        ...
 
 
 class BedrockEmbeddingProvider:
     """
     Minimal, deterministic embedding provider.
-    No retries, no magic.
+    Throttles and timeouts are retried by the shared Bedrock scheduler.
     """
 
     def __init__(self, model_id: str, region: str = "us-east-1"):
+        import boto3
+
         self.model_id = model_id
-        self.client = boto3.client("bedrock-runtime", region_name=region)
+        self.region = region
+        self.client = boto3.client(
+            "bedrock-runtime",
+            region_name=region,
+            config=scheduler.client_config(),
+        )
 
     def embed_text(self, text: str) -> List[float]:
+        return scheduler.for_model(self.model_id).call(lambda: self._embed(text))
+
+    def _embed(self, text: str) -> List[float]:
         resp = self.client.invoke_model(
             modelId=self.model_id,
             body=json.dumps({"inputText": text}),
@@ -26,4 +55,32 @@ class BedrockEmbeddingProvider:
         return body["embedding"]
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        return [self.embed_text(t) for t in texts]
\ No newline at end of file
+        return [self.embed_text(t) for t in texts]
+
+    def spec(self) -> dict:
+        return {"provider": "bedrock", "model_id": self.model_id, "region": self.region}
+
+
+def load_embedder(spec: dict) -> EmbeddingProvider:
+    provider = spec.get("provider")
+    if provider == "bedrock":
+        return BedrockEmbeddingProvider(spec["model_id"], spec.get("region", "us-east-1"))
+    if provider == "local":
+        return LocalEmbeddingProvider.from_spec(spec)
+    raise ValueError(f"Unknown embedding provider '{provider}'")
+
+
+def index_spec(store: VectorStore) -> Optional[dict]:
+    raw = store.get_meta("embedder")
+    return json.loads(raw) if raw else None
+
+
+def save_embedder(store: VectorStore, embedder: EmbeddingProvider):
+    store.set_meta("embedder", json.dumps(embedder.spec()))
+
+
+def embedder_for(store: VectorStore) -> EmbeddingProvider:
+    """
+    The provider an index was built with; queries must use the same one.
+    """
+    return load_embedder(index_spec(store) or DEFAULT_SPEC)
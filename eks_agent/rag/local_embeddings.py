@@ -0,0 +1,233 @@
+# eks_agent/rag/local_embeddings.py
+#
+# Local CPU embedding backend (no network, stdlib only).
+#
+# Text -> word 1-2 grams and character trigrams, hashed into BUCKETS
+# features -> sublinear TF-IDF -> projection onto the top `dim` singular
+# vectors of the corpus' TF-IDF matrix (latent semantic analysis). The
+# projection is fitted once on the internal corpus by
+# scripts/build_vector_index.py and stored with the index, so queries
+# embed in tens of microseconds with the same model.
+#
+# Truncated SVD uses randomized subspace iteration on the doc x doc Gram
+# matrix, then a Jacobi eigensolver on the small projected matrix; the
+# corpus is a few hundred runbooks, not millions of documents.
+
+import math
+import random
+import re
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from operator import mul
+from typing import List
+
+from eks_agent.rag.arrays import pack_array, unpack_array
+
+PROVIDER = "local"
+BUCKETS = 1 << 20
+DEFAULT_DIM = 64
+MAX_DF = 0.9  # n-grams in more documents than this carry no signal
+
+_WORD_RE = re.compile(r"[a-zA-Z0-9_]+")
+
+
+def _dot(a, b) -> float:
+    return sum(map(mul, a, b))
+
+
+def _features(text: str) -> Counter:
+    words = [w.lower() for w in _WORD_RE.findall(text)]
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    # Character trigrams match word variants ("crashloop", "CrashLoopBackOff").
+    for w in set(words):
+        w = f"<{w}>"
+        grams.extend(w[i:i + 3] for i in range(len(w) - 2))
+    # crc32 is stable across processes, unlike hash().
+    return Counter(zlib.crc32(g.encode()) % BUCKETS for g in grams)
+
+
+def _orthonormalize(cols: list[list[float]]) -> list[list[float]]:
+    """
+    Modified Gram-Schmidt; near-dependent columns are dropped.
+    """
+    out: list[list[float]] = []
+    for v in cols:
+        v = list(v)
+        for q in out:
+            d = _dot(v, q)
+            v = [x - d * y for x, y in zip(v, q)]
+        norm = math.sqrt(_dot(v, v))
+        if norm > 1e-10:
+            out.append([x / norm for x in v])
+    return out
+
+
+def _jacobi_eigh(a: list[list[float]], sweeps: int = 50, tol: float = 1e-9) -> tuple[list[float], list[list[float]]]:
+    """
+    Eigenvalues and eigenvectors (as rows) of a small symmetric matrix.
+
+    Off-diagonal entries below `tol` relative to their diagonal are left
+    alone; the vectors are stored as float32 anyway.
+    """
+    n = len(a)
+    a = [row[:] for row in a]
+    vt = [[float(i == j) for j in range(n)] for i in range(n)]
+    for _ in range(sweeps):
+        rotated = False
+        for p in range(n):
+            for q in range(p + 1, n):
+                apq = a[p][q]
+                if abs(apq) <= tol * math.sqrt(abs(a[p][p] * a[q][q])) or apq == 0.0:
+                    continue
+                rotated = True
+                theta = (a[q][q] - a[p][p]) / (2 * apq)
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                # Rows p and q, then the matching columns (a stays symmetric).
+                rp, rq = a[p], a[q]
+                new_p = [c * x - s * y for x, y in zip(rp, rq)]
+                new_q = [s * x + c * y for x, y in zip(rp, rq)]
+                new_p[p], new_q[q] = rp[p] - t * apq, rq[q] + t * apq
+                new_p[q] = new_q[p] = 0.0
+                a[p], a[q] = new_p, new_q
+                for k, row in enumerate(a):
+                    row[p], row[q] = new_p[k], new_q[k]
+                vp, vq = vt[p], vt[q]
+                vt[p] = [c * x - s * y for x, y in zip(vp, vq)]
+                vt[q] = [s * x + c * y for x, y in zip(vp, vq)]
+        if not rotated:
+            break
+    return [a[i][i] for i in range(n)], vt
+
+
+class LocalEmbeddingProvider:
+    """
+    Hashed n-gram TF-IDF projected with a truncated SVD fitted on the corpus.
+    """
+
+    def __init__(self, idf: dict[int, float], components: dict[int, array], dim: int):
+        self.idf = idf
+        self.components = components
+        self.dim = dim
+
+    @classmethod
+    def fit(cls, texts: List[str], dim: int = DEFAULT_DIM, power_iters: int = 2, seed: int = 0) -> "LocalEmbeddingProvider":
+        docs = [_features(t) for t in texts]
+        n = len(docs)
+        if n == 0:
+            raise ValueError("cannot fit a local embedding model on an empty corpus")
+
+        df: Counter = Counter()
+        for d in docs:
+            df.update(d.keys())
+        max_df = max(1, int(MAX_DF * n)) if n > 2 else n
+        idf = {
+            b: math.log((1 + n) / (1 + c)) + 1.0
+            for b, c in df.items()
+            if c <= max_df
+        }
+
+        rows = [_tfidf(d, idf) for d in docs]
+
+        # Gram matrix G = X X^T through an inverted index (X is sparse).
+        postings: dict[int, list[tuple[int, float]]] = defaultdict(list)
+        for i, row in enumerate(rows):
+            for b, w in row.items():
+                postings[b].append((i, w))
+        gram = [[0.0] * n for _ in range(n)]
+        for plist in postings.values():
+            for i, wi in plist:
+                gi = gram[i]
+                for j, wj in plist:
+                    gi[j] += wi * wj
+
+        def gram_times(cols: list[list[float]]) -> list[list[float]]:
+            return [[_dot(g, c) for g in gram] for c in cols]
+
+        # Randomized range finder with power iterations.
+        rng = random.Random(seed)
+        width = min(n, dim + 10)
+        basis = _orthonormalize(gram_times([[rng.gauss(0, 1) for _ in range(n)] for _ in range(width)]))
+        for _ in range(power_iters):
+            basis = _orthonormalize(gram_times(basis))
+
+        projected = gram_times(basis)
+        small = [[_dot(qi, gq) for gq in projected] for qi in basis]
+        values, vectors = _jacobi_eigh(small)
+
+        order = sorted(range(len(values)), key=lambda j: values[j], reverse=True)
+        order = [j for j in order if values[j] > 1e-9][:dim]
+        if not order:
+            raise ValueError("corpus has no shared vocabulary to fit on")
+
+        # Left singular vectors U = Q W, then V = X^T U / sigma.
+        u_cols = []
+        basis_rows = list(zip(*basis))
+        for j in order:
+            u_cols.append([_dot(vectors[j], row) for row in basis_rows])
+        sigmas = [math.sqrt(values[j]) for j in order]
+
+        k = len(order)
+        components: dict[int, array] = {}
+        for b, plist in postings.items():
+            comp = array("f", [0.0] * k)
+            for i, w in plist:
+                for c in range(k):
+                    comp[c] += w * u_cols[c][i]
+            for c in range(k):
+                comp[c] /= sigmas[c]
+            components[b] = comp
+        return cls(idf, components, k)
+
+    def embed_text(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for b, w in _tfidf(_features(text), self.idf).items():
+            comp = self.components.get(b)
+            if comp is not None:
+                vec = [x + w * y for x, y in zip(vec, comp)]
+        norm = math.sqrt(_dot(vec, vec))
+        return [x / norm for x in vec] if norm else vec
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(t) for t in texts]
+
+    # -----------------------------
+    # Persistence (stored with the index)
+    # -----------------------------
+
+    def spec(self) -> dict:
+        buckets = sorted(self.components)
+        comps = array("f")
+        for b in buckets:
+            comps.extend(self.components[b])
+        idf_buckets = sorted(self.idf)
+        return {
+            "provider": PROVIDER,
+            "dim": self.dim,
+            "buckets": BUCKETS,
+            "idf_buckets": pack_array(array("I", idf_buckets)),
+            "idf": pack_array(array("f", [self.idf[b] for b in idf_buckets])),
+            "component_buckets": pack_array(array("I", buckets)),
+            "components": pack_array(comps),
+        }
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> "LocalEmbeddingProvider":
+        if spec.get("buckets") != BUCKETS:
+            raise ValueError(f"local embedding model was built with {spec.get('buckets')} buckets, expected {BUCKETS}")
+        dim = spec["dim"]
+        idf = dict(zip(unpack_array("I", spec["idf_buckets"]), unpack_array("f", spec["idf"])))
+        comps = unpack_array("f", spec["components"])
+        components = {
+            b: comps[i * dim:(i + 1) * dim]
+            for i, b in enumerate(unpack_array("I", spec["component_buckets"]))
+        }
+        return cls(idf, components, dim)
+
+
+def _tfidf(counts: Counter, idf: dict[int, float]) -> dict[int, float]:
+    row = {b: (1.0 + math.log(c)) * idf[b] for b, c in counts.items() if b in idf}
+    norm = math.sqrt(sum(w * w for w in row.values()))
+    return {b: w / norm for b, w in row.items()} if norm else row
@@ -0,0 +1,181 @@
+# eks_agent/rag/quantize.py
+#
+# Compact vector codes for VectorStore's approximate first pass.
+#
+# Vectors are L2-normalized before encoding, so the approximate score of a
+# code is its cosine similarity with the (normalized) query:
+#   - int8: one float32 scale + `dim` int8 values per vector (4x smaller
+#     than float32)
+#   - pq (product quantization): the vector is split into `m` subvectors,
+#     each replaced by the id of its nearest centroid in a per-subspace
+#     codebook trained with k-means; one byte per subspace. Scoring looks up
+#     query-centroid dot products in an m x ksub table.
+#
+# Codes only rank candidates; VectorStore re-scores the best ones with the
+# full-precision vectors from disk.
+
+import math
+import random
+from array import array
+from operator import getitem, mul
+from typing import List
+
+from eks_agent.rag.arrays import pack_array, unpack_array
+
+
+def _unit(vec: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else list(vec)
+
+
+class Int8Codec:
+    name = "int8"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def train(self, vectors: List[List[float]]):
+        pass  # per-vector scale, nothing to learn
+
+    def encode(self, vec: List[float]) -> bytes:
+        vec = _unit(vec)
+        peak = max((abs(x) for x in vec), default=0.0) or 1.0
+        scale = peak / 127
+        return array("f", [scale]).tobytes() + array("b", [round(x / scale) for x in vec]).tobytes()
+
+    def pack(self, codes: List[bytes]) -> tuple:
+        """
+        All codes in two contiguous arrays (scales, values) for scores().
+        """
+        scales, values = array("f"), array("b")
+        for code in codes:
+            scales.frombytes(code[:4])
+            values.frombytes(code[4:])
+        return scales, values
+
+    def scores(self, packed: tuple, query: List[float]) -> List[float]:
+        scales, values = packed
+        q, dim, view = _unit(query), self.dim, memoryview(values)
+        return [scale * sum(map(mul, q, view[i * dim:(i + 1) * dim])) for i, scale in enumerate(scales)]
+
+    def params(self) -> dict:
+        return {"codec": self.name, "dim": self.dim}
+
+    @classmethod
+    def from_params(cls, params: dict) -> "Int8Codec":
+        return cls(params["dim"])
+
+
+class PQCodec:
+    name = "pq"
+
+    def __init__(self, dim: int, m: int = 0, ksub: int = 16, iters: int = 10, sample: int = 2000, seed: int = 0):
+        # Default: ~16 dimensions per subspace (the largest divisor of dim).
+        m = m or next(d for d in range(max(1, dim // 16), 0, -1) if dim % d == 0)
+        if dim % m:
+            raise ValueError(f"dim {dim} is not divisible into {m} subspaces")
+        if not 1 < ksub <= 256:
+            raise ValueError("ksub must be in 2..256 (one byte per subspace)")
+        self.dim = dim
+        self.m = m
+        self.sub = dim // m
+        self.ksub = ksub
+        self.iters = iters
+        self.sample = sample
+        self.seed = seed
+        self.codebooks: List[List[List[float]]] = []
+
+    def _split(self, vec: List[float]) -> List[List[float]]:
+        return [vec[j * self.sub:(j + 1) * self.sub] for j in range(self.m)]
+
+    @staticmethod
+    def _nearest(x: List[float], centroids: List[List[float]], norms: List[float]) -> int:
+        # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2)
+        best, best_score = 0, -math.inf
+        for i, c in enumerate(centroids):
+            s = sum(map(mul, x, c)) - norms[i]
+            if s > best_score:
+                best, best_score = i, s
+        return best
+
+    def train(self, vectors: List[List[float]]):
+        rng = random.Random(self.seed)
+        data = [_unit(v) for v in vectors]
+        if len(data) > self.sample:
+            data = rng.sample(data, self.sample)
+        if not data:
+            raise ValueError("cannot train product quantization on an empty store")
+
+        self.codebooks = []
+        for j in range(self.m):
+            points = [v[j * self.sub:(j + 1) * self.sub] for v in data]
+            centroids = [list(p) for p in rng.sample(points, min(self.ksub, len(points)))]
+            while len(centroids) < self.ksub:
+                centroids.append(list(rng.choice(points)))
+            for _ in range(self.iters):
+                norms = [sum(x * x for x in c) / 2 for c in centroids]
+                sums = [[0.0] * self.sub for _ in centroids]
+                counts = [0] * len(centroids)
+                for p in points:
+                    i = self._nearest(p, centroids, norms)
+                    counts[i] += 1
+                    sums[i] = [a + b for a, b in zip(sums[i], p)]
+                for i, n in enumerate(counts):
+                    if n:
+                        centroids[i] = [a / n for a in sums[i]]
+                    else:
+                        centroids[i] = list(rng.choice(points))  # re-seed empty clusters
+            self.codebooks.append(centroids)
+
+    def encode(self, vec: List[float]) -> bytes:
+        if not self.codebooks:
+            raise ValueError("PQCodec.encode before train")
+        parts = self._split(_unit(vec))
+        out = bytearray()
+        for part, centroids in zip(parts, self.codebooks):
+            norms = [sum(x * x for x in c) / 2 for c in centroids]
+            out.append(self._nearest(part, centroids, norms))
+        return bytes(out)
+
+    def pack(self, codes: List[bytes]) -> bytes:
+        return b"".join(codes)
+
+    def scores(self, packed: bytes, query: List[float]) -> List[float]:
+        # Asymmetric distance: exact query, quantized documents.
+        tables = [
+            [sum(map(mul, part, c)) for c in centroids]
+            for part, centroids in zip(self._split(_unit(query)), self.codebooks)
+        ]
+        m, view = self.m, memoryview(packed)
+        return [sum(map(getitem, tables, view[i:i + m])) for i in range(0, len(packed), m)]
+
+    def params(self) -> dict:
+        flat = array("f")
+        for centroids in self.codebooks:
+            for c in centroids:
+                flat.extend(c)
+        return {"codec": self.name, "dim": self.dim, "m": self.m, "ksub": self.ksub, "codebooks": pack_array(flat)}
+
+    @classmethod
+    def from_params(cls, params: dict) -> "PQCodec":
+        codec = cls(params["dim"], m=params["m"], ksub=params["ksub"])
+        flat = unpack_array("f", params["codebooks"])
+        sub, ksub = codec.sub, codec.ksub
+        codec.codebooks = [
+            [list(flat[(j * ksub + i) * sub:(j * ksub + i + 1) * sub]) for i in range(ksub)]
+            for j in range(codec.m)
+        ]
+        return codec
+
+
+CODECS = {"int8": Int8Codec, "pq": PQCodec}
+
+
+def make_codec(name: str, dim: int, **options):
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}' (expected one of {', '.join(CODECS)})")
+    return CODECS[name](dim, **options)
+
+
+def codec_from_params(params: dict):
+    return CODECS[params["codec"]].from_params(params)
@@ -1,14 +1,14 @@
 # eks_agent/rag/retrieve_semantic.py
 
 from typing import List
-from eks_agent.rag.embeddings import BedrockEmbeddingProvider
+from eks_agent.rag.embeddings import EmbeddingProvider
 from eks_agent.rag.vector_store import VectorStore
 
 
 def retrieve_semantic(
     query: str,
     vector_store: VectorStore,
-    embedder: BedrockEmbeddingProvider,
+    embedder: EmbeddingProvider,
     top_k: int = 5,
 ) -> List[dict]:
     query_vec = embedder.embed_text(query)
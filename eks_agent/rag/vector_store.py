@@ -1,9 +1,23 @@
 # eks_agent/rag/vector_store.py
+#
+# SQLite-backed document vectors with optional quantized search.
+#
+# Full-precision vectors stay on disk. After quantize("int8" | "pq"), a
+# compact code per document is kept in memory: search() scores every code
+# approximately, then re-ranks the best top_k * RERANK_FACTOR candidates
+# with their exact vectors read back from SQLite.
 
+import heapq
 import sqlite3
 import json
 import math
-from typing import List, Tuple
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from eks_agent.rag.quantize import codec_from_params, make_codec
+
+RERANK_FACTOR = int(os.environ.get("EKS_AGENT_RERANK_FACTOR", "4"))
 
 
 def cosine_similarity(a: List[float], b: List[float]) -> float:
@@ -19,6 +33,11 @@ class VectorStore:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._init_db()
+        # (codec,) once read from meta; (codec, doc_ids, packed codes) once
+        # loaded by the first quantized search
+        self._codec_state: Optional[tuple] = None
+        self._codes: Optional[tuple] = None
+        self._codes_lock = threading.Lock()
 
     def _init_db(self):
         conn = sqlite3.connect(self.db_path)
@@ -37,9 +56,45 @@ class VectorStore:
                 vector TEXT
             )
         """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS codes (
+                doc_id TEXT PRIMARY KEY,
+                code BLOB
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
         conn.commit()
         conn.close()
 
+    def get_meta(self, key: str) -> Optional[str]:
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("REPLACE INTO meta VALUES (?, ?)", (key, value))
+        conn.commit()
+        conn.close()
+
+    def clear(self):
+        """
+        Drop all documents and vectors (metadata is kept).
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM docs")
+        conn.execute("DELETE FROM vectors")
+        conn.execute("DELETE FROM codes")
+        conn.commit()
+        conn.close()
+        self._codes = None
+
     def upsert(self, doc_id: str, title: str, text: str, vector: List[float], meta: dict):
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
@@ -51,10 +106,112 @@ class VectorStore:
             "REPLACE INTO vectors VALUES (?, ?)",
             (doc_id, json.dumps(vector)),
         )
+        codec = self._codec()
+        if codec is not None:
+            cur.execute("REPLACE INTO codes VALUES (?, ?)", (doc_id, codec.encode(vector)))
         conn.commit()
         conn.close()
+        self._codes = None
+
+    # -----------------------------
+    # Quantization
+    # -----------------------------
+
+    def _codec(self):
+        if self._codec_state is None:
+            raw = self.get_meta("codec")
+            self._codec_state = (codec_from_params(json.loads(raw)) if raw else None,)
+        return self._codec_state[0]
+
+    def _invalidate(self):
+        self._codec_state = None
+        self._codes = None
+
+    def quantize(self, codec: str = "int8", **options):
+        """
+        Train `codec` ("int8" or "pq") on the stored vectors and encode all
+        of them; later upserts are encoded as they are written.
+        """
+        conn = sqlite3.connect(self.db_path)
+        rows = [(doc_id, json.loads(v)) for doc_id, v in conn.execute("SELECT doc_id, vector FROM vectors")]
+        if not rows:
+            conn.close()
+            raise ValueError("nothing to quantize: the store has no vectors")
+
+        c = make_codec(codec, len(rows[0][1]), **options)
+        c.train([v for _, v in rows])
+        conn.execute("DELETE FROM codes")
+        conn.executemany("INSERT INTO codes VALUES (?, ?)", ((doc_id, c.encode(v)) for doc_id, v in rows))
+        conn.execute("REPLACE INTO meta VALUES (?, ?)", ("codec", json.dumps(c.params())))
+        conn.commit()
+        conn.close()
+        self._invalidate()
+
+    def dequantize(self):
+        """
+        Back to exact search only.
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM codes")
+        conn.execute("DELETE FROM meta WHERE key = 'codec'")
+        conn.commit()
+        conn.close()
+        self._invalidate()
+
+    def _load_codes(self) -> Optional[tuple]:
+        with self._codes_lock:
+            if self._codes is None:
+                codec = self._codec()
+                if codec is None:
+                    return None
+                conn = sqlite3.connect(self.db_path)
+                rows = conn.execute("SELECT doc_id, code FROM codes").fetchall()
+                conn.close()
+                self._codes = (codec, [r[0] for r in rows], codec.pack([r[1] for r in rows]))
+            return self._codes
+
+    def search(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        exact: bool = False,
+        rerank: Optional[int] = None,
+    ) -> List[Tuple[dict, float]]:
+        """
+        Top documents by cosine similarity.
+
+        A quantized store ranks by codes and re-scores the best `rerank`
+        candidates (default top_k * RERANK_FACTOR) exactly; `exact=True`
+        scans every full-precision vector instead.
+        """
+        codes = None if exact else self._load_codes()
+        if codes is None:
+            return self._search_exact(query_vector, top_k)
+
+        codec, doc_ids, packed = codes
+        if len(query_vector) != codec.dim:
+            raise ValueError(f"query has {len(query_vector)} dimensions, index has {codec.dim}")
+        scores = codec.scores(packed, query_vector)
+        n = rerank or top_k * RERANK_FACTOR
+        candidates = heapq.nlargest(n, range(len(doc_ids)), key=scores.__getitem__)
+        return self._rerank(query_vector, [doc_ids[i] for i in candidates], top_k)
+
+    def _rerank(self, query_vector: List[float], doc_ids: List[str], top_k: int) -> List[Tuple[dict, float]]:
+        if not doc_ids:
+            return []
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            f"""
+            SELECT d.doc_id, d.title, d.text, d.meta, v.vector
+            FROM docs d JOIN vectors v ON d.doc_id = v.doc_id
+            WHERE d.doc_id IN ({",".join("?" * len(doc_ids))})
+            """,
+            doc_ids,
+        ).fetchall()
+        conn.close()
+        return self._score(query_vector, rows, top_k)
 
-    def search(self, query_vector: List[float], top_k: int = 5) -> List[Tuple[dict, float]]:
+    def _search_exact(self, query_vector: List[float], top_k: int) -> List[Tuple[dict, float]]:
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
         cur.execute("""
@@ -63,7 +220,10 @@ class VectorStore:
         """)
         rows = cur.fetchall()
         conn.close()
+        return self._score(query_vector, rows, top_k)
 
+    @staticmethod
+    def _score(query_vector: List[float], rows: list, top_k: int) -> List[Tuple[dict, float]]:
         scored = []
         for doc_id, title, text, meta_json, vec_json in rows:
             vec = json.loads(vec_json)
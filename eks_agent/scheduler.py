@@ -0,0 +1,271 @@
+# eks_agent/scheduler.py
+#
+# Shared scheduler for Bedrock calls (model and embeddings).
+#
+# Every invoke_model goes through the scheduler of its model ID:
+#   - adaptive concurrency (AIMD): while saturated, the in-flight limit
+#     grows by about one per limit's worth of successful calls; it halves
+#     on a throttle, at most once per DECREASE_COOLDOWN_SECONDS
+#   - retries with full-jitter exponential backoff for throttles,
+#     timeouts and transient service errors, within one overall deadline
+#   - a per-attempt timeout (also set as the client's read timeout)
+#   - optional hedging: if an attempt has not answered after HEDGE_AFTER
+#     seconds and there is spare concurrency, a second identical attempt
+#     is started and the first answer wins
+#
+# botocore's own retries are turned off on our clients so attempts are
+# not multiplied behind the scheduler's back.
+
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+from eks_agent import metrics
+
+if TYPE_CHECKING:
+    from botocore.config import Config
+
+T = TypeVar("T")
+
+MAX_CONCURRENCY = int(os.environ.get("EKS_AGENT_BEDROCK_MAX_CONCURRENCY", "16"))
+MIN_CONCURRENCY = 1
+INITIAL_CONCURRENCY = int(os.environ.get("EKS_AGENT_BEDROCK_INITIAL_CONCURRENCY", "4"))
+CALL_TIMEOUT_SECONDS = float(os.environ.get("EKS_AGENT_BEDROCK_TIMEOUT", "60"))
+DEADLINE_SECONDS = float(os.environ.get("EKS_AGENT_BEDROCK_DEADLINE", "120"))
+MAX_RETRIES = int(os.environ.get("EKS_AGENT_BEDROCK_MAX_RETRIES", "4"))
+HEDGE_AFTER_SECONDS = float(os.environ.get("EKS_AGENT_BEDROCK_HEDGE_AFTER", "0"))  # 0 = off
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 20.0
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+_THROTTLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+}
+_TRANSIENT_CODES = {
+    "ModelTimeoutException",
+    "ModelNotReadyException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ReadTimeoutError",
+    "ConnectTimeoutError",
+    "EndpointConnectionError",
+    "TimeoutError",
+}
+
+
+class ModelUnavailable(RuntimeError):
+    pass
+
+
+def client_config() -> "Config":
+    """
+    botocore config for bedrock-runtime clients used through the scheduler.
+    """
+    from botocore.config import Config
+
+    return Config(
+        connect_timeout=5,
+        read_timeout=CALL_TIMEOUT_SECONDS,
+        retries={"total_max_attempts": 1},
+    )
+
+
+def _error_code(exc: BaseException) -> str:
+    resp = getattr(exc, "response", None)
+    if isinstance(resp, dict):
+        if (resp.get("ResponseMetadata") or {}).get("HTTPStatusCode") == 429:
+            return "ThrottlingException"
+        code = (resp.get("Error") or {}).get("Code")
+        if code:
+            return code
+    return type(exc).__name__
+
+
+def retry_reason(exc: BaseException) -> Optional[str]:
+    """
+    "throttled" or "transient" if `exc` is worth retrying, else None.
+    """
+    code = _error_code(exc)
+    if code in _THROTTLE_CODES:
+        return "throttled"
+    if code in _TRANSIENT_CODES:
+        return "transient"
+    return None
+
+
+def backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit: callers wait for a slot below int(limit).
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.inflight = 0
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, deadline: float) -> float:
+        """
+        Take a slot, waiting until `deadline` (monotonic) at most.
+        Returns the time spent queued; raises ModelUnavailable on timeout.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ModelUnavailable(
+                        f"queued {time.monotonic() - start:.1f}s for a Bedrock slot "
+                        f"(limit {int(self.limit)})"
+                    )
+                self._cond.wait(remaining)
+            self.inflight += 1
+        return time.monotonic() - start
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.inflight >= int(self.limit):
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self, ok: bool):
+        with self._cond:
+            saturated = self.inflight >= int(self.limit)
+            self.inflight -= 1
+            # Only grow a limit that is actually being used.
+            if ok and saturated:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def decrease(self) -> bool:
+        """
+        Halve the limit; throttles that arrive together count once.
+        """
+        with self._cond:
+            now = time.monotonic()
+            if now - self._decreased_at < DECREASE_COOLDOWN_SECONDS:
+                return False
+            self._decreased_at = now
+            self.limit = max(self.minimum, self.limit / 2)
+            return True
+
+
+class CallScheduler:
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = MAX_CONCURRENCY,
+        initial_concurrency: int = INITIAL_CONCURRENCY,
+        timeout: float = CALL_TIMEOUT_SECONDS,
+        deadline: float = DEADLINE_SECONDS,
+        max_retries: int = MAX_RETRIES,
+        hedge_after: float = HEDGE_AFTER_SECONDS,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        self.limit = AdaptiveLimit(initial_concurrency, MIN_CONCURRENCY, max_concurrency)
+        # Every running attempt holds a slot, so the pool never queues.
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency),
+            thread_name_prefix="eks-agent-bedrock",
+        )
+        metrics.BEDROCK_CONCURRENCY.set(self.limit.limit, model=name)
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Run `fn` (one invoke_model round trip) under the limit, with retries.
+        """
+        deadline = time.monotonic() + self.deadline
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._attempt(fn, deadline)
+            except ModelUnavailable:
+                raise
+            except Exception as e:
+                reason = retry_reason(e)
+                if reason is None:
+                    raise
+                if reason == "throttled":
+                    metrics.BEDROCK_THROTTLED.inc(model=self.name)
+                    if self.limit.decrease():
+                        metrics.BEDROCK_CONCURRENCY.set(self.limit.limit, model=self.name)
+                delay = backoff(attempt)
+                if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+                    raise ModelUnavailable(
+                        f"Bedrock {reason} after {attempt + 1} attempts: {_error_code(e)}: {e}"
+                    ) from e
+                metrics.BEDROCK_RETRIES.inc(model=self.name, reason=reason)
+                time.sleep(delay)
+
+    def _submit(self, fn: Callable[[], T]) -> Future:
+        fut = self._pool.submit(contextvars.copy_context().run, fn)
+
+        def done(f: Future):
+            # A throttled attempt does not grow the limit.
+            self.limit.release(ok=f.exception() is None)
+
+        fut.add_done_callback(done)
+        return fut
+
+    def _attempt(self, fn: Callable[[], T], deadline: float) -> T:
+        queued = self.limit.acquire(deadline)
+        metrics.BEDROCK_QUEUE_SECONDS.observe(queued, model=self.name)
+
+        budget = min(self.timeout, deadline - time.monotonic())
+        give_up = time.monotonic() + budget
+        pending = {self._submit(fn)}
+
+        if self.hedge_after and self.hedge_after < budget:
+            done, _ = wait(pending, timeout=self.hedge_after)
+            if not done and self.limit.try_acquire():
+                metrics.BEDROCK_HEDGED.inc(model=self.name)
+                pending.add(self._submit(fn))
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, give_up - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for f in done:
+                if f.exception() is None:
+                    metrics.BEDROCK_CONCURRENCY.set(self.limit.limit, model=self.name)
+                    return f.result()
+                error = f.exception()
+
+        if error is not None and not pending:
+            raise error
+        # Abandoned attempts keep their slot until they actually return.
+        raise TimeoutError(f"no Bedrock response within {budget:.1f}s")
+
+
+_SCHEDULERS: dict[str, CallScheduler] = {}
+_LOCK = threading.Lock()
+
+
+def for_model(model_id: str) -> CallScheduler:
+    """
+    Shared scheduler per model ID (Bedrock quotas are per model).
+    """
+    with _LOCK:
+        s = _SCHEDULERS.get(model_id)
+        if s is None:
+            s = _SCHEDULERS[model_id] = CallScheduler(model_id)
+        return s
@@ -1,29 +1,46 @@
 # eks_agent/server.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 import json
+import threading
+import uuid
 from typing import Optional, Any, Tuple
 
-from eks_agent.bedrock import ask_claude
-from eks_agent.memory import add_message, get_messages
+from eks_agent import bedrock, memory, metrics, prewarm
+from eks_agent.singleflight import KeyedLocks, SingleFlight
+from eks_agent.scheduler import ModelUnavailable
+from eks_agent.bedrock import ask_claude, invoke_claude, extract_text, extract_tool_uses
+from eks_agent.memory import add_message, get_messages, text_block
 from eks_agent.prompts import SYSTEM_PROMPT
 
 from eks_agent.rag.store import load_internal_docs
 from eks_agent.rag.retrieve import build_index, retrieve_top_k
 from eks_agent.rag.format import format_internal_refs
 
-from eks_agent.tools.model import ToolRequest, ToolCall
-from eks_agent.tools.k8s_reader import read_object
+from eks_agent.tools.model import ToolRequest, ToolCall, TOOL_NAME, tool_spec
+from eks_agent.tools import k8s_reader
+from eks_agent.tools.k8s_reader import read_object, read_across_clusters
+from eks_agent.tools.discovery import get_discovery
 from eks_agent.tools.render import render_tool_evidence
+from eks_agent.tools.events import correlate_evidence
+from eks_agent.tools.gate import describe_error
+from eks_agent.tools.logs import LOG_KIND, clamp_options
+from eks_agent.tools import owners
+from eks_agent.tools.owners import OWNER_KIND, session_cache
+from eks_agent.tools.paste import parse_pasted
+from eks_agent.tools import prefetch, ratelimit, rules, snapshots
+from eks_agent.triage import TriageQueue
 
 # =========================================================
 # App + global state
 # =========================================================
 
-app = FastAPI()
-
-_INTERNAL_DOCS = load_internal_docs("internal_docs")
-_INTERNAL_INDEX = build_index(_INTERNAL_DOCS)
+# Heavy SDKs and the RAG index load on first use; see eks_agent/prewarm.py.
+_INTERNAL_INDEX: Optional[dict] = None
+_INTERNAL_INDEX_LOCK = threading.Lock()
 
 _PENDING_TOOLS: dict[str, dict] = {}
 _TOOL_HISTORY: dict[str, set[str]] = {}
@@ -31,6 +48,63 @@ _SESSION_SCOPE: dict[str, dict] = {}
 
 _FORBIDDEN_KINDS = {"secret", "configmap"}
 
+# Requests of one session run one at a time (they mutate the session's
+# pending request, history and snapshots); identical reads from different
+# sessions that overlap share one API call.
+_SESSION_LOCKS = KeyedLocks()
+_INFLIGHT_READS = SingleFlight("read")
+
+_TOOLS = [tool_spec()]
+
+# Alert-driven triage jobs run /ask on a bounded worker pool; their
+# sessions are dropped once nobody can continue them.
+_TRIAGE = TriageQueue(lambda payload: ask(payload), release=lambda session_id: end_session(session_id))
+
+def internal_index() -> dict:
+    """
+    Keyword index over internal_docs/, built once on first use.
+    """
+    global _INTERNAL_INDEX
+    with _INTERNAL_INDEX_LOCK:
+        if _INTERNAL_INDEX is None:
+            _INTERNAL_INDEX = build_index(load_internal_docs("internal_docs"))
+        return _INTERNAL_INDEX
+
+def end_session(session_id: str):
+    """
+    Drop everything kept for a session: history, tool history, scope,
+    pending request, prefetched reads, snapshots and the owner cache.
+    """
+    with _SESSION_LOCKS.hold(session_id):
+        _PENDING_TOOLS.pop(session_id, None)
+        _TOOL_HISTORY.pop(session_id, None)
+        _SESSION_SCOPE.pop(session_id, None)
+        memory.forget_session(session_id)
+        prefetch.discard(session_id)
+        snapshots.forget_session(session_id)
+        owners.forget_session(session_id)
+
+def warm_discovery():
+    get_discovery(None).refresh(k8s_reader.get_clients()["api"])
+
+_PREWARM = prewarm.Prewarm([
+    ("rag_index", internal_index),
+    ("kubernetes_sdk", prewarm.import_kubernetes),
+    ("boto3", prewarm.import_boto3),
+    ("bedrock_client", lambda: bedrock.get_bedrock_client()),
+    ("kubernetes_clients", lambda: k8s_reader.get_clients()),
+    ("discovery", warm_discovery),
+])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in the background so health checks pass while it warms up.
+    if prewarm.ENABLED:
+        _PREWARM.start()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+
 # =========================================================
 # Helpers
 # =========================================================
@@ -40,14 +114,173 @@ def validate_kind(kind: str):
         raise ValueError(f"Access to {kind} is forbidden")
 
 def tool_signature(t: ToolCall) -> str:
-    return f"{t.kind}:{t.namespace}:{t.name}"
+    sig = f"{t.kind}:{t.namespace}:{t.name}"
+    if t.kind.lower() == LOG_KIND.lower():
+        # Current and previous logs of each container, and each (clamped)
+        # tail/since window, are distinct reads.
+        opts = clamp_options(t.tail_lines, t.since_seconds)
+        sig += f"/{t.container or ''}" + (":previous" if t.previous else "")
+        sig += f":tail={opts['tail_lines']}"
+        if "since_seconds" in opts:
+            sig += f":since={opts['since_seconds']}"
+    elif t.kind.lower() == OWNER_KIND.lower():
+        sig += f"/{t.target_kind or 'Pod'}"
+    clusters = [c for c in t.targets if c]
+    if clusters:
+        sig += "@" + ",".join(sorted(clusters))
+    return sig
+
+def already_read(session_id: str, t: ToolCall) -> bool:
+    """
+    Session dedup: a read repeats only once its snapshot has gone stale,
+    and then only the changes since the previous round are sent.
+    """
+    sig = tool_signature(t)
+    if sig not in _TOOL_HISTORY.get(session_id, ()):
+        return False
+    return not snapshots.is_stale(session_id, sig)
 
 def requires_scope(t: ToolCall) -> bool:
     return t.name is None and t.namespace is None
 
-def build_history_prompt(session_id: str) -> str:
-    history = get_messages(session_id)
-    return "".join(f"{m['role']}: {m['text']}\n" for m in history)
+def start_prefetch(session_id: str, tool_req: ToolRequest):
+    """
+    Opt-in: begin reading proposed objects while the user decides.
+
+    Only calls that would pass execution-time gating (forbidden kinds,
+    scope, session dedup) are prefetched.
+    """
+    if not prefetch.ENABLED:
+        return
+
+    calls = []
+    for t in tool_req.tools:
+        if t.kind.lower() in _FORBIDDEN_KINDS or requires_scope(t):
+            continue
+        if already_read(session_id, t):
+            continue
+        calls.append(t)
+
+    def speculative_read(call: ToolCall) -> list[dict]:
+        # Nobody is waiting on these yet; real requests go first.
+        with ratelimit.background():
+            return execute_call(call, session_id)
+
+    prefetch.start(session_id, calls, tool_signature, speculative_read)
+
+def execute_call(call: ToolCall, session_id: Optional[str] = None) -> list[dict]:
+    """
+    Run one approved ToolCall.
+
+    Returns evidence entries for render_tool_evidence; fan-out calls yield
+    one entry per cluster, labelled with the cluster it came from.
+    Objects resolved along owner chains are cached per session.
+    Concurrent identical calls share one read; entries must not be mutated.
+    """
+    return _INFLIGHT_READS.do(tool_signature(call), lambda: _execute(call, session_id))
+
+def failed_call(call: ToolCall, exc: BaseException) -> list[dict]:
+    """
+    Evidence entries for a call whose read raised (throttled, API error).
+    """
+    return [
+        {
+            "kind": call.kind,
+            "namespace": call.namespace,
+            "name": call.name,
+            "cluster": cluster,
+            "output": {"error": describe_error(exc)},
+        }
+        for cluster in call.targets
+    ]
+
+def _execute(call: ToolCall, session_id: Optional[str]) -> list[dict]:
+    base = {"kind": call.kind, "namespace": call.namespace, "name": call.name}
+    cache = session_cache(session_id)
+
+    if call.clusters:
+        return [
+            dict(
+                base,
+                cluster=r["cluster"],
+                output=r["output"] if "output" in r else {"error": r["error"]},
+            )
+            for r in read_across_clusters(
+                kind=call.kind,
+                clusters=call.clusters,
+                namespace=call.namespace,
+                name=call.name,
+                options=call.read_options,
+                cache=cache,
+            )
+        ]
+
+    output = read_object(
+        kind=call.kind,
+        namespace=call.namespace,
+        name=call.name,
+        cluster=call.cluster,
+        options=call.read_options,
+        cache=cache,
+    )
+    return [dict(base, cluster=call.cluster, output=output)]
+
+def build_conversation(session_id: str, *blocks: str) -> list[dict]:
+    """
+    Session history as Messages API turns.
+
+    Per-call context (known scope, internal refs, pre-analysis) is attached
+    as separate content blocks on the final user turn. Stored turns are never
+    mutated, so the history prefix stays byte-identical across calls.
+    """
+    turns = get_messages(session_id)
+    extra = [text_block(b) for b in blocks if b]
+    if not extra:
+        return list(turns)
+
+    if turns and turns[-1]["role"] == "user":
+        last = turns[-1]
+        return turns[:-1] + [{"role": "user", "content": last["content"] + extra}]
+
+    return turns + [{"role": "user", "content": extra}]
+
+def in_history(session_id: str, text: str) -> bool:
+    return any(text in b["text"] for turn in get_messages(session_id) for b in turn["content"])
+
+def evidence_tag(round_id: str) -> str:
+    return f'<tool_evidence id="{round_id}">'
+
+# Sent when a tools-enabled reply has no text left to show (every proposed
+# read was already collected or filtered out).
+NO_TOOLS_PROMPT = (
+    "All data you can request has already been collected. "
+    "Answer now from the evidence above, in the required format."
+)
+
+NO_ANSWER_TEXT = (
+    "I could not produce an answer from the collected evidence.\n\n"
+    "Please rephrase the question or narrow it to one workload.\n\n"
+    "Failure class: Unknown\n"
+    "Evidence status: INSUFFICIENT"
+)
+
+def answer_text(decoded: dict, messages: list[dict]) -> str:
+    """
+    The reply's text; when it has none, one final call without tools, and
+    an explicit message if that is empty too. Never returns blank text.
+    """
+    text = extract_text(decoded, required=False)
+    if text.strip():
+        return text
+
+    nudge = text_block(NO_TOOLS_PROMPT)
+    if messages and messages[-1]["role"] == "user":
+        retry = messages[:-1] + [{"role": "user", "content": messages[-1]["content"] + [nudge]}]
+    else:
+        retry = messages + [{"role": "user", "content": [nudge]}]
+    with metrics.span("no_tools_model"):
+        text = extract_text(invoke_claude(SYSTEM_PROMPT, retry, route="final"), required=False)
+    return text if text.strip() else NO_ANSWER_TEXT
 
 def wrap_input(text: str) -> str:
     tl = text.lower()
@@ -63,33 +296,26 @@ def extract_failure_class(text: str) -> Optional[str]:
             return line.split(":", 1)[1].strip()
     return None
 
-def parse_tool_request(text: str) -> Tuple[Optional[ToolRequest], Optional[str]]:
-    text = text.strip()
-
-    try:
-        obj = json.loads(text)
-        if obj.get("type") == "tool_request":
-            return ToolRequest.model_validate(obj), text
-    except Exception:
-        pass
+def parse_tool_request(decoded: dict) -> Tuple[Optional[ToolRequest], Optional[str]]:
+    """
+    Build a ToolRequest from the model's structured tool_use blocks.
 
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end > start:
+    Multiple tool_use blocks are merged into one request. Blocks that fail
+    ToolCall validation are ignored rather than failing the turn.
+    """
+    calls = []
+    for tool_input in extract_tool_uses(decoded, TOOL_NAME):
         try:
-            raw = text[start:end + 1]
-            obj = json.loads(raw)
-            if obj.get("type") == "tool_request":
-                return ToolRequest.model_validate(obj), raw
+            req = ToolRequest.model_validate({"tools": tool_input.get("tools", [])})
         except Exception:
-            pass
+            continue
+        calls.extend(req.tools)
 
-    return None, None
+    if not calls:
+        return None, None
 
-def strip_json(text: str, raw_json: Optional[str]) -> str:
-    if not raw_json:
-        return text
-    return text.replace(raw_json, "").strip()
+    tool_req = ToolRequest(tools=calls)
+    return tool_req, json.dumps(tool_req.model_dump(exclude={"type"}))
 
 def extract_scope_from_text(text: str, scope: dict):
     words = text.lower().split()
@@ -102,8 +328,66 @@ def extract_scope_from_text(text: str, scope: dict):
 # Main endpoint
 # =========================================================
 
+@app.get("/healthz")
+def healthz():
+    return {"status": "ok", "prewarm": _PREWARM.status()}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 @app.post("/ask")
 def ask(payload: dict):
+    trace = metrics.start_trace()
+    phase = "tools" if payload.get("tool_choice") else "question"
+
+    with metrics.span("ask", session_id=payload.get("session_id"), phase=phase):
+        with _SESSION_LOCKS.hold(payload.get("session_id")):
+            try:
+                resp = handle_ask(payload)
+            except ModelUnavailable as e:
+                resp = {"mode": "error", "text": f"The model is unavailable right now, please retry ({e})"}
+
+    metrics.REQUESTS.inc(mode=resp.get("mode"))
+    if payload.get("debug"):
+        resp.setdefault("debug", {})["timings"] = trace
+    return resp
+
+@app.post("/alerts")
+def alerts(payload: dict):
+    """
+    Alertmanager webhook: one triage job per firing (namespace, alertname).
+    """
+    accepted = []
+    rejected = 0
+    for alert in payload.get("alerts") or []:
+        if alert.get("status", "firing") != "firing":
+            metrics.TRIAGE_ALERTS.inc(outcome="resolved")
+            continue
+        job = _TRIAGE.submit(alert)
+        if job is None:
+            rejected += 1
+            continue
+        accepted.append(dict(job, fingerprint=alert.get("fingerprint")))
+
+    body = {"accepted": accepted, "rejected": rejected, "queue_depth": _TRIAGE.depth()}
+    if rejected:
+        # Alertmanager retries failed deliveries with the whole group; the
+        # alerts accepted now join their existing jobs on the retry.
+        return JSONResponse(body, status_code=429, headers={"Retry-After": "30"})
+    return body
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = _TRIAGE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+def handle_ask(payload: dict):
     session_id = payload.get("session_id")
     question = payload.get("question")
     tool_choice = payload.get("tool_choice")
@@ -127,6 +411,7 @@ def ask(payload: dict):
         internal_block = pending.get("internal_block", "")
 
         if tool_choice == "manual":
+            prefetch.discard(session_id)
             text = (
                 "Run the following commands and paste the output:\n\n"
                 + "\n".join(tool_req.kubectl_commands)
@@ -135,6 +420,7 @@ def ask(payload: dict):
             return {"mode": "answer", "text": text}
 
         results = []
+        reads = []  # (signature, entry count) per call, in results order
         debug_exec = []
 
         for call in tool_req.tools:
@@ -143,18 +429,31 @@ def ask(payload: dict):
             sig = tool_signature(call)
             _TOOL_HISTORY[session_id].add(sig)
 
-            output = read_object(
+            with metrics.span(
+                "read_object",
+                session_id=session_id,
                 kind=call.kind,
                 namespace=call.namespace,
-                name=call.name,
-            )
-
-            results.append({
-                "kind": call.kind,
-                "namespace": call.namespace,
-                "name": call.name,
-                "output": output,
-            })
+                clusters=len(call.targets),
+            ) as sp:
+                # A prefetch that failed (e.g. throttled at background
+                # priority) is read again now.
+                prefetched = prefetch.result(prefetch.take(session_id, sig))
+                sp["prefetched"] = prefetched is not None
+                try:
+                    entries = prefetched if prefetched is not None else execute_call(call, session_id)
+                except Exception as e:
+                    # Like a failed cluster in a fan-out: the error becomes
+                    # evidence and the other reads still run.
+                    entries = failed_call(call, e)
+                    sp["error"] = type(e).__name__
+                sp["items"] = sum(
+                    len(e["output"]) if isinstance(e["output"], list) else 1
+                    for e in entries
+                )
+
+            results.extend(entries)
+            reads.append((sig, len(entries)))
 
             if debug:
                 debug_exec.append({
@@ -162,25 +461,69 @@ def ask(payload: dict):
                         "kind": call.kind,
                         "namespace": call.namespace,
                         "name": call.name,
+                        "clusters": call.targets,
                     }
                 })
 
-        tool_block = render_tool_evidence(results)
-
-        prompt = build_history_prompt(session_id)
-        if internal_block:
-            prompt += "\n" + internal_block + "\n"
+        prefetch.discard(session_id)
+        with metrics.span("correlate_events"):
+            results = correlate_evidence(results)
+
+        # Deterministic pre-analysis runs on the full outputs, before deltas.
+        with metrics.span("rules") as sp:
+            analysis = rules.evaluate(results)
+            sp["failure_class"] = analysis["failure_class"] if analysis else None
+
+        # Repeated reads are sent as changes since their previous round,
+        # as long as the evidence they build on is still in the history.
+        round_id = uuid.uuid4().hex[:8]
+        with metrics.span("evidence_delta") as sp:
+            deltas, start = [], 0
+            for sig, count in reads:
+                deltas.extend(snapshots.apply_deltas(
+                    session_id,
+                    sig,
+                    results[start:start + count],
+                    round_id=round_id,
+                    in_context=lambda r: in_history(session_id, evidence_tag(r)),
+                ))
+                start += count
+            results = deltas
+            sp["items"] = sum(1 for r in results if "delta_since_seconds" in r)
+
+        with metrics.span("render", items=len(results)) as sp:
+            tool_block = render_tool_evidence(results)
+            sp["bytes"] = len(tool_block)
+
+        # Evidence is kept in the history: later deltas refer back to it.
+        add_message(session_id, "user", evidence_tag(round_id) + "\n" + tool_block + "\n</tool_evidence>")
+
+        direct = rules.direct_answer(analysis)
+        if direct:
+            add_message(session_id, "assistant", direct)
+            resp = {"mode": "answer", "text": direct}
+            if debug:
+                resp["debug"] = {
+                    "executed_tools": debug_exec,
+                    "tool_history": sorted(_TOOL_HISTORY[session_id]),
+                    "pre_analysis": analysis,
+                }
+            return resp
 
-        prompt += "\n<tool_evidence>\n" + tool_block + "\n</tool_evidence>\n"
+        messages = build_conversation(
+            session_id,
+            internal_block,
+            rules.render_pre_analysis(analysis),
+        )
 
-        answer = ask_claude(SYSTEM_PROMPT, prompt)
+        with metrics.span("evidence_model", session_id=session_id):
+            decoded = invoke_claude(SYSTEM_PROMPT, messages, tools=_TOOLS, route="final")
 
-        next_tool, raw_json = parse_tool_request(answer)
+        next_tool, raw_json = parse_tool_request(decoded)
         if next_tool:
             filtered = []
             for t in next_tool.tools:
-                sig = tool_signature(t)
-                if sig in _TOOL_HISTORY[session_id]:
+                if already_read(session_id, t):
                     continue
                 if requires_scope(t):
                     continue
@@ -192,6 +535,7 @@ def ask(payload: dict):
                     "tool_request": next_tool,
                     "internal_block": internal_block,
                 }
+                start_prefetch(session_id, next_tool)
                 resp = {
                     "mode": "permission",
                     "kubectl_commands": next_tool.kubectl_commands,
@@ -204,48 +548,69 @@ def ask(payload: dict):
                     }
                 return resp
 
-        cleaned = strip_json(answer, raw_json)
-        add_message(session_id, "assistant", cleaned)
+        answer = answer_text(decoded, messages)
+        add_message(session_id, "assistant", answer)
 
-        resp = {"mode": "answer", "text": cleaned}
+        resp = {"mode": "answer", "text": answer}
         if debug:
             resp["debug"] = {
                 "executed_tools": debug_exec,
                 "tool_history": sorted(_TOOL_HISTORY[session_id]),
                 "tool_evidence": results,
+                "pre_analysis": analysis,
             }
         return resp
 
     # =====================================================
     # Phase 2 — normal question
     # =====================================================
-    if not question:
+    if not question or not question.strip():
         return {"mode": "error", "text": "Missing question"}
 
-    extract_scope_from_text(question, scope)
-    wrapped = wrap_input(question)
+    prefetch.discard(session_id)
+
+    # kubectl output pasted back after a manual round is reduced to
+    # metadata + status and rendered like tool evidence. Once a document is
+    # recognized the raw paste is never used, even if nothing survived.
+    with metrics.span("parse_paste", bytes=len(question)) as sp:
+        pasted, prose, recognized = parse_pasted(question)
+        sp["items"] = len(pasted)
+
+    if recognized:
+        extract_scope_from_text(prose, scope)
+        namespaces = {e["namespace"] for e in pasted if e.get("namespace")}
+        if len(namespaces) == 1 and not scope.get("namespace"):
+            scope["namespace"] = namespaces.pop()
+        evidence = render_tool_evidence(pasted, tabular_kinds=frozenset({"*"})) if pasted else ""
+        wrapped = "\n\n".join(filter(None, [
+            wrap_input(prose) if prose else "",
+            "<pasted_evidence>\n" + evidence + "\n</pasted_evidence>" if evidence else "",
+        ]))
+    else:
+        extract_scope_from_text(question, scope)
+        wrapped = wrap_input(question)
     add_message(session_id, "user", wrapped)
 
-    base_prompt = build_history_prompt(session_id)
-
+    scope_block = ""
     if scope.get("namespace"):
-        base_prompt += f"\n<known_scope>\nnamespace: {scope['namespace']}\n</known_scope>\n"
+        scope_block = f"<known_scope>\nnamespace: {scope['namespace']}\n</known_scope>"
 
-    draft = ask_claude(SYSTEM_PROMPT, base_prompt)
+    with metrics.span("draft_model", session_id=session_id):
+        draft = ask_claude(SYSTEM_PROMPT, build_conversation(session_id, scope_block), route="draft")
     failure_class = extract_failure_class(draft) or "Unknown"
 
     internal_block = ""
     if failure_class != "Unknown":
-        docs = retrieve_top_k(_INTERNAL_INDEX, failure_class, k=3, min_score=0.5)
-        internal_block = format_internal_refs(docs)
-
-    prompt = base_prompt
-    if internal_block:
-        prompt += "\n" + internal_block + "\n"
+        with metrics.span("rag_retrieval", failure_class=failure_class) as sp:
+            docs = retrieve_top_k(internal_index(), failure_class, k=3, min_score=0.5)
+            internal_block = format_internal_refs(docs)
+            sp["items"] = len(docs)
 
-    answer = ask_claude(SYSTEM_PROMPT, prompt)
+    messages = build_conversation(session_id, scope_block, internal_block)
+    with metrics.span("answer_model", session_id=session_id):
+        decoded = invoke_claude(SYSTEM_PROMPT, messages, tools=_TOOLS, route="tools")
 
-    tool_req, raw_json = parse_tool_request(answer)
+    tool_req, raw_json = parse_tool_request(decoded)
     if tool_req:
         blocked = [t.kind for t in tool_req.tools if requires_scope(t)]
         if blocked:
@@ -265,6 +630,7 @@ def ask(payload: dict):
             "tool_request": tool_req,
             "internal_block": internal_block,
         }
+        start_prefetch(session_id, tool_req)
         resp = {
             "mode": "permission",
             "kubectl_commands": tool_req.kubectl_commands,
@@ -275,6 +641,6 @@ def ask(payload: dict):
             }
         return resp
 
-    cleaned = strip_json(answer, raw_json)
-    add_message(session_id, "assistant", cleaned)
-    return {"mode": "answer", "text": cleaned}
+    answer = answer_text(decoded, messages)
+    add_message(session_id, "assistant", answer)
+    return {"mode": "answer", "text": answer}
@@ -0,0 +1,69 @@
+# eks_agent/singleflight.py
+#
+# In-process request coalescing and per-key locking.
+#
+# SingleFlight lets concurrent callers with the same key share one
+# in-flight call: the first caller runs it, the rest wait for its result
+# (or its exception). Nothing is cached once the call returns.
+#
+# KeyedLocks hands out one lock per key (e.g. per session) and forgets it
+# when nobody holds or waits on it.
+
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator, TypeVar
+
+from eks_agent import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+
+        if not leader:
+            metrics.COALESCED.inc(group=self.name)
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class KeyedLocks:
+    def __init__(self):
+        self._locks: dict[Hashable, list] = {}   # key -> [lock, holders+waiters]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
@@ -0,0 +1,267 @@
+# eks_agent/tools/digest.py
+#
+# Namespace health digest: one approval, one batched read, one summary.
+#
+# Gathers pods, events, workloads and HPAs for a namespace concurrently and
+# reduces them to the handful of signals an investigation starts from, so
+# the model doesn't need three or four permission rounds to get there.
+
+import contextvars
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from eks_agent.tools.gate import describe_error
+
+DIGEST_KIND = "NamespaceDigest"
+
+# The reads behind a digest, in the order they appear in the result.
+DIGEST_SOURCES = (
+    "Pod",
+    "Event",
+    "Deployment",
+    "StatefulSet",
+    "DaemonSet",
+    "HorizontalPodAutoscaler",
+)
+
+# What the user would run by hand to see the same data.
+DIGEST_COMMANDS = (
+    "kubectl get pods,deployments,statefulsets,daemonsets,hpa",
+    "kubectl get events",
+)
+
+TOP_N = 5
+MAX_MESSAGE_CHARS = 200
+
+
+def _container_statuses(pod: dict) -> list[dict]:
+    status = pod.get("status") or {}
+    return (status.get("containerStatuses") or []) + (status.get("initContainerStatuses") or [])
+
+
+# Pod conditions in the order they are reached; the first False one says
+# where a pod that is not Ready got stuck.
+_CONDITION_ORDER = ("PodScheduled", "Initialized", "ContainersReady", "Ready")
+
+
+def _not_ready_reason(status: dict) -> tuple[Optional[str], Optional[str]]:
+    """
+    (reason, message) for a pod that is not Ready: the pod's own reason
+    (Evicted, ...) or its first False condition (Unschedulable, ...).
+    """
+    if status.get("reason"):
+        return status["reason"], status.get("message")
+    conditions = {c.get("type"): c for c in status.get("conditions") or []}
+    for ctype in _CONDITION_ORDER:
+        cond = conditions.get(ctype)
+        if cond and cond.get("status") == "False":
+            return cond.get("reason") or f"{ctype}=False", cond.get("message")
+    return None, None
+
+
+def _is_ready(status: dict, statuses: list[dict]) -> bool:
+    phase = status.get("phase")
+    if phase == "Succeeded":
+        return True  # completed (Job) pods have nothing left to serve
+    for cond in status.get("conditions") or []:
+        if cond.get("type") == "Ready":
+            return cond.get("status") == "True"
+    # No Ready condition reported (yet): only a running pod with every
+    # container ready counts.
+    return phase == "Running" and bool(statuses) and all(cs.get("ready") for cs in statuses)
+
+
+def _pod_signals(pod: dict) -> dict:
+    status = pod.get("status") or {}
+    statuses = _container_statuses(pod)
+    restarts = 0
+    waiting, terminated = None, None
+
+    for cs in statuses:
+        restarts += cs.get("restartCount") or 0
+        w = (cs.get("state") or {}).get("waiting")
+        if w and w.get("reason") and not waiting:
+            waiting = w["reason"]
+        t = (cs.get("lastState") or {}).get("terminated")
+        if t and t.get("reason") and not terminated:
+            terminated = t["reason"]
+
+    ready = _is_ready(status, statuses)
+    reason, message = (None, None) if ready else _not_ready_reason(status)
+    if message and len(message) > MAX_MESSAGE_CHARS:
+        message = message[:MAX_MESSAGE_CHARS] + "..."
+
+    return {
+        "name": (pod.get("metadata") or {}).get("name"),
+        "phase": status.get("phase") or "Unknown",
+        "ready": ready,
+        "restarts": restarts,
+        "waiting_reason": waiting,
+        "last_terminated_reason": terminated,
+        "not_ready_reason": reason,
+        "message": message,
+    }
+
+
+def _pods_digest(pods: list[dict]) -> dict:
+    signals = [_pod_signals(p) for p in pods]
+    restarting = sorted(
+        (s for s in signals if s["restarts"] > 0 or s["waiting_reason"]),
+        key=lambda s: s["restarts"],
+        reverse=True,
+    )
+    # Not ready without restarting (Pending, unschedulable, evicted) would
+    # never show up in top_restarting.
+    stuck = [s for s in signals if not s["ready"] and not s["restarts"] and not s["waiting_reason"]]
+    return {
+        "total": len(signals),
+        "phases": dict(Counter(s["phase"] for s in signals)),
+        "not_ready": sum(1 for s in signals if not s["ready"]),
+        "not_ready_reasons": dict(Counter(s["not_ready_reason"] for s in signals if s["not_ready_reason"])),
+        "waiting_reasons": dict(Counter(s["waiting_reason"] for s in signals if s["waiting_reason"])),
+        "last_terminated_reasons": dict(
+            Counter(s["last_terminated_reason"] for s in signals if s["last_terminated_reason"])
+        ),
+        "top_restarting": [
+            {k: v for k, v in s.items() if k not in ("phase", "ready", "message") and v is not None}
+            for s in restarting[:TOP_N]
+        ],
+        "top_not_ready": [
+            {k: s[k] for k in ("name", "phase", "not_ready_reason", "message") if s[k] is not None}
+            for s in stuck[:TOP_N]
+        ],
+    }
+
+
+def _events_digest(events: list[dict]) -> dict:
+    reasons: Counter = Counter()
+    objects: Counter = Counter()
+    warnings = 0
+
+    for e in events:
+        st = e.get("status") or {}
+        if st.get("type") != "Warning":
+            continue
+        warnings += 1
+        count = st.get("count") or 1
+        reasons[st.get("reason") or "Unknown"] += count
+        involved = st.get("involvedObject") or {}
+        if involved.get("name"):
+            objects[f"{involved.get('kind')}/{involved['name']}"] += count
+
+    return {
+        "total": len(events),
+        "warnings": warnings,
+        "top_warning_reasons": [
+            {"reason": r, "count": c} for r, c in reasons.most_common(TOP_N)
+        ],
+        "top_warning_objects": [
+            {"object": o, "count": c} for o, c in objects.most_common(TOP_N)
+        ],
+    }
+
+
+def _unavailable(kind: str, status: dict) -> int:
+    if kind == "DaemonSet":
+        desired = status.get("desiredNumberScheduled") or 0
+        return status.get("numberUnavailable") or max(0, desired - (status.get("numberAvailable") or 0))
+    desired = status.get("replicas") or 0
+    if kind == "StatefulSet":
+        return max(0, desired - (status.get("readyReplicas") or 0))
+    return status.get("unavailableReplicas") or max(0, desired - (status.get("availableReplicas") or 0))
+
+
+def _workloads_digest(workloads: dict[str, list[dict]]) -> dict:
+    degraded = []
+    totals = {}
+
+    for kind, items in workloads.items():
+        totals[kind] = len(items)
+        for w in items:
+            missing = _unavailable(kind, w.get("status") or {})
+            if missing:
+                degraded.append({
+                    "kind": kind,
+                    "name": (w.get("metadata") or {}).get("name"),
+                    "unavailable": missing,
+                })
+
+    degraded.sort(key=lambda d: d["unavailable"], reverse=True)
+    return {"totals": totals, "unavailable": degraded}
+
+
+def _hpas_digest(hpas: list[dict]) -> dict:
+    scaling = []
+    for h in hpas:
+        st = h.get("status") or {}
+        current, desired = st.get("currentReplicas"), st.get("desiredReplicas")
+        if current is not None and desired is not None and current != desired:
+            scaling.append({
+                "name": (h.get("metadata") or {}).get("name"),
+                "current": current,
+                "desired": desired,
+            })
+    return {"total": len(hpas), "scaling": scaling}
+
+
+def build_digest(namespace: str, reads: dict[str, object]) -> dict:
+    """
+    Reduce sanitized read_object outputs (keyed by kind) to a digest.
+
+    Failed reads appear as exceptions in `reads` and are reported under
+    "errors" without hiding the sections that did succeed.
+    """
+    errors = {
+        kind: describe_error(out)
+        for kind, out in reads.items()
+        if isinstance(out, Exception)
+    }
+
+    def items(kind: str) -> list[dict]:
+        out = reads.get(kind)
+        return out if isinstance(out, list) else []
+
+    digest = {
+        "kind": DIGEST_KIND,
+        "namespace": namespace,
+        "pods": _pods_digest(items("Pod")),
+        "events": _events_digest(items("Event")),
+        "workloads": _workloads_digest({
+            k: items(k) for k in ("Deployment", "StatefulSet", "DaemonSet")
+        }),
+        "hpas": _hpas_digest(items("HorizontalPodAutoscaler")),
+    }
+    if errors:
+        digest["errors"] = errors
+    return digest
+
+
+def read_namespace_digest(
+    reader: Callable[..., object],
+    namespace: Optional[str],
+    cluster: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Concurrently read every DIGEST_SOURCES kind in `namespace` via `reader`
+    (read_object) and return the digest.
+    """
+    if not namespace:
+        raise ValueError(f"{DIGEST_KIND} requires a namespace")
+
+    def one(kind: str):
+        try:
+            return reader(kind, namespace, None, cluster=cluster, timeout=timeout)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(
+        max_workers=len(DIGEST_SOURCES),
+        thread_name_prefix="eks-agent-digest",
+    ) as pool:
+        # Each read carries the caller's context (e.g. its rate-limit priority).
+        futures = [pool.submit(contextvars.copy_context().run, one, k) for k in DIGEST_SOURCES]
+        reads = dict(zip(DIGEST_SOURCES, (f.result() for f in futures)))
+
+    return build_digest(namespace, reads)
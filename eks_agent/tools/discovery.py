@@ -0,0 +1,174 @@
+# eks_agent/tools/discovery.py
+#
+# Kind -> (group, version, plural, namespaced) resolution via API discovery.
+#
+# The discovery documents are fetched once and cached with a TTL. Any name
+# kubectl accepts resolves: Kind, plural, singular, short names, and the
+# "<plural>.<group>" / "<kind>.<group>" forms. A miss (or a 404 from a stale
+# mapping) triggers at most one refresh per MIN_REFRESH_SECONDS.
+
+import json
+import threading
+import time
+from typing import NamedTuple, Optional
+
+TTL_SECONDS = 300.0
+MIN_REFRESH_SECONDS = 30.0
+
+
+class ResourceInfo(NamedTuple):
+    kind: str
+    group: str
+    version: str
+    plural: str
+    namespaced: bool
+
+    @property
+    def api_prefix(self) -> str:
+        if not self.group:
+            return f"/api/{self.version}"
+        return f"/apis/{self.group}/{self.version}"
+
+
+def read_json(resp) -> dict:
+    """
+    Decode a raw (`_preload_content=False`) response and release its connection.
+    """
+    try:
+        return json.loads(resp.data)
+    finally:
+        release = getattr(resp, "release_conn", None)
+        if release:
+            release()
+
+
+def get_json(api_client, path: str, timeout: Optional[float] = None) -> dict:
+    """
+    GET an arbitrary API path as plain JSON, bypassing SDK models.
+    """
+    return read_json(api_client.call_api(
+        path,
+        "GET",
+        header_params={"Accept": "application/json"},
+        auth_settings=["BearerToken"],
+        _return_http_data_only=True,
+        _preload_content=False,
+        _request_timeout=timeout,
+    ))
+
+
+def _keys(res: dict, group: str) -> list[str]:
+    kind = res["kind"].lower()
+    plural = res["name"].lower()
+    keys = [kind, plural]
+    if res.get("singularName"):
+        keys.append(res["singularName"].lower())
+    keys.extend(s.lower() for s in res.get("shortNames") or [])
+    if group:
+        keys.extend([f"{plural}.{group}", f"{kind}.{group}"])
+    return keys
+
+
+def fetch_resources(api_client) -> dict[str, ResourceInfo]:
+    """
+    Walk /api/v1 and every group's preferred version under /apis.
+
+    Earlier entries win on name clashes, so the core group is authoritative
+    for ambiguous names such as "event".
+    """
+    index: dict[str, ResourceInfo] = {}
+
+    def add(doc: dict, group: str, version: str):
+        for res in doc.get("resources", []):
+            if "/" in res["name"]:
+                continue  # subresources (pods/log, deployments/scale, ...)
+            verbs = set(res.get("verbs") or [])
+            if not verbs & {"get", "list"}:
+                continue
+            info = ResourceInfo(
+                kind=res["kind"],
+                group=group,
+                version=version,
+                plural=res["name"],
+                namespaced=bool(res.get("namespaced")),
+            )
+            for key in _keys(res, group):
+                index.setdefault(key, info)
+
+    add(get_json(api_client, "/api/v1"), "", "v1")
+
+    for grp in get_json(api_client, "/apis").get("groups", []):
+        preferred = (grp.get("preferredVersion") or {}).get("version")
+        if not preferred:
+            versions = grp.get("versions") or []
+            if not versions:
+                continue
+            preferred = versions[0]["version"]
+        try:
+            doc = get_json(api_client, f"/apis/{grp['name']}/{preferred}")
+        except Exception:
+            # Aggregated APIs (e.g. metrics.k8s.io) can be unavailable;
+            # one broken group must not hide the rest.
+            continue
+        add(doc, grp["name"], preferred)
+
+    return index
+
+
+class DiscoveryCache:
+    def __init__(self, ttl: float = TTL_SECONDS, min_refresh: float = MIN_REFRESH_SECONDS):
+        self.ttl = ttl
+        self.min_refresh = min_refresh
+        self._index: dict[str, ResourceInfo] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        return not self._index or time.monotonic() - self._fetched_at > self.ttl
+
+    def refresh(self, api_client, force: bool = False) -> bool:
+        """
+        Re-fetch discovery. Without `force`, refreshes are rate limited.
+        Returns True if a fetch happened.
+        """
+        with self._lock:
+            if not force and self._index and time.monotonic() - self._fetched_at < self.min_refresh:
+                return False
+            self._index = fetch_resources(api_client)
+            self._fetched_at = time.monotonic()
+            return True
+
+    def lookup(self, kind: str) -> Optional[ResourceInfo]:
+        return self._index.get(kind.lower())
+
+    def resolve(self, kind: str, api_client) -> ResourceInfo:
+        if self._stale():
+            self.refresh(api_client, force=True)
+
+        info = self.lookup(kind)
+        if info is None and self.refresh(api_client):
+            info = self.lookup(kind)
+
+        if info is None:
+            raise ValueError(f"Unsupported kind '{kind}': not served by this cluster")
+        return info
+
+    def invalidate(self):
+        with self._lock:
+            self._index = {}
+            self._fetched_at = 0.0
+
+
+_CACHES: dict[Optional[str], DiscoveryCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_discovery(cluster: Optional[str] = None) -> DiscoveryCache:
+    """
+    Discovery cache for one cluster (None = default cluster).
+    """
+    with _CACHES_LOCK:
+        cache = _CACHES.get(cluster)
+        if cache is None:
+            cache = _CACHES[cluster] = DiscoveryCache()
+        return cache
@@ -0,0 +1,178 @@
+# eks_agent/tools/events.py
+#
+# Event correlation: turn a namespace's raw event list into a short,
+# ranked list of incidents.
+#
+# Events are grouped by (involvedObject, reason, type) with their series
+# counts merged, groups that went quiet before the recent window are
+# dropped, and what's left is ranked Warning-first, then by whether the
+# involved object is already in the evidence, then by count and recency.
+#
+# The window is anchored to the newest event in the list rather than the
+# local clock, so clock skew or a namespace that went quiet an hour ago
+# still surfaces its last incident.
+
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Optional
+
+EVENT_WINDOW_SECONDS = float(os.environ.get("EKS_AGENT_EVENT_WINDOW", "3600"))
+MAX_GROUPS = 20
+MAX_MESSAGE_CHARS = 300
+
+_EVENT_KINDS = {"event", "events", "ev"}
+
+
+@lru_cache(maxsize=8192)
+def _parse_ts(value) -> Optional[datetime]:
+    # Event timestamps have second resolution and repeat heavily; cache them.
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _last_seen(st: dict) -> Optional[str]:
+    series = st.get("series") or {}
+    return (
+        series.get("lastObservedTime")
+        or st.get("lastTimestamp")
+        or st.get("eventTime")
+        or st.get("firstTimestamp")
+    )
+
+
+def _occurrences(st: dict) -> int:
+    series = st.get("series") or {}
+    return series.get("count") or st.get("count") or 1
+
+
+def _object_key(involved: dict) -> str:
+    return f"{involved.get('kind')}/{involved.get('name')}"
+
+
+def correlate_events(
+    events: Iterable[dict],
+    window_seconds: float = EVENT_WINDOW_SECONDS,
+    linked: frozenset = frozenset(),
+    max_groups: int = MAX_GROUPS,
+) -> dict:
+    """
+    Group sanitized Event summaries (read_object output) into incidents.
+
+    `linked` holds "Kind/name" keys of objects already in the evidence;
+    matching groups are flagged `in_evidence` and ranked ahead of others.
+    """
+    groups: dict[tuple, dict] = {}
+    total = 0
+    newest: Optional[datetime] = None
+
+    for e in events:
+        total += 1
+        st = e.get("status") or {}
+        obj = _object_key(st.get("involvedObject") or {})
+        key = (obj, st.get("reason"), st.get("type"))
+
+        seen_raw = _last_seen(st)
+        seen = _parse_ts(seen_raw)
+        first_raw = st.get("firstTimestamp") or seen_raw
+        first = _parse_ts(first_raw)
+        if seen is not None and (newest is None or seen > newest):
+            newest = seen
+
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {
+                "type": st.get("type"),
+                "reason": st.get("reason"),
+                "object": obj,
+                "count": 0,
+                "events": 0,
+                "first": first_raw,
+                "last": seen_raw,
+                "message": st.get("message"),
+                "_first": first,
+                "_last": seen,
+            }
+
+        g["count"] += _occurrences(st)
+        g["events"] += 1
+
+        if first is not None and (g["_first"] is None or first < g["_first"]):
+            g["_first"], g["first"] = first, first_raw
+        if seen is not None and (g["_last"] is None or seen >= g["_last"]):
+            g["_last"], g["last"] = seen, seen_raw
+            g["message"] = st.get("message")
+
+    # Groups with no parseable timestamp are kept: their age is unknown.
+    stale = 0
+    recent = []
+    for g in groups.values():
+        if newest is not None and g["_last"] is not None \
+                and (newest - g["_last"]).total_seconds() > window_seconds:
+            stale += g["events"]
+            continue
+        g["in_evidence"] = g["object"] in linked
+        recent.append(g)
+
+    recent.sort(key=lambda g: (
+        g["type"] != "Warning",
+        not g["in_evidence"],
+        -g["count"],
+        -(g["_last"].timestamp() if g["_last"] else 0.0),
+    ))
+
+    ranked = []
+    for g in recent[:max_groups]:
+        msg = g["message"] or ""
+        if len(msg) > MAX_MESSAGE_CHARS:
+            msg = msg[:MAX_MESSAGE_CHARS] + "..."
+        ranked.append({
+            **{k: v for k, v in g.items() if not k.startswith("_")},
+            "message": msg,
+        })
+
+    return {
+        "kind": "EventSummary",
+        "window_seconds": window_seconds,
+        "total_events": total,
+        "stale_events_dropped": stale,
+        "groups": ranked,
+        "groups_omitted": max(0, len(recent) - max_groups),
+    }
+
+
+def _evidence_keys(output) -> Iterable[str]:
+    items = output if isinstance(output, list) else [output]
+    for o in items:
+        if isinstance(o, dict) and o.get("kind"):
+            name = (o.get("metadata") or {}).get("name")
+            if name:
+                yield f"{o['kind']}/{name}"
+
+
+def correlate_evidence(results: list[dict], window_seconds: float = EVENT_WINDOW_SECONDS) -> list[dict]:
+    """
+    Replace raw Event lists in evidence entries with correlated summaries,
+    linking each to the other objects read from the same cluster.
+
+    Entries are copied, never mutated.
+    """
+    linked: dict[Optional[str], set[str]] = {}
+    for r in results:
+        if (r.get("kind") or "").lower() not in _EVENT_KINDS:
+            linked.setdefault(r.get("cluster"), set()).update(_evidence_keys(r.get("output")))
+
+    out = []
+    for r in results:
+        if (r.get("kind") or "").lower() in _EVENT_KINDS and isinstance(r.get("output"), list):
+            r = dict(r, output=correlate_events(
+                r["output"],
+                window_seconds=window_seconds,
+                linked=frozenset(linked.get(r.get("cluster"), ())),
+            ))
+        out.append(r)
+    return out
@@ -20,4 +20,17 @@ FORBIDDEN_KINDS = {
 def validate_kind(kind: str):
     k = kind.lower()
     if k in FORBIDDEN_KINDS:
-        raise ValueError(f"Access to Kubernetes kind '{kind}' is forbidden")
\ No newline at end of file
+        raise ValueError(f"Access to Kubernetes kind '{kind}' is forbidden")
+
+
+def describe_error(exc: BaseException) -> str:
+    """
+    Model-safe description of a failed read.
+
+    Kubernetes ApiException's str() embeds response headers and body; keep
+    only the status line so nothing unexpected reaches the model.
+    """
+    status = getattr(exc, "status", None)
+    if status is not None:
+        return f"API error {status}: {getattr(exc, 'reason', '')}".strip()
+    return f"{type(exc).__name__}: {exc}"
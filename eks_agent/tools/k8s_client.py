@@ -1,22 +1,78 @@
 # eks_agent/tools/k8s_client.py
 
-from kubernetes import client, config
-from kubernetes.config.config_exception import ConfigException
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
 
+# The kubernetes SDK imports hundreds of generated model modules; it is
+# loaded on the first client build rather than at import time.
+if TYPE_CHECKING:
+    from kubernetes import client
+
+# Clients are rebuilt after this long so short-lived credentials
+# (EKS exec-plugin tokens expire after ~15 minutes) are reloaded.
+CLIENT_TTL_SECONDS = 600.0
+
+# Optional allowlist of kubeconfig contexts the agent may target,
+# e.g. EKS_AGENT_CLUSTERS="prod-blue,prod-green,prod-eu".
+_ALLOWED = {
+    c.strip() for c in os.environ.get("EKS_AGENT_CLUSTERS", "").split(",") if c.strip()
+}
+
+_REGISTRY: dict[Optional[str], tuple[float, dict]] = {}
+_LOCK = threading.Lock()
+
+
+def validate_cluster(cluster: Optional[str]):
+    if cluster is not None and _ALLOWED and cluster not in _ALLOWED:
+        raise ValueError(f"Cluster context '{cluster}' is not in EKS_AGENT_CLUSTERS")
+
+
+def _build(api: "client.ApiClient") -> dict:
+    from kubernetes import client
+
+    # One ApiClient (one connection pool) shared by every API group.
+    return {
+        "api": api,
+        "core": client.CoreV1Api(api),
+        "apps": client.AppsV1Api(api),
+        "autoscaling": client.AutoscalingV1Api(api),
+    }
+
+
+def _load(cluster: Optional[str]) -> "client.ApiClient":
+    from kubernetes import client, config
+    from kubernetes.config.config_exception import ConfigException
+
+    if cluster is not None:
+        # Named kubeconfig context; never touches the global default config.
+        return config.new_client_from_config(context=cluster)
 
-def get_clients():
-    """
-    Returns Kubernetes API clients.
-    Tries in-cluster config first, then local kubeconfig.
-    """
     try:
         config.load_incluster_config()
     except ConfigException:
         config.load_kube_config()
+    return client.ApiClient()
 
-    return {
-        "core": client.CoreV1Api(),
-        "apps": client.AppsV1Api(),
-        "autoscaling": client.AutoscalingV1Api(),
-        "custom": client.CustomObjectsApi(),
-    }
+
+def get_clients(cluster: Optional[str] = None) -> dict:
+    """
+    Returns Kubernetes API clients for one cluster.
+
+    cluster=None targets the default cluster (in-cluster config first, then
+    the current kubeconfig context); otherwise `cluster` names a kubeconfig
+    context. Clients are cached per cluster for CLIENT_TTL_SECONDS.
+    """
+    validate_cluster(cluster)
+
+    with _LOCK:
+        cached = _REGISTRY.get(cluster)
+        if cached and time.monotonic() - cached[0] < CLIENT_TTL_SECONDS:
+            return cached[1]
+
+    clients = _build(_load(cluster))
+
+    with _LOCK:
+        _REGISTRY[cluster] = (time.monotonic(), clients)
+    return clients
@@ -1,55 +1,169 @@
-from typing import Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
+from urllib.parse import quote
+
 from eks_agent.tools.k8s_client import get_clients
-from eks_agent.tools.gate import validate_kind
+from eks_agent.tools.gate import validate_kind, describe_error
+from eks_agent.tools.ratelimit import limited
+from eks_agent.tools.digest import DIGEST_KIND, read_namespace_digest
+from eks_agent.tools.logs import LOG_KIND, read_pod_log
+from eks_agent.tools.owners import OWNER_KIND, ObjectCache, resolve_owner_chains
+from eks_agent.tools.discovery import ResourceInfo, get_discovery, get_json, read_json
+from eks_agent.tools.sanitize import list_items, summarize
 
 
-def _safe_meta(obj) -> dict:
-    return {
-        "name": obj.metadata.name if obj.metadata else None,
-        "namespace": obj.metadata.namespace if obj.metadata else None,
-        "labels": obj.metadata.labels if obj.metadata else None,
-    }
+# Fan-out limits: never more clusters than this per call, and each
+# cluster gets its own deadline so one slow API server can't stall the rest.
+MAX_FANOUT_CLUSTERS = 10
+FANOUT_TIMEOUT_SECONDS = 10.0
 
 
-def _safe_status(obj) -> Any:
+def _fetch_raw(
+    method: Callable,
+    *args,
+    timeout: Optional[float] = None,
+    cluster: Optional[str] = None,
+    verb: str = "get",
+) -> dict:
     """
-    Return JSON-safe status only.
+    Call an SDK read/list method without model deserialization, under the
+    cluster's GET/LIST rate-limit budget.
+
+    `_preload_content=False` hands back the raw HTTP response, so the body is
+    decoded straight into plain dicts and the SDK never builds its generated
+    object graph (the dominant cost on large lists).
     """
-    status = getattr(obj, "status", None)
-    if status is None:
-        return None
+    return limited(
+        cluster,
+        verb,
+        lambda: read_json(method(*args, _preload_content=False, _request_timeout=timeout)),
+    )
+
+
+def _get_json(api_client, path: str, timeout=None, cluster=None, verb: str = "get") -> dict:
+    return limited(cluster, verb, lambda: get_json(api_client, path, timeout))
+
+
+def _get(method: Callable, *args, kind: str, timeout: Optional[float] = None, cluster=None) -> dict:
+    return summarize(_fetch_raw(method, *args, timeout=timeout, cluster=cluster), kind)
+
+
+def _list(method: Callable, *args, kind: str, timeout: Optional[float] = None, cluster=None) -> list[dict]:
+    return list_items(_fetch_raw(method, *args, timeout=timeout, cluster=cluster, verb="list"), kind)
+
+
+# --------------------------------------------------
+# Built-in kinds: typed SDK clients, no discovery needed.
+#   kind -> (client, read method or None, list method, namespaced)
+# A None read method means GET falls back to LIST (events).
+# --------------------------------------------------
+_BUILTIN: dict[str, tuple[str, str | None, str, bool]] = {
+    # Core API
+    "pod": ("core", "read_namespaced_pod", "list_namespaced_pod", True),
+    "service": ("core", "read_namespaced_service", "list_namespaced_service", True),
+    "event": ("core", None, "list_namespaced_event", True),
+    "node": ("core", "read_node", "list_node", False),
+
+    # Apps API
+    "deployment": ("apps", "read_namespaced_deployment", "list_namespaced_deployment", True),
+    "replicaset": ("apps", "read_namespaced_replica_set", "list_namespaced_replica_set", True),
+    "statefulset": ("apps", "read_namespaced_stateful_set", "list_namespaced_stateful_set", True),
+    "daemonset": ("apps", "read_namespaced_daemon_set", "list_namespaced_daemon_set", True),
 
-    # Kubernetes SDK objects
-    if hasattr(status, "to_dict"):
-        return status.to_dict()
+    # Autoscaling
+    "horizontalpodautoscaler": (
+        "autoscaling",
+        "read_namespaced_horizontal_pod_autoscaler",
+        "list_namespaced_horizontal_pod_autoscaler",
+        True,
+    ),
+}
+
+
+def _read_builtin(clients: dict, entry: tuple, kind: str, namespace, name, timeout=None, cluster=None):
+    client_key, read_method, list_method, namespaced = entry
+    api = clients[client_key]
+    scope = (namespace,) if namespaced else ()
+
+    if name and read_method:
+        return _get(getattr(api, read_method), name, *scope, kind=kind, timeout=timeout, cluster=cluster)
+    return _list(getattr(api, list_method), *scope, kind=kind, timeout=timeout, cluster=cluster)
 
-    # Already safe (CRDs, dicts)
-    if isinstance(status, dict):
-        return status
 
-    # Fallback
-    return str(status)
+def _resource_path(info: ResourceInfo, namespace, name=None) -> str:
+    if info.namespaced:
+        if not namespace:
+            raise ValueError(f"Kind '{info.kind}' is namespaced; a namespace is required")
+        path = f"{info.api_prefix}/namespaces/{quote(namespace, safe='')}/{info.plural}"
+    else:
+        path = f"{info.api_prefix}/{info.plural}"
+    return f"{path}/{quote(name, safe='')}" if name else path
 
 
-def _summarize(obj) -> dict:
+def _read_resource(api_client, info: ResourceInfo, namespace, name, timeout=None, cluster=None):
+    path = _resource_path(info, namespace, name)
+    body = _get_json(api_client, path, timeout, cluster, "get" if name else "list")
+    if name:
+        return summarize(body, info.kind)
+    return list_items(body, info.kind)
+
+
+def _fetch_unsanitized(clients: dict, kind: str, namespace, name, cluster=None, timeout=None) -> dict:
+    """
+    Raw GET (name) or LIST body, for resolvers that need fields the
+    sanitizer drops (ownerReferences). Never returned to the model as-is.
     """
-    Generic sanitizer for any Kubernetes object.
+    validate_kind(kind)
+    entry = _BUILTIN.get(kind.lower())
+    if entry and (entry[1] or not name):
+        client_key, read_method, list_method, namespaced = entry
+        scope = (namespace,) if namespaced else ()
+        api = clients[client_key]
+        if name:
+            return _fetch_raw(getattr(api, read_method), name, *scope, timeout=timeout, cluster=cluster)
+        return _fetch_raw(getattr(api, list_method), *scope, timeout=timeout, cluster=cluster, verb="list")
+
+    info = get_discovery(cluster).resolve(kind, clients["api"])
+    validate_kind(info.kind)
+    path = _resource_path(info, namespace, name)
+    return _get_json(clients["api"], path, timeout, cluster, "get" if name else "list")
+
 
-    STRICT RULE:
-    - metadata (safe)
-    - status only (NO spec, NO data)
+def _read_discovered(clients: dict, kind: str, namespace, name, cluster=None, timeout=None):
     """
-    return {
-        "kind": obj.kind,
-        "metadata": _safe_meta(obj),
-        "status": _safe_status(obj),
-    }
+    Any other read-only kind (CRDs included), resolved through cached discovery.
+    """
+    from kubernetes.client.exceptions import ApiException
+
+    api_client = clients["api"]
+    discovery = get_discovery(cluster)
+
+    info = discovery.resolve(kind, api_client)
+    validate_kind(info.kind)
+
+    try:
+        return _read_resource(api_client, info, namespace, name, timeout, cluster)
+    except ApiException as e:
+        # A 404 may mean the mapping is stale (CRD version bumped/removed).
+        # Retry once only if a rate-limited refresh actually changes it.
+        if e.status != 404 or not discovery.refresh(api_client):
+            raise
+        fresh = discovery.resolve(kind, api_client)
+        if fresh == info:
+            raise
+        validate_kind(fresh.kind)
+        return _read_resource(api_client, fresh, namespace, name, timeout, cluster)
 
 
 def read_object(
     kind: str,
     namespace: str | None = None,
     name: str | None = None,
+    cluster: str | None = None,
+    timeout: float | None = None,
+    options: dict | None = None,
+    cache: ObjectCache | None = None,
 ):
     """
     Generic READ primitive.
@@ -57,123 +171,97 @@ def read_object(
     Rules:
     - name provided  -> GET
     - name is None   -> LIST
-    - forbidden kinds are blocked
+    - cluster        -> kubeconfig context (None = default cluster)
+    - forbidden kinds are blocked (also after alias resolution)
     - only metadata + status are returned
+    - NamespaceDigest -> composite summary of the namespace
+    - PodLog         -> bounded, reduced container log tail (`options`:
+                        container, previous, tail_lines, since_seconds)
+    - OwnerChain     -> ownerReferences walk from `options["target_kind"]`
+                        (default Pod) objects, reusing `cache` across calls
     """
 
     validate_kind(kind)
-    clients = get_clients()
-    k = kind.lower()
+    if kind.lower() == DIGEST_KIND.lower():
+        return read_namespace_digest(read_object, namespace, cluster, timeout)
 
-    core = clients["core"]
-    apps = clients["apps"]
-    autoscaling = clients["autoscaling"]
-    custom = clients["custom"]
+    clients = get_clients(cluster)
 
-    # --------------------------------------------------
-    # Core API
-    # --------------------------------------------------
-    if k == "pod":
-        if name:
-            obj = core.read_namespaced_pod(name, namespace)
-            return _summarize(obj)
-        objs = core.list_namespaced_pod(namespace)
-        return [_summarize(o) for o in objs.items]
+    if kind.lower() == LOG_KIND.lower():
+        return limited(
+            cluster,
+            "get",
+            lambda: read_pod_log(clients["core"], namespace, name, timeout=timeout, **(options or {})),
+        )
 
-    if k == "service":
-        if name:
-            obj = core.read_namespaced_service(name, namespace)
-            return _summarize(obj)
-        objs = core.list_namespaced_service(namespace)
-        return [_summarize(o) for o in objs.items]
+    if kind.lower() == OWNER_KIND.lower():
+        return resolve_owner_chains(
+            fetch=lambda k, n: _fetch_unsanitized(clients, k, namespace, n, cluster, timeout),
+            list_subjects=lambda k: _fetch_unsanitized(clients, k, namespace, None, cluster, timeout).get("items", []),
+            summarize=summarize,
+            subject_kind=(options or {}).get("target_kind") or "Pod",
+            namespace=namespace,
+            name=name,
+            cache=cache if cache is not None else ObjectCache(),
+            cache_scope=cluster,
+        )
 
-    if k == "event":
-        objs = core.list_namespaced_event(namespace)
-        return [_summarize(o) for o in objs.items]
+    entry = _BUILTIN.get(kind.lower())
+    if entry:
+        return _read_builtin(clients, entry, kind, namespace, name, timeout, cluster)
 
-    if k == "node":
-        objs = core.list_node()
-        return [_summarize(o) for o in objs.items]
+    return _read_discovered(clients, kind, namespace, name, cluster, timeout)
 
-    # --------------------------------------------------
-    # Apps API
-    # --------------------------------------------------
-    if k == "deployment":
-        if name:
-            obj = apps.read_namespaced_deployment(name, namespace)
-            return _summarize(obj)
-        objs = apps.list_namespaced_deployment(namespace)
-        return [_summarize(o) for o in objs.items]
 
-    if k == "replicaset":
-        if name:
-            obj = apps.read_namespaced_replica_set(name, namespace)
-            return _summarize(obj)
-        objs = apps.list_namespaced_replica_set(namespace)
-        return [_summarize(o) for o in objs.items]
+def read_across_clusters(
+    kind: str,
+    clusters: list[str],
+    namespace: str | None = None,
+    name: str | None = None,
+    timeout: float = FANOUT_TIMEOUT_SECONDS,
+    options: dict | None = None,
+    cache: ObjectCache | None = None,
+) -> list[dict]:
+    """
+    Run the same read against several clusters concurrently.
 
-    if k == "statefulset":
-        if name:
-            obj = apps.read_namespaced_stateful_set(name, namespace)
-            return _summarize(obj)
-        objs = apps.list_namespaced_stateful_set(namespace)
-        return [_summarize(o) for o in objs.items]
+    Returns one entry per cluster, in the order given:
+      {"cluster": str, "output": ...}  on success
+      {"cluster": str, "error": str}   on failure or timeout
+    A failing cluster never fails the whole fan-out.
+    """
+    validate_kind(kind)
 
-    if k == "daemonset":
-        if name:
-            obj = apps.read_namespaced_daemon_set(name, namespace)
-            return _summarize(obj)
-        objs = apps.list_namespaced_daemon_set(namespace)
-        return [_summarize(o) for o in objs.items]
+    clusters = list(dict.fromkeys(clusters))
+    if len(clusters) > MAX_FANOUT_CLUSTERS:
+        raise ValueError(
+            f"Fan-out to {len(clusters)} clusters exceeds the limit of {MAX_FANOUT_CLUSTERS}"
+        )
 
-    # --------------------------------------------------
-    # Autoscaling
-    # --------------------------------------------------
-    if k == "horizontalpodautoscaler":
-        if name:
-            obj = autoscaling.read_namespaced_horizontal_pod_autoscaler(
-                name, namespace
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, len(clusters)),
+        thread_name_prefix="eks-agent-fanout",
+    )
+    try:
+        futures = {
+            c: pool.submit(
+                contextvars.copy_context().run,
+                read_object, kind, namespace, name, cluster=c, timeout=timeout, options=options, cache=cache,
             )
-            return _summarize(obj)
-        objs = autoscaling.list_namespaced_horizontal_pod_autoscaler(namespace)
-        return [_summarize(o) for o in objs.items]
-
-    # --------------------------------------------------
-    # CRDs / Custom Resources
-    # --------------------------------------------------
-    if "." in k:
-        plural, group = k.split(".", 1)
+            for c in clusters
+        }
+        # Each request also carries `timeout` as its socket deadline; the
+        # wait here bounds the whole fan-out, including client setup.
+        wait(futures.values(), timeout=timeout)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
-        if name:
-            obj = custom.get_namespaced_custom_object(
-                group=group,
-                version="v1",
-                namespace=namespace,
-                plural=plural,
-                name=name,
-            )
-            return {
-                "kind": kind,
-                "metadata": obj.get("metadata"),
-                "status": obj.get("status"),
-            }
-
-        objs = custom.list_namespaced_custom_object(
-            group=group,
-            version="v1",
-            namespace=namespace,
-            plural=plural,
-        )
-        return [
-            {
-                "kind": kind,
-                "metadata": o.get("metadata"),
-                "status": o.get("status"),
-            }
-            for o in objs.get("items", [])
-        ]
-
-    raise ValueError(
-        f"Unsupported kind '{kind}'. "
-        "If this is a CRD, use '<plural>.<group>' format."
-    )
+    results = []
+    for c, fut in futures.items():
+        if not fut.done():
+            results.append({"cluster": c, "error": f"timed out after {timeout}s"})
+        elif fut.exception() is not None:
+            results.append({"cluster": c, "error": describe_error(fut.exception())})
+        else:
+            results.append({"cluster": c, "output": fut.result()})
+    return results
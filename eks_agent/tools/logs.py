@@ -0,0 +1,174 @@
+# eks_agent/tools/logs.py
+#
+# Bounded container log tail.
+#
+# The API server is asked for at most MAX_TAIL_LINES / MAX_LIMIT_BYTES and
+# the body is streamed and reduced chunk by chunk, so memory stays constant
+# however chatty the container is:
+#   - identical lines (after masking numbers, hex ids and timestamps) are
+#     counted instead of repeated
+#   - error-looking lines are kept separately, so they survive even when
+#     the tail is dominated by noise
+#   - only the last KEEP_LAST_LINES lines are returned verbatim, with
+#     consecutive repeats collapsed
+
+import re
+from collections import OrderedDict, deque
+from typing import Iterable, Optional
+
+LOG_KIND = "PodLog"
+
+MAX_TAIL_LINES = 500
+DEFAULT_TAIL_LINES = 200
+MAX_LIMIT_BYTES = 256 * 1024
+MAX_SINCE_SECONDS = 24 * 3600
+
+KEEP_LAST_LINES = 40
+MAX_ERROR_LINES = 20
+MAX_PATTERNS = 1000
+MAX_LINE_CHARS = 500
+CHUNK_BYTES = 16 * 1024
+
+_ERROR_RE = re.compile(
+    r"\b(error|err|exception|fatal|panic|traceback|failed|failure|oom|killed|refused|timeout|timed out)\b",
+    re.IGNORECASE,
+)
+_MASK_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ][\d:.,]+Z?|0x[0-9a-f]+|[0-9a-f]{8,}|\d+",
+    re.IGNORECASE,
+)
+
+
+def clamp_options(
+    tail_lines: Optional[int] = None,
+    since_seconds: Optional[int] = None,
+) -> dict:
+    """
+    Server-enforced bounds; the model can ask for less, never for more.
+    """
+    tail = DEFAULT_TAIL_LINES if not tail_lines else max(1, min(int(tail_lines), MAX_TAIL_LINES))
+    opts = {"tail_lines": tail, "limit_bytes": MAX_LIMIT_BYTES}
+    if since_seconds:
+        opts["since_seconds"] = max(1, min(int(since_seconds), MAX_SINCE_SECONDS))
+    return opts
+
+
+def _lines(chunks: Iterable[bytes]) -> Iterable[str]:
+    """
+    Split a byte stream into lines without ever holding more than one
+    chunk plus one partial line. Overlong lines are cut at MAX_LINE_CHARS.
+    """
+    partial = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        partial += chunk
+        *complete, partial = partial.split(b"\n")
+        for raw in complete:
+            yield raw[:MAX_LINE_CHARS * 4].decode("utf-8", "replace")[:MAX_LINE_CHARS].rstrip("\r")
+        if len(partial) > MAX_LINE_CHARS * 4:
+            partial = partial[:MAX_LINE_CHARS * 4]
+    if partial:
+        yield partial.decode("utf-8", "replace")[:MAX_LINE_CHARS].rstrip("\r")
+
+
+def reduce_log_stream(chunks: Iterable[bytes]) -> dict:
+    """
+    Reduce a streamed log body to counts, error lines and a short tail.
+    """
+    patterns: OrderedDict[str, int] = OrderedDict()
+    overflow = 0
+    errors: deque = deque(maxlen=MAX_ERROR_LINES)
+    tail: deque = deque(maxlen=KEEP_LAST_LINES)
+    total = 0
+    nbytes = 0
+
+    for line in _lines(chunks):
+        total += 1
+        nbytes += len(line) + 1
+        if not line.strip():
+            continue
+
+        key = _MASK_RE.sub("#", line)
+
+        # The tail collapses consecutive repeats, like `uniq -c`.
+        if tail and tail[-1][0] == key:
+            tail[-1][1] = line
+            tail[-1][2] += 1
+        else:
+            tail.append([key, line, 1])
+
+        if key in patterns:
+            patterns[key] += 1
+            patterns.move_to_end(key)
+            continue
+
+        if len(patterns) >= MAX_PATTERNS:
+            patterns.popitem(last=False)
+            overflow += 1
+        patterns[key] = 1
+
+        # First occurrence of each distinct error shape.
+        if _ERROR_RE.search(line):
+            errors.append(line)
+
+    repeated = sorted(
+        ((k, n) for k, n in patterns.items() if n > 1),
+        key=lambda kv: kv[1],
+        reverse=True,
+    )[:5]
+
+    return {
+        "lines": total,
+        "bytes": nbytes,
+        "distinct_lines": len(patterns) + overflow,
+        "error_lines": list(errors),
+        "most_repeated": [{"pattern": k, "count": n} for k, n in repeated],
+        "tail": [line if n == 1 else f"{line}  (x{n})" for _, line, n in tail],
+    }
+
+
+def read_pod_log(
+    core,
+    namespace: Optional[str],
+    name: Optional[str],
+    container: Optional[str] = None,
+    previous: bool = False,
+    tail_lines: Optional[int] = None,
+    since_seconds: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Stream and reduce one container's log via read_namespaced_pod_log.
+    """
+    if not namespace or not name:
+        raise ValueError(f"{LOG_KIND} requires a namespace and a pod name")
+
+    opts = clamp_options(tail_lines, since_seconds)
+    kwargs = dict(opts, previous=bool(previous))
+    if container:
+        kwargs["container"] = container
+
+    resp = core.read_namespaced_pod_log(
+        name,
+        namespace,
+        _preload_content=False,
+        _request_timeout=timeout,
+        **kwargs,
+    )
+    try:
+        reduced = reduce_log_stream(resp.stream(CHUNK_BYTES))
+    finally:
+        release = getattr(resp, "release_conn", None)
+        if release:
+            release()
+
+    return {
+        "kind": LOG_KIND,
+        "pod": name,
+        "namespace": namespace,
+        "container": container,
+        "previous": bool(previous),
+        "limits": opts,
+        **reduced,
+    }
@@ -2,11 +2,55 @@
 from pydantic import BaseModel
 from typing import List, Optional
 
+from eks_agent.tools.digest import DIGEST_KIND, DIGEST_COMMANDS
+from eks_agent.tools.logs import LOG_KIND, clamp_options
+from eks_agent.tools.owners import OWNER_KIND
+
+TOOL_NAME = "read_kubernetes_objects"
+
+
 class ToolCall(BaseModel):
     kind: str
     namespace: Optional[str] = None
     name: Optional[str] = None
     why: Optional[str] = None
+    cluster: Optional[str] = None
+    clusters: Optional[List[str]] = None
+
+    # PodLog only
+    container: Optional[str] = None
+    previous: Optional[bool] = None
+    tail_lines: Optional[int] = None
+    since_seconds: Optional[int] = None
+
+    # OwnerChain only: kind of the object(s) to start from (default Pod)
+    target_kind: Optional[str] = None
+
+    @property
+    def targets(self) -> List[Optional[str]]:
+        """
+        Cluster contexts this call reads from (None = default cluster).
+        """
+        if self.clusters:
+            return list(dict.fromkeys(self.clusters))
+        return [self.cluster]
+
+    @property
+    def read_options(self) -> Optional[dict]:
+        """
+        read_object options for composite kinds; None for every other kind.
+        """
+        kind = self.kind.lower()
+        if kind == LOG_KIND.lower():
+            return {
+                "container": self.container,
+                "previous": bool(self.previous),
+                "tail_lines": self.tail_lines,
+                "since_seconds": self.since_seconds,
+            }
+        if kind == OWNER_KIND.lower():
+            return {"target_kind": self.target_kind or "Pod"}
+        return None
 
 
 class ToolRequest(BaseModel):
@@ -20,11 +64,78 @@ class ToolRequest(BaseModel):
             kind = t.kind.lower()
             ns = f"-n {t.namespace}" if t.namespace else ""
 
-            if t.name:
-                cmds.append(f"kubectl get {kind} {t.name} {ns}".strip())
-            else:
-                # LIST
-                plural = kind + "s" if not kind.endswith("s") else kind
-                cmds.append(f"kubectl get {plural} {ns}".strip())
+            for cluster in t.targets:
+                ctx = f" --context {cluster}" if cluster else ""
+
+                if kind == LOG_KIND.lower():
+                    opts = clamp_options(t.tail_lines, t.since_seconds)
+                    cmd = f"kubectl logs {t.name} {ns}".strip()
+                    if t.container:
+                        cmd += f" -c {t.container}"
+                    if t.previous:
+                        cmd += " --previous"
+                    cmd += f" --tail={opts['tail_lines']} --limit-bytes={opts['limit_bytes']}"
+                    if "since_seconds" in opts:
+                        cmd += f" --since={opts['since_seconds']}s"
+                    cmds.append(cmd + ctx)
+                elif kind == OWNER_KIND.lower():
+                    target = (t.target_kind or "Pod").lower()
+                    if t.name:
+                        cmd = f"kubectl get {target} {t.name} {ns}".strip()
+                        cmds.append(cmd + " -o jsonpath={.metadata.ownerReferences}" + ctx)
+                    else:
+                        cmd = f"kubectl get {target} {ns}".strip()
+                        cmds.append(
+                            cmd + " -o custom-columns=NAME:.metadata.name,"
+                            "OWNER:.metadata.ownerReferences[0].kind,"
+                            "OWNER_NAME:.metadata.ownerReferences[0].name" + ctx
+                        )
+                elif kind == DIGEST_KIND.lower():
+                    cmds.extend(f"{c} {ns}".strip() + ctx for c in DIGEST_COMMANDS)
+                elif t.name:
+                    cmds.append(f"kubectl get {kind} {t.name} {ns}".strip() + ctx)
+                else:
+                    # LIST
+                    plural = kind + "s" if not kind.endswith("s") else kind
+                    cmds.append(f"kubectl get {plural} {ns}".strip() + ctx)
+
+        return cmds
+
+
+def tool_spec() -> dict:
+    """
+    Messages API tool definition for read-only Kubernetes data collection.
 
-        return cmds
\ No newline at end of file
+    The input schema is derived from ToolCall so the model and the backend
+    validate against the same contract.
+    """
+    return {
+        "name": TOOL_NAME,
+        "description": (
+            "Propose READ-ONLY Kubernetes objects to collect. "
+            "Nothing runs until the user approves. "
+            "Use name=null only to LIST objects when the name is unknown. "
+            "Set cluster to a kubeconfig context to read from a specific cluster, "
+            "or clusters to compare the same read across several clusters. "
+            f"Use kind={DIGEST_KIND} with a namespace for a one-read health summary "
+            "of its pods, events, workloads and HPAs. "
+            f"Use kind={LOG_KIND} with a namespace and pod name to read a bounded "
+            "tail of container logs (container, previous=true for the crashed "
+            "instance, tail_lines, since_seconds). "
+            f"Use kind={OWNER_KIND} with a namespace (and optionally a name and "
+            "target_kind, default Pod) to resolve the ownerReferences chain, e.g. "
+            "Pod -> ReplicaSet -> Deployment, in one read. "
+            "Never request Secrets or ConfigMaps."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "tools": {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": ToolCall.model_json_schema(),
+                },
+            },
+            "required": ["tools"],
+        },
+    }
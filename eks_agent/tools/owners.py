@@ -0,0 +1,215 @@
+# eks_agent/tools/owners.py
+#
+# Owner-reference chain resolution: Pod -> ReplicaSet -> Deployment (or
+# StatefulSet / DaemonSet / Job -> CronJob / any CRD controller) in one
+# approved read.
+#
+# Each level of the walk is fetched as one concurrent batch of distinct
+# owners, and every resolved object goes into a per-session cache, so
+# sibling pods (and later rounds) share lookups instead of re-reading the
+# same ReplicaSet and Deployment.
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from eks_agent.tools.gate import describe_error
+
+OWNER_KIND = "OwnerChain"
+
+MAX_DEPTH = 5
+MAX_SUBJECTS = 200
+MAX_SUBJECT_NAMES = 10
+MAX_WORKERS = 8
+
+CACHE_TTL_SECONDS = 60.0
+MAX_CACHE_ENTRIES = 2000
+
+
+class ObjectCache:
+    """
+    Small TTL cache of raw objects keyed by (cluster, kind, namespace, name).
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = MAX_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._items: dict[tuple, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            hit = self._items.get(key)
+            if hit and time.monotonic() - hit[0] <= self.ttl:
+                self.hits += 1
+                return hit[1]
+            self._items.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, obj: dict):
+        with self._lock:
+            if len(self._items) >= self.max_entries:
+                # Oldest first; dicts keep insertion order.
+                self._items.pop(next(iter(self._items)))
+            self._items[key] = (time.monotonic(), obj)
+
+
+_SESSION_CACHES: dict[str, ObjectCache] = {}
+_SESSION_LOCK = threading.Lock()
+
+
+def session_cache(session_id: Optional[str]) -> ObjectCache:
+    """
+    Per-session object cache; a throwaway cache when there is no session.
+    """
+    if session_id is None:
+        return ObjectCache()
+    with _SESSION_LOCK:
+        cache = _SESSION_CACHES.get(session_id)
+        if cache is None:
+            cache = _SESSION_CACHES[session_id] = ObjectCache()
+        return cache
+
+
+def forget_session(session_id: str):
+    with _SESSION_LOCK:
+        _SESSION_CACHES.pop(session_id, None)
+
+
+def controller_of(obj: dict) -> Optional[dict]:
+    """
+    The managing owner: the controller=true reference, else the first one.
+    """
+    refs = (obj.get("metadata") or {}).get("ownerReferences") or []
+    for ref in refs:
+        if ref.get("controller"):
+            return ref
+    return refs[0] if refs else None
+
+
+def _ref(obj_kind: str, obj: dict) -> str:
+    return f"{obj.get('kind') or obj_kind}/{(obj.get('metadata') or {}).get('name')}"
+
+
+def resolve_owner_chains(
+    fetch: Callable[[str, str], dict],
+    list_subjects: Callable[[str], list[dict]],
+    summarize: Callable[[dict, str], dict],
+    subject_kind: str,
+    namespace: Optional[str],
+    name: Optional[str],
+    cache: ObjectCache,
+    cache_scope: Optional[str] = None,
+) -> dict:
+    """
+    Walk ownerReferences up from one object (`name`) or from every
+    `subject_kind` object in the namespace (`name` is None).
+
+    `fetch(kind, name)` returns one raw object, `list_subjects(kind)` the raw
+    items of a LIST, and `summarize` is the usual metadata+status sanitizer.
+    Owners live in the subject's namespace, so only the owner kind and name
+    vary; `cache_scope` (the cluster) keeps caches of different clusters apart.
+    """
+    if not namespace:
+        raise ValueError(f"{OWNER_KIND} requires a namespace")
+
+    if name:
+        key = (cache_scope, subject_kind.lower(), namespace, name)
+        subject = cache.get(key)
+        if subject is None:
+            subject = fetch(subject_kind, name)
+            cache.put(key, subject)
+        subjects = [subject]
+    else:
+        subjects = list_subjects(subject_kind)
+    truncated = max(0, len(subjects) - MAX_SUBJECTS)
+    subjects = subjects[:MAX_SUBJECTS]
+
+    resolved: dict[str, dict] = {}   # "Kind/name" -> raw object
+    errors: dict[str, str] = {}
+    frontier = [controller_of(s) for s in subjects]
+    reads = 0
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="eks-agent-owners") as pool:
+        for _ in range(MAX_DEPTH):
+            wanted = {}
+            for ref in frontier:
+                if ref is None:
+                    continue
+                rid = f"{ref['kind']}/{ref['name']}"
+                if rid not in resolved and rid not in errors:
+                    wanted[rid] = ref
+            if not wanted:
+                break
+
+            missing = []
+            for rid, ref in wanted.items():
+                obj = cache.get((cache_scope, ref["kind"].lower(), namespace, ref["name"]))
+                if obj is not None:
+                    resolved[rid] = obj
+                else:
+                    missing.append((rid, ref))
+
+            def one(item):
+                rid, ref = item
+                try:
+                    return rid, ref, fetch(ref["kind"], ref["name"]), None
+                except Exception as e:
+                    return rid, ref, None, e
+
+            futures = [pool.submit(contextvars.copy_context().run, one, m) for m in missing]
+            for rid, ref, obj, err in (f.result() for f in futures):
+                reads += 1
+                if err is not None:
+                    errors[rid] = describe_error(err)
+                    continue
+                cache.put((cache_scope, ref["kind"].lower(), namespace, ref["name"]), obj)
+                resolved[rid] = obj
+
+            frontier = [controller_of(resolved[rid]) for rid in wanted if rid in resolved]
+
+    def chain_of(subject: dict) -> list[str]:
+        chain = []
+        ref = controller_of(subject)
+        while ref is not None and len(chain) < MAX_DEPTH:
+            rid = f"{ref['kind']}/{ref['name']}"
+            chain.append(rid)
+            if rid not in resolved:
+                break
+            ref = controller_of(resolved[rid])
+        return chain
+
+    # Subjects that share an owner chain are reported once.
+    chains: dict[tuple, list[str]] = {}
+    for s in subjects:
+        chains.setdefault(tuple(chain_of(s)), []).append(_ref(subject_kind, s))
+
+    out = {
+        "kind": OWNER_KIND,
+        "namespace": namespace,
+        "chains": [
+            {
+                "owners": list(chain) or None,
+                "subjects": members[:MAX_SUBJECT_NAMES],
+                "subject_count": len(members),
+            }
+            for chain, members in sorted(chains.items(), key=lambda kv: -len(kv[1]))
+        ],
+        "objects": {
+            rid: summarize(obj, rid.split("/", 1)[0])
+            for rid, obj in resolved.items()
+        },
+        "api_reads": reads,
+    }
+    if name:
+        out["subject"] = summarize(subjects[0], subject_kind)
+    if truncated:
+        out["subjects_omitted"] = truncated
+    if errors:
+        out["errors"] = errors
+    return out
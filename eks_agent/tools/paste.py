@@ -0,0 +1,345 @@
+# eks_agent/tools/paste.py
+#
+# Parser for kubectl output pasted back in manual mode.
+#
+# The paste is read line by line and split into documents: `kubectl get`
+# tables, `-o json` objects and `-o yaml` documents (anything else is kept
+# as the user's own text). Subtrees that k8s_reader never returns (spec,
+# data, annotations, managedFields, ...) are skipped while the lines are
+# read, so only metadata and status are ever parsed; each document is then
+# sanitized with the same rules as an API read and dropped.
+#
+# Only documents that look like kubectl output become evidence: JSON/YAML
+# with apiVersion + kind or an items list, and tables that follow an echoed
+# `kubectl get` line or start with a NAME column. Anything else (structured
+# log lines, prose that happens to be upper case) stays the user's text.
+#
+# Forbidden kinds (Secrets, ConfigMaps, RBAC, ...) and list items whose kind
+# cannot be told are omitted entirely; a forbidden or unparsable document
+# leaves only an `<omitted: ...>` marker in the text.
+
+import io
+import json
+import re
+from typing import Iterator, Optional
+
+from eks_agent.tools.gate import FORBIDDEN_KINDS
+from eks_agent.tools.sanitize import list_items, summarize
+
+PASTE_KIND = "PastedTable"
+
+# Never parsed, at any depth.
+_DROP_KEYS = ("spec", "data", "stringData", "binaryData", "managedFields", "annotations")
+_DROP = "|".join(_DROP_KEYS)
+
+_JSON_DROP_RE = re.compile(rf'^(\s*)"({_DROP})"\s*:\s*(.*)$')
+_YAML_DROP_RE = re.compile(rf"^(\s*)({_DROP}):(.*)$")
+_JSON_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"')
+_YAML_TOP_RE = re.compile(r"^[A-Za-z_][\w.-]*:")
+_TABLE_HEADER_RE = re.compile(r"^[A-Z][A-Z0-9()/%-]*(?: [A-Z][A-Z0-9()/%-]*)*(?:\s{2,}[A-Z][A-Z0-9()/%-]*(?: [A-Z][A-Z0-9()/%-]*)*)+\s*$")
+_COMMAND_RE = re.compile(r"^\s*(?:\$\s*)?kubectl\s+get\s+(.*)$")
+
+# kubectl resource names and short names -> kind
+_RESOURCE_KINDS = {
+    "po": "Pod", "pod": "Pod", "pods": "Pod",
+    "ev": "Event", "event": "Event", "events": "Event",
+    "deploy": "Deployment", "deployment": "Deployment", "deployments": "Deployment",
+    "rs": "ReplicaSet", "replicaset": "ReplicaSet", "replicasets": "ReplicaSet",
+    "sts": "StatefulSet", "statefulset": "StatefulSet", "statefulsets": "StatefulSet",
+    "ds": "DaemonSet", "daemonset": "DaemonSet", "daemonsets": "DaemonSet",
+    "svc": "Service", "service": "Service", "services": "Service",
+    "no": "Node", "node": "Node", "nodes": "Node",
+    "hpa": "HorizontalPodAutoscaler", "horizontalpodautoscaler": "HorizontalPodAutoscaler",
+    "horizontalpodautoscalers": "HorizontalPodAutoscaler",
+    "job": "Job", "jobs": "Job", "cj": "CronJob", "cronjob": "CronJob", "cronjobs": "CronJob",
+}
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _command_hint(line: str) -> Optional[dict]:
+    """
+    Kind and namespace from an echoed `kubectl get ...` line.
+    """
+    m = _COMMAND_RE.match(line)
+    if not m:
+        return None
+    args = m.group(1).split()
+    hint = {"kind": None, "namespace": None, "name": None}
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a in ("-n", "--namespace") and i + 1 < len(args):
+            hint["namespace"] = args[i + 1]
+            i += 2
+            continue
+        if a.startswith("--namespace="):
+            hint["namespace"] = a.split("=", 1)[1]
+        elif not a.startswith("-") and hint["kind"] is None:
+            resource, _, name = a.partition("/")
+            hint["kind"] = _RESOURCE_KINDS.get(resource.split(".", 1)[0].lower(), resource)
+            hint["name"] = name or None
+        elif not a.startswith("-") and hint["name"] is None:
+            hint["name"] = a
+        i += 1
+    return hint
+
+
+# --------------------------------------------------
+# Line filters (skip dropped subtrees before parsing)
+# --------------------------------------------------
+
+class _JsonFilter:
+    """
+    Skips _DROP_KEYS subtrees of pretty-printed JSON (kubectl -o json) and
+    tracks bracket depth to find the end of the document.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.depth = 0
+        self._skip_indent: Optional[int] = None
+
+    def feed(self, line: str) -> bool:
+        """
+        Add one line; True once the document is complete.
+        """
+        if self._skip_indent is not None:
+            # The skipped subtree is balanced, so depth is left untouched.
+            i = self._skip_indent
+            if line[i:i + 1] in ("}", "]") and (i == 0 or line[:i].isspace()):
+                self._skip_indent = None
+            return False
+
+        m = _JSON_DROP_RE.match(line) if line.lstrip().startswith('"') else None
+        if m:
+            if m.group(3).rstrip().rstrip(",") in ("{", "["):
+                self._skip_indent = len(m.group(1))
+            return False
+
+        if "{" in line or "}" in line or "[" in line or "]" in line:
+            bare = _JSON_STRING_RE.sub('""', line) if '"' in line else line
+            self.depth += bare.count("{") + bare.count("[") - bare.count("}") - bare.count("]")
+            # A member right before a closing bracket has no trailing comma
+            # (the member that followed it may have been dropped).
+            if line.lstrip()[:1] in ("}", "]") and self.lines:
+                self.lines[-1] = self.lines[-1].rstrip().rstrip(",")
+        self.lines.append(line)
+        return self.depth <= 0
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class _YamlFilter:
+    def __init__(self):
+        self.lines: list[str] = []
+        self._skip_indent: Optional[int] = None
+
+    def feed(self, line: str):
+        if self._skip_indent is not None:
+            ind = _indent(line)
+            if not line.strip() or ind > self._skip_indent or (
+                ind == self._skip_indent and line.lstrip().startswith("- ")
+            ):
+                return
+            self._skip_indent = None
+
+        m = _YAML_DROP_RE.match(line)
+        if m:
+            self._skip_indent = len(m.group(1))
+            return
+        self.lines.append(line)
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+# --------------------------------------------------
+# Document -> evidence entries
+# --------------------------------------------------
+
+def _is_kubectl_object(obj) -> bool:
+    return isinstance(obj, dict) and (
+        bool(obj.get("apiVersion") and obj.get("kind")) or isinstance(obj.get("items"), list)
+    )
+
+
+def _entries_from_object(obj: dict, hint: dict) -> list[dict]:
+    kind = obj.get("kind") or hint.get("kind")
+    if "items" in obj:
+        items = [
+            o for o in list_items(obj, hint.get("kind") or (kind or "").removesuffix("List"))
+            if o.get("kind") and o["kind"].lower() not in FORBIDDEN_KINDS
+        ]
+        item_kind = items[0]["kind"] if items and len({o["kind"] for o in items}) == 1 else kind or "List"
+        return [{
+            "kind": item_kind,
+            "namespace": hint.get("namespace"),
+            "name": None,
+            "output": items,
+        }]
+    if kind.lower() in FORBIDDEN_KINDS:
+        return []
+    out = summarize(obj, kind)
+    return [{
+        "kind": out["kind"],
+        "namespace": out["metadata"].get("namespace"),
+        "name": out["metadata"].get("name"),
+        "output": out,
+    }]
+
+
+def _is_table_header(line: str, hint: dict) -> bool:
+    if not _TABLE_HEADER_RE.match(line):
+        return False
+    columns = re.split(r"\s{2,}", line.strip())
+    return bool(hint.get("kind")) or columns[0] == "NAME" or columns[:2] == ["NAMESPACE", "NAME"]
+
+
+def _omitted(what: str) -> str:
+    return f"<omitted: {what}>"
+
+
+def _claims_object(raw: list[str]) -> bool:
+    # A document that failed to parse may still be kubectl output with its
+    # spec in it; only text that never claimed to be an object is kept.
+    return any("apiVersion" in ln or '"items"' in ln for ln in raw)
+
+
+def _table_entry(header: str, rows: list[str], hint: dict) -> Optional[dict]:
+    kind = hint.get("kind") or PASTE_KIND
+    if kind.lower() in FORBIDDEN_KINDS:
+        return None
+    starts = [m.start() for m in re.finditer(r"(?:(?<=\s\s)|^)\S", header)]
+    names = [header[a:b].strip().lower() for a, b in zip(starts, starts[1:] + [None])]
+    items = []
+    for row in rows:
+        # kubectl pads columns with 3+ spaces; offsets are only needed when a
+        # cell is blank or the paste lost its alignment.
+        values = re.split(r"\s{2,}", row.strip())
+        if len(values) != len(names):
+            values = [row[a:b].strip() if a < len(row) else "" for a, b in zip(starts, starts[1:] + [None])]
+        items.append({n: v for n, v in zip(names, values) if v and v != "<none>"})
+    return {"kind": kind, "namespace": hint.get("namespace"), "name": hint.get("name"), "output": items}
+
+
+def parse_pasted(text: str) -> tuple[list[dict], str, bool]:
+    """
+    Split a manual-mode paste into evidence entries (metadata and status
+    only) and the remaining free text.
+
+    The flag is True when any kubectl document was recognized, even if it
+    was omitted (forbidden kind, unparsable): the paste must then only be
+    used through the returned text, never as is.
+    """
+    entries: list[dict] = []
+    prose: list[str] = []
+    hint: dict = {}
+    recognized = False
+
+    def add_object(obj: dict):
+        nonlocal recognized
+        recognized = True
+        found = _entries_from_object(obj, hint)
+        if found:
+            entries.extend(found)
+        else:
+            prose.append(_omitted(obj.get("kind") or hint.get("kind") or "object"))
+
+    lines: Iterator[str] = (ln.rstrip("\r\n") for ln in io.StringIO(text))
+    pending: Optional[str] = None
+
+    def next_line() -> Optional[str]:
+        nonlocal pending
+        if pending is not None:
+            line, pending = pending, None
+            return line
+        return next(lines, None)
+
+    while (line := next_line()) is not None:
+        cmd = _command_hint(line)
+        if cmd:
+            hint = cmd
+            continue
+
+        # -o json
+        if line.startswith("{"):
+            raw = [line]
+            f = _JsonFilter()
+            done = f.feed(line)
+            while not done and (line := next_line()) is not None:
+                raw.append(line)
+                done = f.feed(line)
+            try:
+                obj = json.loads(f.text())
+            except ValueError:
+                if _claims_object(raw):
+                    recognized = True
+                    prose.append(_omitted("unparsed JSON"))
+                else:
+                    prose.extend(raw)
+            else:
+                if _is_kubectl_object(obj):
+                    add_object(obj)
+                else:
+                    prose.extend(raw)
+            hint = {}
+            continue
+
+        # -o yaml
+        if line.startswith(("apiVersion:", "kind:")) or line.strip() == "---":
+            raw = [line]
+            f = _YamlFilter()
+            if line.strip() != "---":
+                f.feed(line)
+            while (line := next_line()) is not None:
+                if line.strip() in ("---", "...") or _command_hint(line):
+                    pending = line if line.strip() != "..." else None
+                    break
+                if line and not line.startswith((" ", "-", "#")) and not _YAML_TOP_RE.match(line):
+                    pending = line
+                    break
+                raw.append(line)
+                f.feed(line)
+            import yaml  # only pastes with YAML pay for it
+
+            try:
+                doc = yaml.load(f.text(), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+            except yaml.YAMLError:
+                if _claims_object(raw):
+                    recognized = True
+                    prose.append(_omitted("unparsed YAML"))
+                else:
+                    prose.extend(raw)
+            else:
+                if _is_kubectl_object(doc):
+                    add_object(doc)
+                elif doc is not None:
+                    prose.extend(raw)
+            if pending is None or pending.strip() != "---":
+                hint = {}
+            continue
+
+        # kubectl get (table)
+        if _is_table_header(line, hint):
+            rows = []
+            while (row := next_line()) is not None:
+                if not row.strip() or _command_hint(row) or _TABLE_HEADER_RE.match(row):
+                    pending = row if row.strip() else None
+                    break
+                rows.append(row)
+            recognized = True
+            entry = _table_entry(line, rows, hint)
+            if entry:
+                entries.append(entry)
+            else:
+                prose.append(_omitted(hint["kind"]))
+            hint = {}
+            continue
+
+        prose.append(line)
+
+    return entries, "\n".join(prose).strip(), recognized
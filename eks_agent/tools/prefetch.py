@@ -0,0 +1,106 @@
+# eks_agent/tools/prefetch.py
+#
+# Speculative prefetch of proposed reads while the user decides.
+#
+# Reads are started the moment a permission prompt is sent and held in a
+# short-lived per-session buffer. Nothing in the buffer is ever rendered or
+# sent to the model unless the user approves the request; "manual" or a new
+# question discards it. Buffers of abandoned sessions are swept once expired.
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from eks_agent.tools.model import ToolCall
+
+ENABLED = os.environ.get("EKS_AGENT_PREFETCH", "").lower() in ("1", "true", "yes")
+TTL_SECONDS = float(os.environ.get("EKS_AGENT_PREFETCH_TTL", "120"))
+MAX_WORKERS = 4
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_BUFFER: dict[str, dict] = {}
+_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS,
+            thread_name_prefix="eks-agent-prefetch",
+        )
+    return _EXECUTOR
+
+
+def start(
+    session_id: str,
+    calls: list[ToolCall],
+    signature: Callable[[ToolCall], str],
+    reader: Callable[[ToolCall], object],
+):
+    """
+    Start background reads for already-validated, deduped, scoped calls.
+
+    Any previous buffer for the session (and every expired one) is
+    discarded first.
+    """
+    discard(session_id)
+
+    futures: dict[str, Future] = {}
+    for call in calls:
+        sig = signature(call)
+        if sig in futures:
+            continue
+        futures[sig] = _executor().submit(reader, call)
+
+    with _LOCK:
+        _BUFFER[session_id] = {
+            "expires": time.monotonic() + TTL_SECONDS,
+            "futures": futures,
+        }
+
+
+def take(session_id: str, sig: str) -> Optional[Future]:
+    """
+    Claim the prefetched read for `sig`, or None if absent or expired.
+    """
+    with _LOCK:
+        entry = _BUFFER.get(session_id)
+        if not entry:
+            return None
+        if time.monotonic() > entry["expires"]:
+            _BUFFER.pop(session_id, None)
+            _cancel(entry)
+            return None
+        return entry["futures"].pop(sig, None)
+
+
+def result(fut: Optional[Future]) -> Optional[object]:
+    """
+    The prefetched read's result, or None if there is none, it was
+    cancelled, or it failed; the caller then reads again at its own priority.
+    """
+    if fut is None or fut.cancelled():
+        return None
+    try:
+        return fut.result()
+    except Exception:
+        return None
+
+
+def discard(session_id: str):
+    now = time.monotonic()
+    with _LOCK:
+        dropped = [_BUFFER.pop(session_id, None)]
+        for sid in [sid for sid, e in _BUFFER.items() if now > e["expires"]]:
+            dropped.append(_BUFFER.pop(sid))
+    for entry in dropped:
+        if entry:
+            _cancel(entry)
+
+
+def _cancel(entry: dict):
+    for fut in entry["futures"].values():
+        fut.cancel()
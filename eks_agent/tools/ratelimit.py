@@ -0,0 +1,175 @@
+# eks_agent/tools/ratelimit.py
+#
+# Client-side API-server load budget.
+#
+# Every Kubernetes read takes a token from its cluster's bucket first:
+# GETs and LISTs have separate budgets (LISTs are far more expensive for
+# the control plane). Callers queue until a token is free or their queue
+# deadline passes. Interactive reads go ahead of background (prefetch)
+# reads waiting on the same bucket.
+#
+# A 429 from the API server pauses the whole bucket for its Retry-After
+# and the read is retried, up to MAX_RETRIES and within the same deadline.
+#
+# A QPS of 0 disables the client-side budget for that verb (429s are still
+# honoured).
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, TypeVar
+
+from eks_agent import metrics
+
+T = TypeVar("T")
+
+GET_QPS = float(os.environ.get("EKS_AGENT_GET_QPS", "20"))
+GET_BURST = float(os.environ.get("EKS_AGENT_GET_BURST", "40"))
+LIST_QPS = float(os.environ.get("EKS_AGENT_LIST_QPS", "5"))
+LIST_BURST = float(os.environ.get("EKS_AGENT_LIST_BURST", "10"))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get("EKS_AGENT_QUEUE_TIMEOUT", "5"))
+
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 30.0
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_PRIORITY: ContextVar[str] = ContextVar("eks_agent_read_priority", default=INTERACTIVE)
+
+
+class Throttled(RuntimeError):
+    pass
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """
+    Reads made inside this block yield to interactive ones.
+    """
+    token = _PRIORITY.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, deadline: float, priority: str = INTERACTIVE) -> float:
+        """
+        Take one token, waiting until `deadline` (monotonic) at most.
+        Returns the time spent queued; raises Throttled on timeout.
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    paused = now < self._paused_until
+                    yielding = priority == BACKGROUND and self._waiting[INTERACTIVE] > 0
+
+                    if not paused and self.rate <= 0:
+                        return now - start
+                    if not paused and not yielding and self._tokens >= 1:
+                        self._tokens -= 1
+                        return now - start
+
+                    if paused:
+                        wait_for = self._paused_until - now
+                    elif self._tokens < 1:
+                        wait_for = (1 - self._tokens) / self.rate
+                    else:
+                        wait_for = 0.01  # let a waiting interactive read go first
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise Throttled(f"client-side rate limit: queued {now - start:.2f}s without a token")
+                    self._cond.wait(min(wait_for, remaining))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """
+        Hand out no tokens for `seconds` (server asked us to back off).
+        """
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+_BUCKETS: dict[tuple[Optional[str], str], TokenBucket] = {}
+_LOCK = threading.Lock()
+
+
+def bucket(cluster: Optional[str], verb: str) -> TokenBucket:
+    with _LOCK:
+        b = _BUCKETS.get((cluster, verb))
+        if b is None:
+            if verb == "list":
+                b = TokenBucket(LIST_QPS, LIST_BURST)
+            else:
+                b = TokenBucket(GET_QPS, GET_BURST)
+            _BUCKETS[(cluster, verb)] = b
+        return b
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Seconds to back off if `exc` is a 429, else None.
+    """
+    if getattr(exc, "status", None) != 429:
+        return None
+    headers = getattr(exc, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        seconds = DEFAULT_RETRY_AFTER
+    return max(0.0, min(seconds, MAX_RETRY_AFTER))
+
+
+def limited(cluster: Optional[str], verb: str, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+    """
+    Run one API read (`verb` is "get" or "list") under the cluster's budget.
+    """
+    priority = _PRIORITY.get()
+    deadline = time.monotonic() + (QUEUE_TIMEOUT_SECONDS if timeout is None else timeout)
+    b = bucket(cluster, verb)
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            queued = b.acquire(deadline, priority)
+        except Throttled:
+            metrics.THROTTLED.inc(verb=verb, reason="queue_timeout")
+            raise
+        metrics.QUEUE_SECONDS.observe(queued, verb=verb, priority=priority)
+
+        try:
+            return fn()
+        except Exception as e:
+            backoff = _retry_after(e)
+            if backoff is None:
+                raise
+            metrics.THROTTLED.inc(verb=verb, reason="server_429")
+            b.pause(backoff)
+            if attempt == MAX_RETRIES or time.monotonic() + backoff > deadline:
+                raise
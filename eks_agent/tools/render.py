@@ -1,10 +1,29 @@
 # eks_agent/tools/render.py
+#
+# Lists of one kind are rendered as a table by default: shared values are
+# printed once, then a header of field paths and one "|"-separated row per
+# object (null fields left empty). Kinds not in TABULAR_KINDS, and lists
+# that do not flatten into a reasonable number of columns, keep the
+# indented JSON format.
 
 import json
-from typing import Any
+import os
+from typing import Any, Optional
 
 MAX_CHARS = 8000
 MAX_LIST_ITEMS = 20
+MAX_TABLE_ROWS = 200
+MAX_COLUMNS = 60
+
+# Comma-separated kinds rendered as tables, "*" for every kind, "" for none.
+TABULAR_KINDS = frozenset(
+    k.strip().lower()
+    for k in os.environ.get(
+        "EKS_AGENT_TABULAR_KINDS",
+        "pod,event,deployment,replicaset,statefulset,daemonset,node,service,horizontalpodautoscaler",
+    ).split(",")
+    if k.strip()
+)
 
 
 def _safe_json(obj: Any) -> str:
@@ -23,7 +42,102 @@ def _truncate(text: str, limit: int = MAX_CHARS) -> str:
     return text[:limit] + "\n...<truncated>..."
 
 
-def render_tool_evidence(results: list[dict]) -> str:
+_SCALAR_CELLS = {True: "true", False: "false", None: "null"}
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, str):
+        # Most cells are plain strings; skip the escaping when nothing needs it.
+        if "\\" not in value and "|" not in value and "\n" not in value:
+            return value
+        text = value
+    elif value is None or isinstance(value, bool):
+        return _SCALAR_CELLS[value]
+    elif isinstance(value, int):
+        return str(value)
+    elif isinstance(value, float):
+        return json.dumps(value)
+    else:
+        text = json.dumps(value, separators=(",", ":"), default=str)
+    return text.replace("\\", "\\\\").replace("|", "\\|").replace("\n", "\\n")
+
+
+def _flatten(obj: dict, prefix: str, out: dict):
+    """
+    Leaf values of `obj` by dotted path. List entries are keyed by their
+    name/type when they have one, so columns line up across objects.
+    """
+    for k, v in obj.items():
+        path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            if v:
+                _flatten(v, path, out)
+        elif isinstance(v, list):
+            if not v:
+                continue
+            if all(isinstance(e, dict) for e in v):
+                for i, e in enumerate(v):
+                    _flatten(e, f"{path}[{e.get('name') or e.get('type') or i}]", out)
+            else:
+                out[path] = v
+        elif v is not None:
+            out[path] = v
+
+
+def _render_table(items: list, limit: int = MAX_CHARS, max_rows: int = MAX_TABLE_ROWS) -> Optional[list[str]]:
+    """
+    Table lines for a homogeneous list, or None if it does not fit one.
+    """
+    if not items or not all(isinstance(o, dict) for o in items):
+        return None
+
+    rows = []
+    for o in items[:max_rows]:
+        flat: dict = {}
+        _flatten(o, "", flat)
+        rows.append(flat)
+
+    columns: dict[str, None] = {}
+    for flat in rows:
+        columns.update(dict.fromkeys(flat))
+
+    # Values shared by every row are printed once.
+    first = rows[0]
+    common = {
+        c: first[c] for c in columns
+        if c in first and all(c in r and r[c] == first[c] for r in rows)
+    } if len(rows) > 1 else {}
+    columns = [c for c in columns if c not in common]
+    if len(columns) > MAX_COLUMNS:
+        return None
+
+    lines = []
+    if common:
+        lines.append("  common:")
+        lines.extend(f"    {c}: {_cell(v)}" for c, v in common.items())
+    lines.append("  columns: " + " | ".join(columns))
+    lines.append("  rows:")
+
+    used = sum(len(ln) for ln in lines)
+    shown = 0
+    for flat in rows:
+        row = "    " + " | ".join(["" if (v := flat.get(c)) is None else _cell(v) for c in columns])
+        if used + len(row) > limit and shown:
+            break
+        lines.append(row)
+        used += len(row) + 1
+        shown += 1
+
+    if len(items) > shown:
+        lines.append(f"    ... ({len(items) - shown} more items omitted)")
+    return lines
+
+
+def _tabular(kind: Optional[str], tabular_kinds: frozenset) -> bool:
+    return "*" in tabular_kinds or (kind or "").lower() in tabular_kinds
+
+
+def render_tool_evidence(results: list[dict], tabular_kinds: frozenset = TABULAR_KINDS) -> str:
     """
     Render tool execution results in a stable, LLM-friendly format.
 
@@ -33,6 +147,9 @@ def render_tool_evidence(results: list[dict]) -> str:
         "kind": str,
         "namespace": str | None,
         "name": str | None,
+        "cluster": str | None,      (optional; set for multi-cluster reads)
+        "delta_since_seconds": float (optional; output is a delta, see snapshots)
+        "delta_of": str             (optional; evidence id the delta applies to)
         "output": dict | list | scalar
       }
     ]
@@ -46,13 +163,44 @@ def render_tool_evidence(results: list[dict]) -> str:
             lines.append(f"  namespace: {r.get('namespace')}")
         if r.get("name") is not None:
             lines.append(f"  name: {r.get('name')}")
+        if r.get("cluster") is not None:
+            lines.append(f"  cluster: {r.get('cluster')}")
 
         output = r.get("output")
 
+        # -----------------------------
+        # DELTA against the previous round
+        # -----------------------------
+        if r.get("delta_since_seconds") is not None:
+            lines.append("  output_type: delta")
+            if r.get("delta_of"):
+                lines.append(f"  delta_of_evidence: {r['delta_of']}")
+            lines.append(f"  since_previous_read_seconds: {r['delta_since_seconds']}")
+            lines.append(f"  unchanged_objects: {output.get('unchanged', 0)}")
+            for key, changes in output.get("changed", {}).items():
+                lines.append(f"  changed {key}:")
+                for c in changes:
+                    lines.append(f"    {c}")
+            if output.get("changes_omitted"):
+                lines.append(f"  ... ({output['changes_omitted']} more changes omitted)")
+            if output.get("removed"):
+                lines.append(f"  removed: {', '.join(output['removed'])}")
+            if output.get("added"):
+                payload = _truncate(_safe_json(output["added"][:MAX_LIST_ITEMS]))
+                lines.append("  added:")
+                for ln in payload.splitlines():
+                    lines.append(f"    {ln}")
+
         # -----------------------------
         # LIST output (most common)
         # -----------------------------
-        if isinstance(output, list):
+        elif isinstance(output, list) and _tabular(r.get("kind"), tabular_kinds) \
+                and (table := _render_table(output)) is not None:
+            lines.append("  output_type: table")
+            lines.append(f"  item_count: {len(output)}")
+            lines.extend(table)
+
+        elif isinstance(output, list):
             lines.append(f"  output_type: list")
             lines.append(f"  item_count: {len(output)}")
 
@@ -0,0 +1,345 @@
+# eks_agent/tools/rules.py
+#
+# Deterministic evidence evaluator.
+#
+# Derives failure classes and their key signals from sanitized read_object
+# output (Pods, Events / EventSummary, NamespaceDigest, OwnerChain) with
+# lookup tables instead of one pass per rule, so a 5k-pod list is a single
+# walk over its container statuses.
+#
+# The result goes to the Phase 3 prompt as a <pre_analysis> block. When it
+# is unambiguous (one conclusive class, no failed reads) and
+# EKS_AGENT_RULES_SHORT_CIRCUIT=1, the answer is written from it directly
+# without a model call.
+
+import os
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+SHORT_CIRCUIT = os.environ.get("EKS_AGENT_RULES_SHORT_CIRCUIT", "0") == "1"
+
+MAX_EXAMPLES = 5
+MAX_MESSAGE_CHARS = 200
+
+# Most specific first: a container in CrashLoopBackOff whose last exit was
+# OOMKilled is an OOMKilled problem.
+PRECEDENCE = (
+    "OOMKilled",
+    "ImagePullBackOff",
+    "CreateContainerConfigError",
+    "SchedulingFailure",
+    "ProbeFailure",
+    "CrashLoopBackOff",
+)
+_RANK = {c: i for i, c in enumerate(PRECEDENCE)}
+
+# Classes that explain themselves from status alone (only when at least one
+# container's status shows them; events by themselves never conclude).
+CONCLUSIVE = {"OOMKilled", "ImagePullBackOff", "CreateContainerConfigError"}
+
+# (container state, reason) -> failure class
+_CONTAINER_RULES = {
+    ("waiting", "ImagePullBackOff"): "ImagePullBackOff",
+    ("waiting", "ErrImagePull"): "ImagePullBackOff",
+    ("waiting", "InvalidImageName"): "ImagePullBackOff",
+    ("waiting", "CreateContainerConfigError"): "CreateContainerConfigError",
+    ("waiting", "CreateContainerError"): "CreateContainerConfigError",
+    ("waiting", "CrashLoopBackOff"): "CrashLoopBackOff",
+    ("terminated", "OOMKilled"): "OOMKilled",
+    ("lastState", "OOMKilled"): "OOMKilled",
+}
+
+# Warning event reason -> failure class ("BackOff" depends on its message).
+# Node "OOMKilling" events are kernel OOM kills of any process on the node,
+# not a container's OOMKilled status, so they map to no class.
+_EVENT_RULES = {
+    "FailedScheduling": "SchedulingFailure",
+    "Unhealthy": "ProbeFailure",
+    "ErrImagePull": "ImagePullBackOff",
+    "FailedCreatePodContainer": "CreateContainerConfigError",
+}
+
+_NEXT_STEPS = {
+    "OOMKilled": [
+        "Compare the container's memory limit with its real peak usage "
+        "(kubectl top pod, or container_memory_working_set_bytes).",
+        "Raise the memory limit, or reduce the workload's memory use (heap size, caches, batch sizes).",
+        "Verify: restartCount stops increasing and lastState no longer shows OOMKilled.",
+    ],
+    "ImagePullBackOff": [
+        "Check that the image name and tag exist in the registry.",
+        "Check registry credentials (imagePullSecrets) and that the node can reach the registry.",
+        "Verify: the container leaves the waiting state and starts running.",
+    ],
+    "CreateContainerConfigError": [
+        "Check that every ConfigMap, Secret and key referenced by the container exists in the namespace.",
+        "Verify: the container leaves the waiting state and starts running.",
+    ],
+}
+
+
+def _short(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    return text if len(text) <= MAX_MESSAGE_CHARS else text[:MAX_MESSAGE_CHARS] + "..."
+
+
+class _Finding:
+    __slots__ = ("pods", "examples", "exit_codes", "messages", "restarts", "containers", "events")
+
+    def __init__(self):
+        self.pods: set = set()
+        self.examples: list[str] = []
+        self.exit_codes: Counter = Counter()
+        self.messages: Counter = Counter()
+        self.restarts = 0
+        self.containers = 0
+        self.events = 0
+
+    def add_pod(self, ref: str, container: Optional[str]):
+        if ref not in self.pods:
+            self.pods.add(ref)
+            if len(self.examples) < MAX_EXAMPLES:
+                self.examples.append(f"{ref}/{container}" if container else ref)
+
+
+def _pods_of(output: Any) -> Iterable[dict]:
+    if isinstance(output, list):
+        return (o for o in output if isinstance(o, dict) and o.get("kind") == "Pod")
+    if isinstance(output, dict) and output.get("kind") == "Pod":
+        return (output,)
+    if isinstance(output, dict) and output.get("kind") == "OwnerChain" and output.get("subject"):
+        return _pods_of(output["subject"])
+    return ()
+
+
+def _scan_pods(pods: Iterable[dict], findings: dict[str, _Finding]) -> int:
+    n = 0
+    for pod in pods:
+        n += 1
+        status = pod.get("status") or {}
+        ref = (pod.get("metadata") or {}).get("name") or "?"
+
+        for cond in status.get("conditions") or []:
+            if cond.get("type") == "PodScheduled" and cond.get("status") == "False" \
+                    and cond.get("reason") == "Unschedulable":
+                f = findings.setdefault("SchedulingFailure", _Finding())
+                f.add_pod(ref, None)
+                f.messages[_short(cond.get("message"))] += 1
+
+        for cs in (status.get("containerStatuses") or []) + (status.get("initContainerStatuses") or []):
+            state = cs.get("state") or {}
+            last = (cs.get("lastState") or {}).get("terminated") or {}
+            waiting = state.get("waiting") or {}
+            terminated = state.get("terminated") or {}
+
+            # One class per container: the most specific rule that matches.
+            best, detail = None, None
+            for key, info in (
+                (("waiting", waiting.get("reason")), waiting),
+                (("terminated", terminated.get("reason")), terminated),
+                (("lastState", last.get("reason")), last),
+            ):
+                cls = _CONTAINER_RULES.get(key)
+                if cls and (best is None or _RANK[cls] < _RANK[best]):
+                    best, detail = cls, info
+            if best is None:
+                continue
+
+            f = findings.setdefault(best, _Finding())
+            f.containers += 1
+            f.add_pod(ref, cs.get("name"))
+            f.restarts = max(f.restarts, cs.get("restartCount") or 0)
+            code = detail.get("exitCode") if detail.get("exitCode") is not None else last.get("exitCode")
+            if code is not None:
+                f.exit_codes[code] += 1
+            if detail.get("message"):
+                f.messages[_short(detail["message"])] += 1
+    return n
+
+
+def _event_class(reason: Optional[str], message: Optional[str]) -> Optional[str]:
+    if reason == "BackOff":
+        msg = (message or "").lower()
+        if "pulling image" in msg:
+            return "ImagePullBackOff"
+        if "restarting failed container" in msg:
+            return "CrashLoopBackOff"
+        return None
+    return _EVENT_RULES.get(reason)
+
+
+def _scan_events(output: Any, findings: dict[str, _Finding]) -> int:
+    if isinstance(output, dict) and output.get("kind") == "EventSummary":
+        rows = [
+            (g.get("type"), g.get("reason"), g.get("message"), g.get("object"), g.get("count") or 1)
+            for g in output.get("groups") or []
+        ]
+    elif isinstance(output, list):
+        rows = []
+        for e in output:
+            st = (e or {}).get("status") or {}
+            involved = st.get("involvedObject") or {}
+            rows.append((
+                st.get("type"),
+                st.get("reason"),
+                st.get("message"),
+                f"{involved.get('kind')}/{involved.get('name')}",
+                st.get("count") or 1,
+            ))
+    else:
+        return 0
+
+    for typ, reason, message, obj, count in rows:
+        if typ != "Warning":
+            continue
+        cls = _event_class(reason, message)
+        if cls is None:
+            continue
+        f = findings.setdefault(cls, _Finding())
+        f.events += count
+        if obj and obj.startswith("Pod/"):
+            f.add_pod(obj.split("/", 1)[1], None)
+        f.messages[_short(message)] += 1
+    if isinstance(output, dict):
+        return output.get("total_events") or len(rows)
+    return len(rows)
+
+
+def _scan_digest(output: dict, findings: dict[str, _Finding]) -> tuple[int, int]:
+    # The digest already counts reasons per pod; only the top restarting
+    # pods are named.
+    pods = output.get("pods") or {}
+    for state, counts in (("waiting", pods.get("waiting_reasons")), ("lastState", pods.get("last_terminated_reasons"))):
+        for reason, count in (counts or {}).items():
+            cls = _CONTAINER_RULES.get((state, reason))
+            if cls:
+                findings.setdefault(cls, _Finding()).containers += count
+    for s in pods.get("top_restarting") or []:
+        matched = [
+            _CONTAINER_RULES.get(key)
+            for key in (("waiting", s.get("waiting_reason")), ("lastState", s.get("last_terminated_reason")))
+        ]
+        matched = [c for c in matched if c]
+        if matched:
+            f = findings.setdefault(min(matched, key=_RANK.__getitem__), _Finding())
+            f.add_pod(s.get("name") or "?", None)
+            f.restarts = max(f.restarts, s.get("restarts") or 0)
+    for s in pods.get("top_not_ready") or []:
+        if s.get("not_ready_reason") == "Unschedulable":
+            f = findings.setdefault("SchedulingFailure", _Finding())
+            f.add_pod(s.get("name") or "?", None)
+            f.messages[_short(s.get("message"))] += 1
+    events = output.get("events") or {}
+    for r in events.get("top_warning_reasons") or []:
+        cls = _event_class(r.get("reason"), None)
+        if cls:
+            findings.setdefault(cls, _Finding()).events += r.get("count") or 1
+    return pods.get("total") or 0, events.get("total") or 0
+
+
+def evaluate(results: list[dict]) -> Optional[dict]:
+    """
+    Failure classes and key signals derived from evidence entries.
+
+    Returns None when the evidence holds nothing the rules understand.
+    """
+    findings: dict[str, _Finding] = {}
+    pods = events = 0
+    failed_reads = 0
+
+    for r in results:
+        output = r.get("output")
+        kind = (r.get("kind") or "").lower()
+        if isinstance(output, dict) and set(output) == {"error"}:
+            failed_reads += 1
+        elif kind in ("event", "events"):
+            events += _scan_events(output, findings)
+        elif isinstance(output, dict) and output.get("kind") == "NamespaceDigest":
+            n_pods, n_events = _scan_digest(output, findings)
+            pods += n_pods
+            events += n_events
+        else:
+            pods += _scan_pods(_pods_of(output), findings)
+
+    if not pods and not events:
+        return None
+
+    ordered = sorted(findings, key=_RANK.__getitem__)
+    top = ordered[0] if ordered else "Unknown"
+    return {
+        "failure_class": top,
+        "conclusive": top in CONCLUSIVE and failed_reads == 0
+        and findings[top].containers > 0
+        and all(c == top or c == "CrashLoopBackOff" for c in ordered),
+        "pods_examined": pods,
+        "events_examined": events,
+        "failed_reads": failed_reads,
+        "findings": [
+            {
+                "class": cls,
+                "pods": len(findings[cls].pods),
+                "containers": findings[cls].containers or None,
+                "examples": findings[cls].examples,
+                "max_restarts": findings[cls].restarts or None,
+                "exit_codes": dict(findings[cls].exit_codes.most_common(3)) or None,
+                "messages": [m for m, _ in findings[cls].messages.most_common(3) if m] or None,
+                "warning_events": findings[cls].events or None,
+            }
+            for cls in ordered
+        ],
+    }
+
+
+def render_pre_analysis(analysis: Optional[dict]) -> str:
+    if not analysis:
+        return ""
+    lines = [
+        "<pre_analysis>",
+        f"derived_failure_class: {analysis['failure_class']}",
+        f"pods_examined: {analysis['pods_examined']}",
+        f"events_examined: {analysis['events_examined']}",
+    ]
+    for f in analysis["findings"]:
+        lines.append(f"- class: {f['class']}")
+        for key in ("pods", "containers", "examples", "max_restarts", "exit_codes", "messages", "warning_events"):
+            if f.get(key):
+                lines.append(f"  {key}: {f[key]}")
+    lines.append("</pre_analysis>")
+    return "\n".join(lines)
+
+
+def direct_answer(analysis: Optional[dict], enabled: bool = SHORT_CIRCUIT) -> Optional[str]:
+    """
+    A complete answer for unambiguous cases, else None (ask the model).
+    """
+    if not enabled or not analysis or not analysis["conclusive"]:
+        return None
+
+    cls = analysis["failure_class"]
+    f = analysis["findings"][0]
+    if not f["examples"]:
+        return None  # nothing concrete to point the user at
+    findings = [f"- {f['containers'] or f['pods']} container(s) show {cls}, e.g. {', '.join(f['examples'])}"]
+    if f.get("exit_codes"):
+        codes = ", ".join(f"{code} (x{n})" for code, n in f["exit_codes"].items())
+        findings.append(f"- exit codes: {codes}")
+    if f.get("max_restarts"):
+        findings.append(f"- restartCount up to {f['max_restarts']}")
+    for m in f.get("messages") or []:
+        findings.append(f"- status message: {m}")
+    if f.get("warning_events"):
+        findings.append(f"- {f['warning_events']} related Warning event(s)")
+
+    return "\n".join([
+        "Findings (from deterministic checks of the collected status; no model call):",
+        *findings,
+        "",
+        "What to do next:",
+        *(f"- {step}" for step in _NEXT_STEPS[cls]),
+        "",
+        f"Summary: the container status most likely points to {cls} as the cause of the failure.",
+        "",
+        f"Failure class: {cls}",
+        "Evidence status: SUFFICIENT",
+    ])
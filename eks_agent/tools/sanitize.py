@@ -0,0 +1,62 @@
+# eks_agent/tools/sanitize.py
+#
+# Metadata + status sanitizer shared by every path that turns raw
+# Kubernetes JSON into evidence: API reads (k8s_reader, owners) and
+# kubectl output pasted in manual mode (paste).
+
+
+def safe_meta(meta: dict | None) -> dict:
+    meta = meta or {}
+    return {
+        "name": meta.get("name"),
+        "namespace": meta.get("namespace"),
+        "labels": meta.get("labels"),
+        "resourceVersion": meta.get("resourceVersion"),
+    }
+
+
+def event_status(obj: dict) -> dict:
+    # Events have no status; their observation fields play that role.
+    # events.k8s.io/v1 renames most of them, so accept both shapes.
+    involved = obj.get("involvedObject") or obj.get("regarding") or {}
+    series = obj.get("series") or {}
+    return {
+        "type": obj.get("type"),
+        "reason": obj.get("reason"),
+        "message": obj.get("message") or obj.get("note"),
+        "count": obj.get("count") or obj.get("deprecatedCount"),
+        "involvedObject": {
+            "kind": involved.get("kind"),
+            "name": involved.get("name"),
+        },
+        "firstTimestamp": obj.get("firstTimestamp") or obj.get("deprecatedFirstTimestamp"),
+        "lastTimestamp": obj.get("lastTimestamp") or obj.get("deprecatedLastTimestamp"),
+        "eventTime": obj.get("eventTime"),
+        "series": {
+            "count": series.get("count"),
+            "lastObservedTime": series.get("lastObservedTime"),
+        } if series else None,
+    }
+
+
+def summarize(obj: dict, kind: str) -> dict:
+    """
+    Generic sanitizer for any Kubernetes object (raw API JSON).
+
+    STRICT RULE:
+    - metadata (safe)
+    - status only (NO spec, NO data)
+    - Events: their observation fields stand in for status
+    """
+    kind = obj.get("kind") or kind
+    return {
+        "kind": kind,
+        "metadata": safe_meta(obj.get("metadata")),
+        "status": event_status(obj) if kind == "Event" else obj.get("status"),
+    }
+
+
+def list_items(body: dict, kind: str) -> list[dict]:
+    # List items carry no kind of their own; derive it from "<Kind>List".
+    item_kind = (body.get("kind") or "").removesuffix("List") or kind
+    return [summarize(o, item_kind) for o in body.get("items", [])]
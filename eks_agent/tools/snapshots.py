@@ -0,0 +1,192 @@
+# eks_agent/tools/snapshots.py
+#
+# Per-session evidence snapshots and deltas across tool rounds.
+#
+# Every executed read is remembered by tool_signature. When the same read
+# runs again (allowed once its snapshot is older than REREAD_AFTER_SECONDS),
+# only what changed since the previous round is sent to the model:
+#
+#   changed:  {"Pod/api-1": ["status.containerStatuses[app].restartCount: 4 → 7"]}
+#   added / removed / unchanged object names
+#
+# Objects whose resourceVersion did not move are skipped without diffing.
+#
+# A delta is only useful while the evidence it builds on is still in the
+# conversation: each snapshot remembers the evidence rounds (ids of the
+# rendered <tool_evidence> blocks) it was built from, and once any of them
+# has left the history the full entries are sent again.
+
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+REREAD_AFTER_SECONDS = float(os.environ.get("EKS_AGENT_REREAD_AFTER", "30"))
+MAX_SNAPSHOTS_PER_SESSION = 50
+MAX_CHANGES = 60
+MAX_VALUE_CHARS = 120
+
+_SNAPSHOTS: dict[str, dict[str, dict]] = {}
+_LOCK = threading.Lock()
+
+
+def is_stale(session_id: str, sig: str, max_age: float = REREAD_AFTER_SECONDS) -> bool:
+    """
+    True if `sig` was read long enough ago that re-reading it is worthwhile.
+    """
+    with _LOCK:
+        snap = _SNAPSHOTS.get(session_id, {}).get(sig)
+    return snap is not None and time.monotonic() - snap["at"] >= max_age
+
+
+def previous(session_id: str, sig: str) -> Optional[dict]:
+    with _LOCK:
+        return _SNAPSHOTS.get(session_id, {}).get(sig)
+
+
+def forget_session(session_id: str):
+    with _LOCK:
+        _SNAPSHOTS.pop(session_id, None)
+
+
+def record(session_id: str, sig: str, entries: list[dict], rounds: tuple = ()):
+    with _LOCK:
+        snaps = _SNAPSHOTS.setdefault(session_id, {})
+        snaps.pop(sig, None)
+        if len(snaps) >= MAX_SNAPSHOTS_PER_SESSION:
+            snaps.pop(next(iter(snaps)))
+        snaps[sig] = {"at": time.monotonic(), "entries": entries, "rounds": rounds}
+
+
+# --------------------------------------------------
+# Diffing
+# --------------------------------------------------
+
+def _item_key(item: Any, index: int) -> str:
+    if isinstance(item, dict):
+        meta = item.get("metadata") or {}
+        if meta.get("name"):
+            return f"{item.get('kind') or ''}/{meta['name']}".lstrip("/")
+        for field in ("name", "object", "type"):
+            if item.get(field):
+                suffix = f":{item['reason']}" if field == "object" and item.get("reason") else ""
+                return f"{item[field]}{suffix}"
+    return str(index)
+
+
+def _objects(output: Any) -> dict[str, Any]:
+    if isinstance(output, list):
+        return {_item_key(o, i): o for i, o in enumerate(output)}
+    if isinstance(output, dict) and output.get("metadata"):
+        return {_item_key(output, 0): output}
+    return {"output": output}
+
+
+def _flatten(value: Any, prefix: str = "", out: Optional[dict] = None) -> dict[str, Any]:
+    out = {} if out is None else out
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(v, f"{prefix}.{k}" if prefix else str(k), out)
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            _flatten(v, f"{prefix}[{_item_key(v, i)}]", out)
+    else:
+        out[prefix] = value
+    return out
+
+
+def _short(value: Any) -> str:
+    text = "∅" if value is None else str(value)
+    return text if len(text) <= MAX_VALUE_CHARS else text[:MAX_VALUE_CHARS] + "..."
+
+
+def _changes(old: Any, new: Any) -> list[str]:
+    a, b = _flatten(old), _flatten(new)
+    lines = []
+    for path in sorted(a.keys() | b.keys()):
+        if path.endswith("metadata.resourceVersion"):
+            continue
+        if a.get(path) != b.get(path):
+            lines.append(f"{path}: {_short(a.get(path))} → {_short(b.get(path))}")
+    return lines
+
+
+def _rv(obj: Any) -> Optional[str]:
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get("resourceVersion")
+    return None
+
+
+def diff_output(old: Any, new: Any) -> dict:
+    """
+    Delta between two sanitized outputs of the same read.
+    """
+    before, after = _objects(old), _objects(new)
+    changed: dict[str, list[str]] = {}
+    unchanged = []
+    budget = MAX_CHANGES
+    omitted = 0
+
+    for key, obj in after.items():
+        if key not in before:
+            continue
+        prev = before[key]
+        if _rv(obj) is not None and _rv(obj) == _rv(prev):
+            unchanged.append(key)
+            continue
+        lines = _changes(prev, obj)
+        if not lines:
+            unchanged.append(key)
+            continue
+        take = lines[:max(0, budget)]
+        omitted += len(lines) - len(take)
+        budget -= len(take)
+        if take:
+            changed[key] = take
+
+    delta = {
+        "changed": changed,
+        "added": [after[k] for k in after if k not in before],
+        "removed": [k for k in before if k not in after],
+        "unchanged": len(unchanged),
+    }
+    if omitted:
+        delta["changes_omitted"] = omitted
+    return delta
+
+
+def _is_error(output: Any) -> bool:
+    return isinstance(output, dict) and set(output) == {"error"}
+
+
+def apply_deltas(
+    session_id: str,
+    sig: str,
+    entries: list[dict],
+    round_id: Optional[str] = None,
+    in_context: Callable[[str], bool] = lambda round_id: True,
+) -> list[dict]:
+    """
+    Record `entries` as the latest snapshot for `sig` and return what should
+    be rendered: deltas against the previous round where one exists (same
+    cluster) and every round it builds on is still `in_context`, the full
+    entries otherwise. `round_id` names the evidence being rendered now.
+    """
+    prev = previous(session_id, sig)
+    here = (round_id,) if round_id else ()
+    if prev is None or not all(in_context(r) for r in prev["rounds"]):
+        record(session_id, sig, entries, here)
+        return entries
+    record(session_id, sig, entries, prev["rounds"] + here)
+
+    age = round(time.monotonic() - prev["at"], 1)
+    base = {"delta_of": prev["rounds"][-1]} if prev["rounds"] else {}
+    by_cluster = {e.get("cluster"): e for e in prev["entries"]}
+    out = []
+    for e in entries:
+        old = by_cluster.get(e.get("cluster"))
+        if old is None or _is_error(old.get("output")) or _is_error(e.get("output")):
+            out.append(e)
+            continue
+        out.append(dict(e, **base, delta_since_seconds=age, output=diff_output(old["output"], e["output"])))
+    return out
@@ -0,0 +1,234 @@
+# eks_agent/triage.py
+#
+# Alert-driven triage: Alertmanager webhook -> bounded job queue -> workers.
+#
+# Each firing alert becomes a triage job that runs the normal Phase 2 flow
+# (draft, RAG, answer) in its own session. Nothing is collected from the
+# cluster without a human: if the model proposes reads, the job finishes
+# with the proposed kubectl commands and its session_id, and an engineer
+# continues from there through /ask.
+#
+# A job's session lives only as long as someone can continue it: it is
+# released when the job ends with an answer or an error, and otherwise
+# (proposed reads waiting for an engineer) when the job record is evicted.
+#
+# Alert storms are absorbed in two ways:
+#   - dedup: alerts with the same (namespace, alertname) join the job that
+#     is queued, running, or finished within DEDUP_SECONDS
+#   - backpressure: when QUEUE_SIZE jobs are waiting, new alerts are
+#     rejected and the webhook answers 429 so Alertmanager retries later
+
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from eks_agent import metrics
+
+WORKERS = int(os.environ.get("EKS_AGENT_TRIAGE_WORKERS", "4"))
+QUEUE_SIZE = int(os.environ.get("EKS_AGENT_TRIAGE_QUEUE", "100"))
+DEDUP_SECONDS = float(os.environ.get("EKS_AGENT_TRIAGE_DEDUP_SECONDS", "300"))
+MAX_JOBS = 1000
+MAX_FINGERPRINTS = 50
+
+# Labels worth passing to the model; everything else stays out of the prompt.
+_SCOPE_LABELS = ("pod", "container", "deployment", "statefulset", "daemonset", "job_name", "node", "cluster")
+
+
+def dedup_key(alert: dict) -> tuple[str, str]:
+    labels = alert.get("labels") or {}
+    return labels.get("namespace") or "", labels.get("alertname") or "unknown"
+
+
+def alert_question(alert: dict) -> str:
+    """
+    Phase 2 question for one alert.
+    """
+    labels = alert.get("labels") or {}
+    annotations = alert.get("annotations") or {}
+
+    lines = [f"Alert {labels.get('alertname', 'unknown')} is firing"]
+    if labels.get("namespace"):
+        lines[0] += f" in namespace {labels['namespace']} "
+    if labels.get("severity"):
+        lines.append(f"severity: {labels['severity']}")
+    for key in _SCOPE_LABELS:
+        if labels.get(key):
+            lines.append(f"{key}: {labels[key]}")
+    for key in ("summary", "description"):
+        if annotations.get(key):
+            lines.append(f"{key}: {annotations[key]}")
+    if alert.get("startsAt"):
+        lines.append(f"since: {alert['startsAt']}")
+    return "\n".join(lines)
+
+
+class TriageQueue:
+    def __init__(
+        self,
+        handler: Callable[[dict], dict],
+        release: Optional[Callable[[str], None]] = None,
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        dedup_seconds: float = DEDUP_SECONDS,
+    ):
+        self.handler = handler
+        self.release = release
+        self.workers = workers
+        self.dedup_seconds = dedup_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._jobs: dict[str, dict] = {}
+        self._by_key: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+
+    def submit(self, alert: dict) -> Optional[dict]:
+        """
+        Enqueue (or dedup) one firing alert.
+
+        Returns {"job_id", "duplicate"}, or None if the queue is full.
+        """
+        self._start()
+        key = dedup_key(alert)
+        fingerprint = alert.get("fingerprint")
+
+        with self._lock:
+            job = self._jobs.get(self._by_key.get(key, ""))
+            if job and self._joinable(job):
+                job["duplicates"] += 1
+                if fingerprint and len(job["fingerprints"]) < MAX_FINGERPRINTS \
+                        and fingerprint not in job["fingerprints"]:
+                    job["fingerprints"].append(fingerprint)
+                metrics.TRIAGE_ALERTS.inc(outcome="deduplicated")
+                return {"job_id": job["id"], "duplicate": True}
+
+            job = {
+                "id": str(uuid.uuid4()),
+                "status": "queued",
+                "namespace": key[0] or None,
+                "alertname": key[1],
+                "fingerprints": [fingerprint] if fingerprint else [],
+                "duplicates": 0,
+                "created": time.time(),
+                "finished": None,
+                "session_id": None,
+                "result": None,
+                "error": None,
+                "_question": alert_question(alert),
+                "_released": False,
+            }
+            try:
+                self._queue.put_nowait(job["id"])
+            except queue.Full:
+                metrics.TRIAGE_ALERTS.inc(outcome="rejected")
+                return None
+
+            self._jobs[job["id"]] = job
+            self._by_key[key] = job["id"]
+            evicted = self._evict()
+
+        # Outside the queue lock: releasing waits for the session's lock.
+        for session_id in evicted:
+            self._release(session_id)
+        metrics.TRIAGE_ALERTS.inc(outcome="enqueued")
+        return {"job_id": job["id"], "duplicate": False}
+
+    def _joinable(self, job: dict) -> bool:
+        if job["status"] in ("queued", "running"):
+            return True
+        return job["finished"] is not None and time.time() - job["finished"] < self.dedup_seconds
+
+    def _evict(self) -> list[str]:
+        """
+        Drop the oldest finished jobs over MAX_JOBS (queued/running ones are
+        never dropped); returns the sessions still held by dropped jobs.
+        """
+        sessions: list[str] = []
+        if len(self._jobs) <= MAX_JOBS:
+            return sessions
+        for job_id in [j for j, job in self._jobs.items() if job["finished"]]:
+            if len(self._jobs) <= MAX_JOBS:
+                break
+            job = self._jobs.pop(job_id)
+            if self._by_key.get((job["namespace"] or "", job["alertname"])) == job_id:
+                self._by_key.pop((job["namespace"] or "", job["alertname"]), None)
+            if job["session_id"] and not job["_released"]:
+                sessions.append(job["session_id"])
+        return sessions
+
+    def _release(self, session_id: str):
+        if self.release is None:
+            return
+        try:
+            self.release(session_id)
+        except Exception:
+            pass  # cleanup must never fail the webhook or a worker
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    # -----------------------------
+    # Workers
+    # -----------------------------
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"eks-agent-triage-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["status"] = "running"
+            job["session_id"] = f"triage-{job_id}"
+            question = job["_question"]
+            queued_for = time.time() - job["created"]
+        metrics.STAGE_SECONDS.observe(queued_for, stage="triage_queue")
+
+        try:
+            with metrics.span("triage", alertname=job["alertname"]):
+                resp = self.handler({"session_id": job["session_id"], "question": question})
+            status, result, error = "done", resp, None
+        except Exception as e:
+            status, result, error = "failed", None, f"{type(e).__name__}: {e}"
+
+        # Proposed reads keep the session for an engineer to continue.
+        keep = status == "done" and (result or {}).get("mode") == "permission"
+        with self._lock:
+            job.update(status=status, result=result, error=error, finished=time.time(), _released=not keep)
+        if not keep:
+            self._release(job["session_id"])
+        metrics.TRIAGE_JOBS.inc(status=status)
+
+    def join(self):
+        """
+        Block until every queued job has finished (tests, benchmarks).
+        """
+        self._queue.join()
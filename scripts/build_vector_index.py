@@ -2,7 +2,8 @@
 
 import json
 import argparse
-from eks_agent.rag.embeddings import BedrockEmbeddingProvider
+from eks_agent.rag.embeddings import BedrockEmbeddingProvider, index_spec, save_embedder
+from eks_agent.rag.local_embeddings import DEFAULT_DIM, LocalEmbeddingProvider
 from eks_agent.rag.vector_store import VectorStore
 
 
@@ -10,15 +11,41 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--docs", required=True)
     parser.add_argument("--db", required=True)
-    parser.add_argument("--model-id", required=True)
+    parser.add_argument(
+        "--provider",
+        choices=("bedrock", "local"),
+        default="bedrock",
+        help="bedrock: Titan via Bedrock; local: TF-IDF + SVD fitted on --docs, no network",
+    )
+    parser.add_argument("--model-id", help="Bedrock embedding model (--provider bedrock)")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="embedding size (--provider local)")
+    parser.add_argument(
+        "--quantize",
+        choices=("none", "int8", "pq"),
+        default="none",
+        help="in-memory codes for approximate search with exact re-ranking",
+    )
     args = parser.parse_args()
 
+    if args.provider == "bedrock" and not args.model_id:
+        parser.error("--model-id is required with --provider bedrock")
+
     with open(args.docs) as f:
         docs = json.load(f)
 
-    embedder = BedrockEmbeddingProvider(model_id=args.model_id)
+    if args.provider == "local":
+        embedder = LocalEmbeddingProvider.fit([d["text"] for d in docs], dim=args.dim)
+    else:
+        embedder = BedrockEmbeddingProvider(model_id=args.model_id)
     store = VectorStore(args.db)
 
+    # Vectors from another provider (or another fit) are not comparable.
+    if index_spec(store) != embedder.spec():
+        store.clear()
+    save_embedder(store, embedder)
+    # Codes are re-trained on the new vectors below.
+    store.dequantize()
+
     for d in docs:
         vec = embedder.embed_text(d["text"])
         store.upsert(
@@ -29,8 +56,11 @@ def main():
             meta=d.get("meta", {}),
         )
 
-    print(f"Indexed {len(docs)} documents")
+    if args.quantize != "none" and docs:
+        store.quantize(args.quantize)
+
+    print(f"Indexed {len(docs)} documents ({args.provider}, dim {len(vec) if docs else 0}, quantize {args.quantize})")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,37 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_SPEC = importlib.util.spec_from_file_location("eks_agent_cli", Path(__file__).parents[1] / "cli" / "eks_agent.py")
+cli = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(cli)
+
+
+class FakeHttp:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    def post(payload, http=None, url=cli.SERVER_URL):
+        return {"mode": "answer", "text": f"answer to {payload['question']}\nFailure class: Unknown"}
+
+    monkeypatch.setattr(cli, "post", post)
+    monkeypatch.setattr(cli, "open_http_session", lambda pool_size: FakeHttp())
+
+
+def test_malformed_line_is_reported_and_the_batch_goes_on(server, tmp_path):
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"question": "first"}\n{"question": "oops"\nthird\n')
+    out = tmp_path / "out.jsonl"
+
+    assert cli.run_batch([str(src), "--out", str(out)]) == 1
+
+    results = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["status"] for r in results] == ["answered", "error", "answered"]
+    assert results[1]["line"] == 2
+    assert "invalid JSON on line 2" in results[1]["error"]
+    assert results[2]["text"].startswith("answer to third")
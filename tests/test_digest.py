@@ -0,0 +1,56 @@
+from eks_agent.tools.digest import build_digest
+
+
+def _pod(name, phase, conditions=(), containers=(), **status):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": name},
+        "status": dict(phase=phase, conditions=list(conditions), containerStatuses=list(containers), **status),
+    }
+
+
+UNSCHEDULABLE = _pod("api-2", "Pending", [{
+    "type": "PodScheduled", "status": "False", "reason": "Unschedulable",
+    "message": "0/3 nodes are available: 3 Insufficient memory.",
+}])
+RUNNING = _pod(
+    "api-1", "Running",
+    [{"type": "Ready", "status": "True"}],
+    [{"name": "app", "ready": True, "restartCount": 0}],
+)
+
+
+def test_pending_pod_without_container_statuses_is_not_ready():
+    pods = build_digest("shop", {"Pod": [RUNNING, UNSCHEDULABLE]})["pods"]
+    assert pods["not_ready"] == 1
+    assert pods["not_ready_reasons"] == {"Unschedulable": 1}
+    assert pods["top_not_ready"] == [{
+        "name": "api-2",
+        "phase": "Pending",
+        "not_ready_reason": "Unschedulable",
+        "message": "0/3 nodes are available: 3 Insufficient memory.",
+    }]
+
+
+def test_ready_condition_wins_over_container_flags():
+    pod = _pod(
+        "api-3", "Running",
+        [{"type": "Ready", "status": "False", "reason": "ReadinessGatesNotReady"}],
+        [{"name": "app", "ready": True, "restartCount": 0}],
+    )
+    pods = build_digest("shop", {"Pod": [pod]})["pods"]
+    assert pods["not_ready"] == 1
+    assert pods["not_ready_reasons"] == {"ReadinessGatesNotReady": 1}
+
+
+def test_completed_and_evicted_pods():
+    done = _pod("job-1", "Succeeded", [{"type": "Ready", "status": "False", "reason": "PodCompleted"}])
+    evicted = _pod("api-4", "Failed", reason="Evicted", message="The node was low on resource: memory.")
+    pods = build_digest("shop", {"Pod": [done, evicted]})["pods"]
+    assert pods["not_ready"] == 1
+    assert pods["not_ready_reasons"] == {"Evicted": 1}
+
+
+def test_no_conditions_falls_back_to_phase():
+    pods = build_digest("shop", {"Pod": [_pod("api-5", "Pending")]})["pods"]
+    assert pods["not_ready"] == 1
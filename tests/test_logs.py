@@ -0,0 +1,127 @@
+import string
+
+import pytest
+
+from eks_agent.tools import logs
+from eks_agent.tools.logs import clamp_options, read_pod_log, reduce_log_stream
+
+
+def _stream(text: str, chunk: int = 7):
+    data = text.encode()
+    return (data[i:i + chunk] for i in range(0, len(data), chunk))
+
+
+def _word(i: int) -> str:
+    # Distinct after number masking (digits would all become "#").
+    out = ""
+    while True:
+        i, r = divmod(i, 26)
+        out += string.ascii_lowercase[r]
+        if not i:
+            return out
+
+
+def test_options_are_clamped_to_server_bounds():
+    assert clamp_options() == {"tail_lines": logs.DEFAULT_TAIL_LINES, "limit_bytes": logs.MAX_LIMIT_BYTES}
+    assert clamp_options(tail_lines=100000)["tail_lines"] == logs.MAX_TAIL_LINES
+    assert clamp_options(tail_lines=-5)["tail_lines"] == 1
+    assert clamp_options(since_seconds=10 ** 9)["since_seconds"] == logs.MAX_SINCE_SECONDS
+
+
+def test_lines_split_across_chunks_and_overlong_lines_are_cut():
+    long_line = "x" * (logs.MAX_LINE_CHARS * 10)
+    out = reduce_log_stream(_stream(f"first line\r\n{long_line}\nlast", chunk=3))
+    assert out["lines"] == 3
+    assert out["tail"] == ["first line", "x" * logs.MAX_LINE_CHARS, "last"]
+
+
+def test_lines_differing_only_in_numbers_and_ids_are_counted_once():
+    text = "".join(
+        f"2024-05-01T10:00:{i % 60:02d}Z GET /api/items/{i} took {i * 3}ms req=0x{i:08x}\n"
+        for i in range(300)
+    )
+    out = reduce_log_stream(_stream(text, chunk=64))
+    assert out["lines"] == 300
+    assert out["distinct_lines"] == 1
+    assert out["most_repeated"][0]["count"] == 300
+    assert len(out["tail"]) == 1
+    assert out["tail"][0].endswith("(x300)")
+
+
+def test_errors_survive_a_noisy_tail():
+    text = "panic: runtime error: invalid memory address\n" + "".join(
+        f"debug heartbeat {_word(i)}\n" for i in range(logs.KEEP_LAST_LINES * 10)
+    )
+    out = reduce_log_stream(_stream(text, chunk=1024))
+    assert out["error_lines"] == ["panic: runtime error: invalid memory address"]
+    assert len(out["tail"]) == logs.KEEP_LAST_LINES
+    assert all("panic" not in line for line in out["tail"])
+
+
+def test_each_error_shape_is_kept_once():
+    text = "".join(f"connection refused to 10.0.0.{i}:5432\n" for i in range(50))
+    out = reduce_log_stream(_stream(text, chunk=256))
+    assert out["error_lines"] == ["connection refused to 10.0.0.0:5432"]
+
+
+def test_error_lines_keep_the_most_recent_shapes():
+    text = "".join(f"error: job {_word(i)} failed\n" for i in range(100))
+    out = reduce_log_stream(_stream(text, chunk=256))
+    assert len(out["error_lines"]) == logs.MAX_ERROR_LINES
+    assert out["error_lines"][-1] == f"error: job {_word(99)} failed"
+
+
+def test_pattern_table_stays_bounded():
+    text = "".join(f"line {_word(i)}\n" for i in range(logs.MAX_PATTERNS * 3))
+    out = reduce_log_stream(_stream(text, chunk=4096))
+    assert out["distinct_lines"] == logs.MAX_PATTERNS * 3
+    assert out["most_repeated"] == []
+
+
+class FakeResponse:
+    def __init__(self, text, fail=False):
+        self.text = text
+        self.fail = fail
+        self.released = False
+
+    def stream(self, chunk_bytes):
+        yield self.text.encode()
+        if self.fail:
+            raise ConnectionError("stream reset")
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeCore:
+    def __init__(self, resp):
+        self.resp = resp
+        self.kwargs = None
+
+    def read_namespaced_pod_log(self, name, namespace, **kwargs):
+        self.kwargs = kwargs
+        return self.resp
+
+
+def test_read_pod_log_streams_with_clamped_bounds():
+    core = FakeCore(FakeResponse("OOM killed\n"))
+    out = read_pod_log(core, "shop", "api-1", container="app", previous=True, tail_lines=10 ** 6)
+    assert core.kwargs["_preload_content"] is False
+    assert core.kwargs["tail_lines"] == logs.MAX_TAIL_LINES
+    assert core.kwargs["limit_bytes"] == logs.MAX_LIMIT_BYTES
+    assert core.kwargs["previous"] is True
+    assert core.kwargs["container"] == "app"
+    assert out["error_lines"] == ["OOM killed"]
+    assert core.resp.released
+
+
+def test_read_pod_log_releases_the_connection_on_errors():
+    core = FakeCore(FakeResponse("partial\n", fail=True))
+    with pytest.raises(ConnectionError):
+        read_pod_log(core, "shop", "api-1")
+    assert core.resp.released
+
+
+def test_read_pod_log_requires_namespace_and_name():
+    with pytest.raises(ValueError):
+        read_pod_log(FakeCore(None), "shop", None)
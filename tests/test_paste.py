@@ -0,0 +1,97 @@
+from eks_agent.tools.paste import PASTE_KIND, parse_pasted
+
+
+def test_structured_log_line_stays_text():
+    text = '{"level":"error","msg":"java.lang.OutOfMemoryError: Java heap space"}\nwhy does my pod die?'
+    entries, prose, _ = parse_pasted(text)
+    assert entries == []
+    assert prose == text
+
+
+def test_upper_case_prose_is_not_a_table():
+    text = "WHY IS  MY POD  FAILING\nit keeps restarting"
+    entries, prose, _ = parse_pasted(text)
+    assert entries == []
+    assert prose == text
+
+
+def test_name_table_without_command():
+    text = (
+        "NAME    READY   STATUS             RESTARTS   AGE\n"
+        "api-1   0/1     CrashLoopBackOff   5          3m\n"
+    )
+    entries, _, _ = parse_pasted(text)
+    assert entries[0]["kind"] == PASTE_KIND
+    assert entries[0]["output"] == [
+        {"name": "api-1", "ready": "0/1", "status": "CrashLoopBackOff", "restarts": "5", "age": "3m"},
+    ]
+
+
+def test_table_after_echoed_command():
+    text = (
+        "$ kubectl get events -n shop\n"
+        "LAST SEEN   TYPE      REASON    OBJECT      MESSAGE\n"
+        "2m          Warning   BackOff   pod/api-1   Back-off restarting failed container\n"
+    )
+    entries, _, _ = parse_pasted(text)
+    assert entries[0]["kind"] == "Event"
+    assert entries[0]["namespace"] == "shop"
+    assert entries[0]["output"][0]["message"] == "Back-off restarting failed container"
+
+
+def test_json_object_drops_spec():
+    text = """{
+    "apiVersion": "v1",
+    "kind": "Pod",
+    "metadata": {"name": "api-1", "namespace": "shop"},
+    "spec": {
+        "containers": [{"name": "app", "env": [{"name": "TOKEN", "value": "s3cr3t"}]}]
+    },
+    "status": {"phase": "Running"}
+}"""
+    entries, prose, _ = parse_pasted(text)
+    assert prose == ""
+    assert entries[0]["output"]["status"] == {"phase": "Running"}
+    assert "s3cr3t" not in repr(entries)
+
+
+def test_yaml_list_drops_forbidden_and_kindless_items():
+    text = """apiVersion: v1
+kind: List
+items:
+- apiVersion: v1
+  kind: Secret
+  metadata:
+    name: creds
+- metadata:
+    name: mystery
+- apiVersion: v1
+  kind: Pod
+  metadata:
+    name: api-1
+  status:
+    phase: Pending
+"""
+    entries, _, _ = parse_pasted(text)
+    assert [o["metadata"]["name"] for o in entries[0]["output"]] == ["api-1"]
+
+
+def test_unparsable_kubectl_json_is_omitted():
+    text = '{\n  "apiVersion": "v1",\n  "kind": "Pod",\n  "spec": {\n    "containers": [\n'
+    entries, prose, recognized = parse_pasted(text)
+    assert entries == []
+    assert prose == "<omitted: unparsed JSON>"
+    assert recognized
+
+
+def test_forbidden_kind_leaves_only_a_marker():
+    text = "apiVersion: v1\nkind: Secret\nmetadata:\n  name: creds\ndata:\n  password: c3VwZXJzZWNyZXQ=\n"
+    entries, prose, recognized = parse_pasted(text)
+    assert entries == []
+    assert prose == "<omitted: Secret>"
+    assert recognized
+
+
+def test_plain_text_is_not_recognized():
+    entries, prose, recognized = parse_pasted("why is my pod pending?")
+    assert (entries, prose, recognized) == ([], "why is my pod pending?", False)
@@ -0,0 +1,35 @@
+import uuid
+from concurrent.futures import Future
+
+from eks_agent.tools import prefetch
+from eks_agent.tools.model import ToolCall
+from eks_agent.tools.ratelimit import Throttled
+
+
+def _sig(call):
+    return f"{call.kind}:{call.namespace}"
+
+
+def test_expired_buffers_of_abandoned_sessions_are_swept():
+    abandoned, active = str(uuid.uuid4()), str(uuid.uuid4())
+    prefetch.start(abandoned, [ToolCall(kind="Pod", namespace="shop")], _sig, lambda call: [])
+    prefetch._BUFFER[abandoned]["expires"] = 0  # the user never came back
+
+    prefetch.start(active, [ToolCall(kind="Pod", namespace="shop")], _sig, lambda call: [])
+    assert abandoned not in prefetch._BUFFER
+    assert active in prefetch._BUFFER
+
+    prefetch._BUFFER[active]["expires"] = 0
+    prefetch.discard(str(uuid.uuid4()))
+    assert active not in prefetch._BUFFER
+
+
+def test_failed_or_cancelled_prefetch_has_no_result():
+    failed, cancelled, done = Future(), Future(), Future()
+    failed.set_exception(Throttled("background budget exhausted"))
+    cancelled.cancel()
+    done.set_result(["pod"])
+    assert prefetch.result(failed) is None
+    assert prefetch.result(cancelled) is None
+    assert prefetch.result(None) is None
+    assert prefetch.result(done) == ["pod"]
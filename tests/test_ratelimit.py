@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from eks_agent.tools import ratelimit
+from eks_agent.tools.ratelimit import BACKGROUND, INTERACTIVE, Throttled, TokenBucket
+
+
+class ApiError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers or {}
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_BUCKETS", {})
+
+
+def test_burst_then_rate():
+    b = TokenBucket(rate=50, burst=3)
+    deadline = time.monotonic() + 5
+    assert [b.acquire(deadline) for _ in range(3)] == pytest.approx([0, 0, 0], abs=0.005)
+    queued = b.acquire(deadline)
+    assert 0.01 <= queued < 0.2  # one token every 20 ms
+
+
+def test_queue_deadline_raises_throttled():
+    b = TokenBucket(rate=0.1, burst=1)
+    b.acquire(time.monotonic() + 1)
+    with pytest.raises(Throttled):
+        b.acquire(time.monotonic() + 0.05)
+
+
+def test_zero_rate_disables_the_budget():
+    b = TokenBucket(rate=0, burst=1)
+    deadline = time.monotonic() + 0.01
+    for _ in range(100):
+        b.acquire(deadline)
+
+
+def test_interactive_reads_go_before_background_ones():
+    b = TokenBucket(rate=20, burst=1)
+    b.acquire(time.monotonic() + 1)  # empty the bucket
+    order = []
+
+    def take(priority):
+        b.acquire(time.monotonic() + 5, priority)
+        order.append(priority)
+
+    bg = threading.Thread(target=take, args=(BACKGROUND,))
+    bg.start()
+    time.sleep(0.01)
+    fg = threading.Thread(target=take, args=(INTERACTIVE,))
+    fg.start()
+    bg.join()
+    fg.join()
+    assert order == [INTERACTIVE, BACKGROUND]
+
+
+def test_429_pauses_the_bucket_for_retry_after_and_retries():
+    attempts = []
+
+    def read():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise ApiError(429, {"Retry-After": "0.2"})
+        return {"items": []}
+
+    assert ratelimit.limited("c1", "get", read, timeout=5) == {"items": []}
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.19
+
+    # The pause applies to the whole bucket, not just the failed read.
+    b = ratelimit.bucket("c1", "get")
+    b.pause(0.2)
+    assert b.acquire(time.monotonic() + 5) >= 0.19
+
+
+def test_429_past_the_deadline_is_raised():
+    def read():
+        raise ApiError(429, {"Retry-After": "10"})
+
+    with pytest.raises(ApiError):
+        ratelimit.limited("c2", "list", read, timeout=1)
+
+
+def test_retries_stop_after_max_retries(monkeypatch):
+    monkeypatch.setattr(ratelimit, "MAX_RETRIES", 2)
+    attempts = []
+
+    def read():
+        attempts.append(1)
+        raise ApiError(429, {"Retry-After": "0"})
+
+    with pytest.raises(ApiError):
+        ratelimit.limited("c3", "get", read, timeout=5)
+    assert len(attempts) == 3
+
+
+def test_other_errors_are_not_retried():
+    attempts = []
+
+    def read():
+        attempts.append(1)
+        raise ApiError(500)
+
+    with pytest.raises(ApiError):
+        ratelimit.limited("c4", "get", read)
+    assert len(attempts) == 1
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Retry-After": "3"}, 3.0),
+    ({"Retry-After": "soon"}, ratelimit.DEFAULT_RETRY_AFTER),
+    ({}, ratelimit.DEFAULT_RETRY_AFTER),
+    ({"Retry-After": "3600"}, ratelimit.MAX_RETRY_AFTER),
+])
+def test_retry_after_parsing(headers, expected):
+    assert ratelimit._retry_after(ApiError(429, headers)) == expected
+
+
+def test_buckets_are_per_cluster_and_verb():
+    assert ratelimit.bucket("a", "get") is ratelimit.bucket("a", "get")
+    assert ratelimit.bucket("a", "get") is not ratelimit.bucket("a", "list")
+    assert ratelimit.bucket("a", "list") is not ratelimit.bucket("b", "list")
+    assert ratelimit.bucket("a", "list").rate == ratelimit.LIST_QPS
@@ -0,0 +1,50 @@
+from eks_agent.tools.rules import direct_answer, evaluate
+
+
+def _pod(name, **container_status):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": name},
+        "status": {"containerStatuses": [dict(name="app", restartCount=3, **container_status)]},
+    }
+
+
+def _warning(reason, message, obj="Node/ip-10-0-1-1"):
+    kind, name = obj.split("/", 1)
+    return {"kind": "Event", "status": {
+        "type": "Warning", "reason": reason, "message": message,
+        "involvedObject": {"kind": kind, "name": name}, "count": 1,
+    }}
+
+
+def test_oom_killed_container_is_conclusive():
+    pod = _pod("api-1", lastState={"terminated": {"reason": "OOMKilled", "exitCode": 137}})
+    analysis = evaluate([{"kind": "Pod", "output": [pod]}])
+    assert analysis["failure_class"] == "OOMKilled"
+    assert analysis["conclusive"]
+    answer = direct_answer(analysis, enabled=True)
+    assert "1 container(s) show OOMKilled, e.g. api-1/app" in answer
+
+
+def test_node_oom_killing_event_is_not_oom_killed():
+    events = [_warning("OOMKilling", "Memory cgroup out of memory: Killed process 4242 (java)")]
+    analysis = evaluate([{"kind": "Event", "output": events}])
+    assert analysis["failure_class"] == "Unknown"
+    assert not analysis["conclusive"]
+    assert direct_answer(analysis, enabled=True) is None
+
+
+def test_events_alone_are_never_conclusive():
+    events = [_warning("ErrImagePull", "Failed to pull image", obj="Pod/api-1")]
+    analysis = evaluate([{"kind": "Event", "output": events}])
+    assert analysis["failure_class"] == "ImagePullBackOff"
+    assert not analysis["conclusive"]
+    assert direct_answer(analysis, enabled=True) is None
+
+
+def test_no_direct_answer_without_examples():
+    digest = {"kind": "NamespaceDigest", "pods": {"total": 4, "waiting_reasons": {"ImagePullBackOff": 2}}}
+    analysis = evaluate([{"kind": "NamespaceDigest", "output": digest}])
+    assert analysis["conclusive"]
+    assert analysis["findings"][0]["examples"] == []
+    assert direct_answer(analysis, enabled=True) is None
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eks_agent import scheduler
+from eks_agent.scheduler import AdaptiveLimit, CallScheduler, ModelUnavailable
+
+
+class ClientError(Exception):
+    def __init__(self, code, status=400):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler, "backoff", lambda attempt: 0.0)
+    monkeypatch.setattr(scheduler, "DECREASE_COOLDOWN_SECONDS", 0.0)
+
+
+def _flaky(*errors, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+@pytest.mark.parametrize("exc, reason", [
+    (ClientError("ThrottlingException"), "throttled"),
+    (ClientError("Whatever", status=429), "throttled"),
+    (ClientError("ModelTimeoutException"), "transient"),
+    (TimeoutError(), "transient"),
+    (ClientError("ValidationException"), None),
+    (ValueError(), None),
+])
+def test_retry_reason(exc, reason):
+    assert scheduler.retry_reason(exc) == reason
+
+
+def test_limit_halves_on_throttle_and_grows_only_when_saturated():
+    limit = AdaptiveLimit(initial=8, minimum=1, maximum=16)
+    assert limit.decrease()
+    assert limit.limit == 4
+
+    # Not saturated: a success does not grow the limit.
+    limit.try_acquire()
+    limit.release(ok=True)
+    assert limit.limit == 4
+
+    # Saturated: about +1 per limit's worth of successes.
+    for _ in range(4):
+        assert limit.try_acquire()
+    assert not limit.try_acquire()
+    limit.release(ok=True)
+    assert limit.limit == pytest.approx(4.25)
+
+    for _ in range(10):
+        limit.decrease()
+    assert limit.limit == 1
+
+
+def test_throttles_arriving_together_halve_once(monkeypatch):
+    monkeypatch.setattr(scheduler, "DECREASE_COOLDOWN_SECONDS", 60.0)
+    limit = AdaptiveLimit(initial=8, minimum=1, maximum=16)
+    assert limit.decrease()
+    assert not limit.decrease()
+    assert limit.limit == 4
+
+
+def test_acquire_times_out_with_model_unavailable():
+    limit = AdaptiveLimit(initial=1, minimum=1, maximum=1)
+    limit.acquire(time.monotonic() + 1)
+    with pytest.raises(ModelUnavailable):
+        limit.acquire(time.monotonic() + 0.05)
+
+
+def test_in_flight_calls_never_exceed_the_limit():
+    sched = CallScheduler("test-limit", max_concurrency=3, initial_concurrency=3)
+    active, peak = [0], [0]
+    guard = threading.Lock()
+
+    def fn():
+        with guard:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with guard:
+            active[0] -= 1
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        assert list(pool.map(lambda _: sched.call(fn), range(20))) == ["ok"] * 20
+    assert peak[0] <= 3
+
+
+def test_throttle_is_retried_and_lowers_the_limit():
+    sched = CallScheduler("test-throttle", initial_concurrency=8)
+    fn, calls = _flaky(ClientError("ThrottlingException"), ClientError("ThrottlingException"))
+    assert sched.call(fn) == "ok"
+    assert len(calls) == 3
+    assert sched.limit.limit == 2
+
+
+def test_non_retryable_errors_are_raised_as_is():
+    sched = CallScheduler("test-fatal")
+    fn, calls = _flaky(ClientError("ValidationException"))
+    with pytest.raises(ClientError):
+        sched.call(fn)
+    assert len(calls) == 1
+
+
+def test_retries_give_up_with_model_unavailable():
+    sched = CallScheduler("test-give-up", max_retries=2)
+    fn, calls = _flaky(*[ClientError("ServiceUnavailableException")] * 5)
+    with pytest.raises(ModelUnavailable):
+        sched.call(fn)
+    assert len(calls) == 3
+
+
+def test_slow_attempt_times_out_and_is_retried():
+    sched = CallScheduler("test-timeout", timeout=0.05)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.3)
+        return "ok"
+
+    assert sched.call(fn) == "ok"
+    assert len(calls) == 2
+
+
+def test_hedged_attempt_wins_over_a_slow_one():
+    sched = CallScheduler("test-hedge", hedge_after=0.02, initial_concurrency=4)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            return "slow"
+        return "fast"
+
+    t0 = time.monotonic()
+    assert sched.call(fn) == "fast"
+    assert time.monotonic() - t0 < 0.25
+    assert len(calls) == 2
@@ -0,0 +1,220 @@
+import uuid
+
+import pytest
+
+from eks_agent import memory, server
+from eks_agent.tools.model import TOOL_NAME
+
+
+def _text(text):
+    return {"type": "message", "content": [{"type": "text", "text": text}]}
+
+
+def _tool_use(*inputs):
+    return {"type": "message", "content": [
+        {"type": "tool_use", "id": f"tu_{i}", "name": TOOL_NAME, "input": inp}
+        for i, inp in enumerate(inputs)
+    ]}
+
+
+POD_LIST = {"tools": [{"kind": "Pod", "namespace": "shop", "why": "status"}]}
+
+
+class FakeModel:
+    """
+    Scripted replies for server.invoke_claude, in call order.
+    """
+
+    def __init__(self, monkeypatch, *replies):
+        self.replies = list(replies)
+        self.calls = []
+        monkeypatch.setattr(server, "invoke_claude", self.invoke)
+        monkeypatch.setattr(server, "ask_claude", lambda *a, **k: "Failure class: Unknown")
+
+    def invoke(self, system_prompt, messages, tools=None, route="final"):
+        self.calls.append({"messages": messages, "tools": tools, "route": route})
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+
+    def execute_call(call, session_id=None):
+        calls.append((call.kind, call.namespace, call.name))
+        pod = {"kind": "Pod", "metadata": {"name": "api-1"}, "status": {"phase": "Running"}}
+        return [{"kind": call.kind, "namespace": call.namespace, "name": call.name, "cluster": None, "output": [pod]}]
+
+    monkeypatch.setattr(server, "execute_call", execute_call)
+    return calls
+
+
+def _session(question="my pod keeps crashing in namespace shop"):
+    session_id = str(uuid.uuid4())
+    return session_id, server.ask({"session_id": session_id, "question": question})
+
+
+def test_tool_use_becomes_permission_request(monkeypatch, reads):
+    FakeModel(monkeypatch, _tool_use(POD_LIST))
+    _, res = _session()
+    assert res["mode"] == "permission"
+    assert res["kubectl_commands"] == ["kubectl get pods -n shop"]
+    assert reads == []
+
+
+def test_invalid_tool_use_blocks_are_ignored_and_valid_ones_merged():
+    decoded = _tool_use(
+        POD_LIST,
+        {"tools": [{"namespace": "shop"}]},  # no kind
+        {"tools": [{"kind": "Event", "namespace": "shop"}]},
+    )
+    req, _ = server.parse_tool_request(decoded)
+    assert [(t.kind, t.namespace) for t in req.tools] == [("Pod", "shop"), ("Event", "shop")]
+
+
+def test_unscoped_tool_use_is_blocked(monkeypatch, reads):
+    FakeModel(monkeypatch, _tool_use({"tools": [{"kind": "Pod"}]}))
+    _, res = _session("my pod keeps crashing")
+    assert res["mode"] == "answer"
+    assert "missing scope" in res["text"]
+
+
+def test_already_collected_reads_fall_back_to_no_tools_answer(monkeypatch, reads):
+    model = FakeModel(
+        monkeypatch,
+        _tool_use(POD_LIST),
+        _tool_use(POD_LIST),  # same read again: filtered out, no text left
+        _text("Failure class: CrashLoopBackOff"),
+    )
+    session_id, _ = _session()
+    res = server.ask({"session_id": session_id, "tool_choice": "self"})
+
+    assert res == {"mode": "answer", "text": "Failure class: CrashLoopBackOff"}
+    assert reads == [("Pod", "shop", None)]
+    retry = model.calls[-1]
+    assert retry["tools"] is None
+    assert retry["messages"][-1]["content"][-1]["text"] == server.NO_TOOLS_PROMPT
+    assert memory.get_messages(session_id)[-1]["content"][-1]["text"] == res["text"]
+
+
+def test_empty_retry_gives_explicit_answer_and_session_keeps_working(monkeypatch, reads):
+    model = FakeModel(monkeypatch, _tool_use(POD_LIST), _tool_use(POD_LIST), _text(""))
+    session_id, _ = _session()
+    res = server.ask({"session_id": session_id, "tool_choice": "self"})
+    assert res == {"mode": "answer", "text": server.NO_ANSWER_TEXT}
+
+    model.replies.append(_text("follow-up answer"))
+    res = server.ask({"session_id": session_id, "question": "and now?"})
+    assert res["text"] == "follow-up answer"
+    for turn in model.calls[-1]["messages"]:
+        assert all(block["text"].strip() for block in turn["content"])
+
+
+def test_memory_refuses_empty_text():
+    with pytest.raises(ValueError):
+        memory.add_message(str(uuid.uuid4()), "assistant", "")
+    with pytest.raises(ValueError):
+        memory.text_block("  \n")
+
+
+def _stored_text(session_id):
+    return "\n".join(b["text"] for turn in memory.get_messages(session_id) for b in turn["content"])
+
+
+def test_pasted_secret_never_reaches_model_or_history(monkeypatch):
+    model = FakeModel(monkeypatch, _text("Failure class: Unknown"))
+    paste = "apiVersion: v1\nkind: Secret\nmetadata:\n  name: creds\ndata:\n  password: c3VwZXJzZWNyZXQ=\n"
+    session_id, res = _session(paste)
+
+    assert res["mode"] == "answer"
+    assert "<omitted: Secret>" in _stored_text(session_id)
+    assert "c3VwZXJzZWNyZXQ" not in _stored_text(session_id)
+    assert "c3VwZXJzZWNyZXQ" not in repr(model.calls)
+
+
+def test_unparsable_pasted_json_never_reaches_model_or_history(monkeypatch):
+    model = FakeModel(monkeypatch, _text("Failure class: Unknown"))
+    paste = (
+        '{\n  "apiVersion": "v1",\n  "kind": "Pod",\n  "spec": {\n    "containers": [\n'
+        '      {"name": "app", "env": [{"name": "TOKEN", "value": "s3cr3t"}]}\n'
+    )
+    session_id, _ = _session(paste)
+
+    assert "<omitted: unparsed JSON>" in _stored_text(session_id)
+    assert "s3cr3t" not in _stored_text(session_id)
+    assert "s3cr3t" not in repr(model.calls)
+
+
+def test_whitespace_question_is_missing():
+    _, res = _session("  \n\t")
+    assert res == {"mode": "error", "text": "Missing question"}
+
+
+def test_failed_read_becomes_evidence_and_other_reads_run(monkeypatch):
+    from eks_agent.tools.ratelimit import Throttled
+
+    calls = []
+
+    def execute_call(call, session_id=None):
+        calls.append(call.kind)
+        if call.kind == "Pod":
+            raise Throttled("list budget exhausted")
+        return [{"kind": call.kind, "namespace": call.namespace, "name": None, "cluster": None, "output": []}]
+
+    monkeypatch.setattr(server, "execute_call", execute_call)
+    two_reads = {"tools": [{"kind": "Pod", "namespace": "shop"}, {"kind": "Event", "namespace": "shop"}]}
+    model = FakeModel(monkeypatch, _tool_use(two_reads), _text("Failure class: Unknown"))
+    session_id, _ = _session()
+    res = server.ask({"session_id": session_id, "tool_choice": "self"})
+
+    assert res == {"mode": "answer", "text": "Failure class: Unknown"}
+    assert calls == ["Pod", "Event"]
+    evidence = "\n".join(b["text"] for b in model.calls[-1]["messages"][-1]["content"])
+    assert "Throttled: list budget exhausted" in evidence
+
+
+def _two_rounds(monkeypatch, forget_between=False):
+    model = FakeModel(
+        monkeypatch,
+        _tool_use(POD_LIST), _text("Failure class: Unknown"),
+        _tool_use(POD_LIST), _text("Failure class: Unknown"),
+    )
+    monkeypatch.setattr(server.snapshots, "is_stale", lambda *a, **k: True)
+    session_id, _ = _session()
+    server.ask({"session_id": session_id, "tool_choice": "self"})
+    if forget_between:
+        memory.forget_session(session_id)
+    server.ask({"session_id": session_id, "question": "is it still crashing?"})
+    server.ask({"session_id": session_id, "tool_choice": "self"})
+    return "\n".join(b["text"] for turn in model.calls[-1]["messages"] for b in turn["content"])
+
+
+def test_delta_refers_to_evidence_kept_in_history(monkeypatch, reads):
+    prompt = _two_rounds(monkeypatch)
+    first, second = prompt.split('<tool_evidence id="')[1:]
+    first_id = first.split('"', 1)[0]
+    assert "output_type: table" in first
+    assert "output_type: delta" in second
+    assert f"delta_of_evidence: {first_id}" in second
+
+
+def test_full_evidence_is_resent_once_its_baseline_left_history(monkeypatch, reads):
+    prompt = _two_rounds(monkeypatch, forget_between=True)
+    assert prompt.count("<tool_evidence") == 1
+    assert "output_type: delta" not in prompt
+    assert "output_type: table" in prompt
+
+
+def test_failed_prefetch_is_read_again_on_approval(monkeypatch, reads):
+    from concurrent.futures import Future
+    from eks_agent.tools.ratelimit import Throttled
+
+    failed = Future()
+    failed.set_exception(Throttled("background budget exhausted"))
+    monkeypatch.setattr(server.prefetch, "take", lambda session_id, sig: failed)
+    FakeModel(monkeypatch, _tool_use(POD_LIST), _text("Failure class: Unknown"))
+    session_id, _ = _session()
+    res = server.ask({"session_id": session_id, "tool_choice": "self"})
+
+    assert res["mode"] == "answer"
+    assert reads == [("Pod", "shop", None)]
@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eks_agent import metrics, server
+from eks_agent.singleflight import KeyedLocks, SingleFlight
+from eks_agent.tools.model import ToolCall
+
+
+def _coalesced(group: str) -> float:
+    return metrics.COALESCED._values.get((group,), 0)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _concurrent_same_key(sf: SingleFlight, callers: int, fn):
+    """
+    Start the leader, then the followers once it is inside fn; release it
+    only when every follower is waiting on the shared call.
+    """
+    entered, release = threading.Event(), threading.Event()
+    before = _coalesced(sf.name)
+
+    def leader_fn():
+        entered.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(sf.do, "key", leader_fn)]
+        entered.wait(5)
+        futures += [pool.submit(sf.do, "key", leader_fn) for _ in range(callers - 1)]
+        _wait_for(lambda: _coalesced(sf.name) - before == callers - 1)
+        release.set()
+    return futures
+
+
+def test_concurrent_callers_share_one_call():
+    sf = SingleFlight("test-share")
+    calls = []
+    futures = _concurrent_same_key(sf, 8, lambda: calls.append(1) or {"items": 3})
+    assert len(calls) == 1
+    assert [f.result() for f in futures] == [{"items": 3}] * 8
+
+
+def test_error_reaches_every_waiter_and_is_not_cached():
+    sf = SingleFlight("test-error")
+
+    def boom():
+        raise RuntimeError("api down")
+
+    for f in _concurrent_same_key(sf, 4, boom):
+        with pytest.raises(RuntimeError, match="api down"):
+            f.result()
+    assert sf.do("key", lambda: "recovered") == "recovered"
+
+
+def test_different_keys_do_not_coalesce():
+    sf = SingleFlight("test-keys")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def one(key):
+        def fn():
+            barrier.wait()  # both calls are in flight at once
+            return key
+        return sf.do(key, fn)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert sorted(pool.map(one, ["a", "b"])) == ["a", "b"]
+    assert _coalesced("test-keys") == 0
+
+
+def test_keyed_locks_serialize_one_key_only():
+    locks = KeyedLocks()
+    active, peak = {"s1": 0, "s2": 0}, {"s1": 0, "s2": 0}
+    both_keys_inside = threading.Barrier(2, timeout=5)
+    guard = threading.Lock()
+
+    def mutate(key, first):
+        with locks.hold(key):
+            with guard:
+                active[key] += 1
+                peak[key] = max(peak[key], active[key])
+            if first:
+                both_keys_inside.wait()  # s1 and s2 are held at the same time
+            time.sleep(0.005)
+            with guard:
+                active[key] -= 1
+
+    jobs = [("s1", True), ("s2", True)] + [(k, False) for k in ("s1", "s2") for _ in range(5)]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        list(pool.map(lambda job: mutate(*job), jobs))
+
+    assert peak == {"s1": 1, "s2": 1}
+    assert locks._locks == {}
+
+
+def test_identical_reads_reach_the_api_once(monkeypatch):
+    calls = []
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow_execute(call, session_id):
+        calls.append(session_id)
+        entered.set()
+        release.wait(5)
+        return [{"kind": call.kind, "output": []}]
+
+    monkeypatch.setattr(server, "_execute", slow_execute)
+    call = ToolCall(kind="Pod", namespace="shop")
+    before = _coalesced("read")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(server.execute_call, call, "s1")]
+        entered.wait(5)
+        futures += [pool.submit(server.execute_call, call, f"s{i}") for i in range(2, 5)]
+        _wait_for(lambda: _coalesced("read") - before == 3)
+        release.set()
+    assert len(calls) == 1
+    assert all(f.result() == [{"kind": "Pod", "output": []}] for f in futures)
+
+
+def test_requests_of_one_session_run_one_at_a_time(monkeypatch):
+    active, peak = [0], [0]
+    guard = threading.Lock()
+
+    def handle_ask(payload):
+        with guard:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with guard:
+            active[0] -= 1
+        return {"mode": "answer", "text": "ok"}
+
+    monkeypatch.setattr(server, "handle_ask", handle_ask)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: server.ask({"session_id": "same", "question": "q"}), range(4)))
+    assert peak[0] == 1
+
+
+def test_log_reads_with_different_tails_are_not_merged(monkeypatch):
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def execute(call, session_id):
+        both_in_flight.wait()
+        return [{"kind": call.kind, "output": call.read_options["tail_lines"]}]
+
+    monkeypatch.setattr(server, "_execute", execute)
+    short = ToolCall(kind="PodLog", namespace="shop", name="api-1", tail_lines=50)
+    wide = ToolCall(kind="PodLog", namespace="shop", name="api-1", tail_lines=500)
+    assert server.tool_signature(short) != server.tool_signature(wide)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        a, b = pool.map(lambda c: server.execute_call(c, "s1"), [short, wide])
+    assert (a[0]["output"], b[0]["output"]) == (50, 500)
@@ -0,0 +1,124 @@
+import json
+import threading
+
+from eks_agent import triage
+from eks_agent.triage import TriageQueue
+
+
+def _alert(name="KubePodCrashLooping", namespace="shop", fingerprint=None):
+    return {
+        "status": "firing",
+        "fingerprint": fingerprint,
+        "labels": {"alertname": name, "namespace": namespace},
+    }
+
+
+class Handler:
+    def __init__(self, mode="answer", gate=None):
+        self.mode = mode
+        self.gate = gate
+        self.calls = []
+        self.released = []
+
+    def __call__(self, payload):
+        if self.gate:
+            self.gate.wait(5)
+        self.calls.append(payload)
+        return {"mode": self.mode, "text": "ok"}
+
+    def release(self, session_id):
+        self.released.append(session_id)
+
+
+def test_same_namespace_and_alertname_join_one_job():
+    h = Handler()
+    q = TriageQueue(h, release=h.release, workers=2)
+    first = q.submit(_alert(fingerprint="a"))
+    second = q.submit(_alert(fingerprint="b"))
+    other = q.submit(_alert(name="KubePodNotReady"))
+    q.join()
+
+    assert second == {"job_id": first["job_id"], "duplicate": True}
+    assert not other["duplicate"]
+    assert len(h.calls) == 2
+    job = q.get(first["job_id"])
+    assert job["duplicates"] == 1
+    assert job["fingerprints"] == ["a", "b"]
+
+
+def test_full_queue_rejects_new_alerts():
+    gate = threading.Event()
+    h = Handler(gate=gate)
+    q = TriageQueue(h, release=h.release, workers=1, queue_size=2)
+    outcomes = [q.submit(_alert(name=f"Alert{i}")) for i in range(6)]
+    gate.set()
+    q.join()
+
+    # One job running, two queued, the rest rejected.
+    assert outcomes.count(None) >= 3
+    assert len(h.calls) == 6 - outcomes.count(None)
+
+
+def test_answered_job_releases_its_session():
+    h = Handler(mode="answer")
+    q = TriageQueue(h, release=h.release, workers=1)
+    job_id = q.submit(_alert())["job_id"]
+    q.join()
+    assert h.released == [q.get(job_id)["session_id"]]
+
+
+def test_proposed_reads_keep_the_session_until_eviction(monkeypatch):
+    monkeypatch.setattr(triage, "MAX_JOBS", 2)
+    h = Handler(mode="permission")
+    q = TriageQueue(h, release=h.release, workers=1)
+
+    first = q.submit(_alert(name="Alert0"))["job_id"]
+    q.join()
+    session_id = q.get(first)["session_id"]
+    assert h.released == []
+
+    for i in range(1, 3):
+        q.submit(_alert(name=f"Alert{i}"))
+        q.join()
+    assert q.get(first) is None
+    assert h.released == [session_id]
+
+
+def test_end_session_clears_server_state():
+    from eks_agent import memory, server
+    from eks_agent.tools import owners, snapshots
+
+    session_id = "triage-test"
+    server._TOOL_HISTORY[session_id] = {"Pod:shop:None"}
+    server._SESSION_SCOPE[session_id] = {"namespace": "shop"}
+    server._PENDING_TOOLS[session_id] = {"tool_request": None}
+    memory.add_message(session_id, "user", "hello")
+    snapshots.record(session_id, "Pod:shop:None", [])
+    owners.session_cache(session_id)
+
+    server.end_session(session_id)
+
+    assert session_id not in server._TOOL_HISTORY
+    assert session_id not in server._SESSION_SCOPE
+    assert session_id not in server._PENDING_TOOLS
+    assert memory.get_messages(session_id) == []
+    assert snapshots.previous(session_id, "Pod:shop:None") is None
+    assert session_id not in owners._SESSION_CACHES
+
+
+def test_webhook_asks_for_a_retry_when_any_alert_is_rejected(monkeypatch):
+    from eks_agent import server
+
+    gate = threading.Event()
+    h = Handler(gate=gate)
+    q = TriageQueue(h, release=h.release, workers=1, queue_size=1)
+    monkeypatch.setattr(server, "_TRIAGE", q)
+    res = server.alerts({"alerts": [_alert(name=f"Alert{i}") for i in range(5)]})
+    gate.set()
+    q.join()
+
+    # Some alerts were accepted, but the rejected ones need a redelivery.
+    body = json.loads(res.body)
+    assert body["accepted"] and body["rejected"]
+    assert res.status_code == 429
+    assert res.headers["Retry-After"] == "30"